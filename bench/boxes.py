@@ -0,0 +1,79 @@
+"""
+Box 중복 제거/병합 벤치마크.
+
+문서당 박스 수를 늘려가며 기존 O(n²) _dedup_boxes와 격자 버킷 dedup_boxes를 비교하고,
+merge_boxes 시간과 병합 후 박스 수를 출력한다. 두 dedup 결과가 같은지도 확인한다.
+
+실행: python -m bench.boxes [--sizes 2500,5000,10000,20000] [--pages 50]
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from server.box_index import dedup_boxes, merge_boxes
+from server.schemas import Box
+
+
+def make_boxes(n: int, pages: int, seed: int = 0) -> List[Box]:
+    """줄 단위로 배치된 박스 + 일부 중복(감지+클라이언트 박스 병합 상황 흉내)."""
+    rnd = random.Random(seed)
+    out: List[Box] = []
+    while len(out) < n:
+        page = rnd.randrange(pages)
+        line = rnd.randrange(60)
+        x0 = rnd.uniform(20, 500)
+        y0 = 30 + line * 12.0
+        b = Box(page=page, x0=x0, y0=y0, x1=x0 + rnd.uniform(20, 80), y1=y0 + 10.0,
+                matched_text="x", pattern_name=rnd.choice(["rrn", "email", "card"]))
+        out.append(b)
+        if rnd.random() < 0.3:  # 거의 같은 좌표의 중복
+            j = rnd.uniform(-0.1, 0.1)
+            out.append(Box(page=page, x0=b.x0 + j, y0=b.y0 - j, x1=b.x1 + j, y1=b.y1, pattern_name=b.pattern_name))
+    return out[:n]
+
+
+def legacy_dedup(boxes: List[Box], tol: float = 0.25) -> List[Box]:
+    out: List[Box] = []
+
+    def same(a: Box, b: Box) -> bool:
+        return (
+            a.page == b.page and
+            abs(a.x0 - b.x0) <= tol and
+            abs(a.y0 - b.y0) <= tol and
+            abs(a.x1 - b.x1) <= tol and
+            abs(a.y1 - b.y1) <= tol
+        )
+    for b in boxes:
+        if not any(same(b, x) for x in out):
+            out.append(b)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="2500,5000,10000,20000")
+    ap.add_argument("--pages", type=int, default=50)
+    ap.add_argument("--no-legacy", action="store_true")
+    args = ap.parse_args()
+
+    print(f"{'boxes':>7} {'legacy ms':>10} {'grid ms':>8} {'kept':>7} {'merge ms':>9} {'merged':>7}")
+    for n in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        boxes = make_boxes(n, args.pages)
+        t0 = time.perf_counter()
+        kept = dedup_boxes(boxes)
+        t_grid = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        merged = merge_boxes(kept)
+        t_merge = time.perf_counter() - t0
+        legacy = "-"
+        if not args.no_legacy:
+            t0 = time.perf_counter()
+            old = legacy_dedup(boxes)
+            legacy = f"{(time.perf_counter() - t0) * 1000:.1f}"
+            assert old == kept
+        print(f"{n:>7} {legacy:>10} {t_grid * 1000:>8.1f} {len(kept):>7} {t_merge * 1000:>9.1f} {len(merged):>7}")
+
+
+if __name__ == "__main__":
+    main()
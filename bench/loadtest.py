@@ -0,0 +1,334 @@
+"""
+로컬 HTTP 부하 테스트 (용량 산정용, 오프라인 단일 Linux 서버).
+
+server.main:app을 uvicorn 하위 프로세스로 띄우고(--url이면 이미 떠 있는 서버 사용),
+bench.synth로 만든 문서로 /text/match, /redactions/detect, /redactions/apply를
+가중치(--mix) 비율로 섞어 동시성 단계(--concurrency)마다 --duration초 동안 보낸다.
+
+단계 x 엔드포인트마다 처리량(rps), 지연 p50/p95/p99/max, 오류율, 429 비율을 출력하고,
+서버 프로세스(하위 워커 프로세스 포함) RSS를 주기적으로 재서 단계별 최대값과 시계열을 남긴다.
+서버 설정은 환경 변수(REDACTION_*)로 넘기면 하위 프로세스가 그대로 받는다.
+
+실행: python -m bench.loadtest [--concurrency 1,4,16] [--duration 20] [--mix match=5,detect=3,apply=2]
+      [--pages 10] [--words 300] [--out load.json] [--url http://127.0.0.1:8000 --pid 1234]
+
+PDF 요청마다 파일 끝(%%EOF 뒤)에 고유 주석을 붙여 탐지 캐시에 걸리지 않게 한다
+(같은 문서 반복 업로드를 재려면 --allow-cache).
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .synth import make_pages, make_pdf, parse_density
+
+ENDPOINTS = ("match", "detect", "apply")
+
+# 엔드포인트별 요청: (경로, 본문 앞, 본문 뒤, Content-Type). 앞/뒤 사이에 PDF가 들어간다 (없으면 b"")
+Request = Tuple[str, bytes, bytes, str]
+
+
+def _multipart(fields: Dict[str, str]) -> Tuple[bytes, bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="load.pdf"\r\n'
+        f"Content-Type: application/pdf\r\n\r\n".encode()
+    )
+    return b"".join(parts), f"\r\n--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+def build_requests(text: str) -> Dict[str, Request]:
+    return {
+        "match": ("/text/match", json.dumps({"text": text}, ensure_ascii=False).encode(), b"", "application/json"),
+        "detect": ("/redactions/detect", *_multipart({})),
+        "apply": ("/redactions/apply", *_multipart({"mode": "auto_all"})),
+    }
+
+
+def _body(req: Request, pdf: bytes, fresh: bool) -> bytes:
+    path, head, tail, _ = req
+    if not tail:
+        return head
+    if fresh:
+        pdf = pdf + f"\n%{uuid.uuid4().hex}\n".encode()  # 내용 해시만 바꾸는 주석
+    return head + pdf + tail
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """'match=5,detect=3,apply=2' → 엔드포인트별 가중치 (0이면 제외)."""
+    out: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, w = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"알 수 없는 엔드포인트: {name} (가능: {', '.join(ENDPOINTS)})")
+        out[name] = float(w or 1)
+    out = {k: v for k, v in out.items() if v > 0}
+    if not out:
+        raise SystemExit("--mix에 가중치가 0보다 큰 엔드포인트가 하나는 있어야 합니다.")
+    return out
+
+
+# ---------------------------
+# 서버 프로세스 / RSS
+# ---------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "uvicorn", "server.main:app",
+           "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    return subprocess.Popen(cmd, env=os.environ.copy())
+
+
+def wait_ready(host: str, port: int, proc: Optional[subprocess.Popen], timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise SystemExit(f"서버가 시작하지 못했습니다. (exit={proc.returncode})")
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/patterns")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"서버가 {timeout:.0f}초 안에 응답하지 않습니다.")
+
+
+def _children(pid: int) -> List[int]:
+    out: List[int] = []
+    try:
+        tids = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return out
+    for tid in tids:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                out.extend(int(c) for c in f.read().split())
+        except OSError:
+            pass
+    return out
+
+
+def _rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def tree_rss_mb(pid: int) -> Tuple[float, float]:
+    """(메인 프로세스 RSS, 하위 프로세스 포함 합계) MB."""
+    main = _rss_kb(pid)
+    total, stack, seen = 0, [pid], set()
+    while stack:
+        p = stack.pop()
+        if p in seen:
+            continue
+        seen.add(p)
+        total += _rss_kb(p)
+        stack.extend(_children(p))
+    return main / 1024, total / 1024
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, pid: int, interval: float):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[dict] = []
+        self.stage: Optional[int] = None
+        self._done = threading.Event()
+        self._t0 = time.monotonic()
+
+    def run(self) -> None:
+        while not self._done.is_set():
+            main, total = tree_rss_mb(self.pid)
+            self.samples.append({
+                "t": round(time.monotonic() - self._t0, 2), "concurrency": self.stage,
+                "rss_mb": round(main, 1), "rss_tree_mb": round(total, 1),
+            })
+            self._done.wait(self.interval)
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+# ---------------------------
+# 부하 생성
+# ---------------------------
+def _worker(host: str, port: int, reqs: Dict[str, Request], pdf: bytes, fresh: bool,
+            names: List[str], weights: List[float], stop_at: float, seed: int,
+            out: List[Tuple[str, float, int]]) -> None:
+    """stop_at까지 가중치대로 고른 요청을 연속으로 보낸다. 결과: (엔드포인트, 지연 ms, 상태 코드 / 0=연결 오류)."""
+    rnd = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=300)
+    while time.monotonic() < stop_at:
+        name = rnd.choices(names, weights)[0]
+        path, ctype = reqs[name][0], reqs[name][3]
+        body = _body(reqs[name], pdf, fresh)
+        t0 = time.perf_counter()
+        try:
+            conn.request("POST", path, body=body, headers={"Content-Type": ctype})
+            resp = conn.getresponse()
+            resp.read()
+            status = resp.status
+        except (OSError, http.client.HTTPException):
+            status = 0
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=300)
+        out.append((name, (time.perf_counter() - t0) * 1000, status))
+    conn.close()
+
+
+def _pct(sorted_ms: List[float], p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    k = max(0, min(len(sorted_ms) - 1, int(round(p / 100 * len(sorted_ms) + 0.5)) - 1))
+    return round(sorted_ms[k], 2)
+
+
+def summarize(results: List[Tuple[str, float, int]], elapsed: float) -> Dict[str, dict]:
+    by: Dict[str, List[Tuple[float, int]]] = {}
+    for name, ms, status in results:
+        by.setdefault(name, []).append((ms, status))
+        by.setdefault("all", []).append((ms, status))
+    out: Dict[str, dict] = {}
+    for name, rows in by.items():
+        n = len(rows)
+        ok = sorted(ms for ms, s in rows if 200 <= s < 300)
+        busy = sum(1 for _, s in rows if s == 429)
+        out[name] = {
+            "requests": n,
+            "ok": len(ok),
+            "rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round((n - len(ok) - busy) / n, 4) if n else 0.0,
+            "busy_429_rate": round(busy / n, 4) if n else 0.0,
+            "p50_ms": _pct(ok, 50),
+            "p95_ms": _pct(ok, 95),
+            "p99_ms": _pct(ok, 99),
+            "max_ms": round(ok[-1], 2) if ok else 0.0,
+        }
+    return out
+
+
+def run_level(host: str, port: int, reqs: Dict[str, Request], pdf: bytes, fresh: bool,
+              mix: Dict[str, float], concurrency: int, duration: float, seed: int) -> Dict[str, dict]:
+    names, weights = list(mix), list(mix.values())
+    results: List[Tuple[str, float, int]] = []  # list.append은 스레드 간에도 안전
+    stop_at = time.monotonic() + duration
+    t0 = time.monotonic()
+    threads = [
+        threading.Thread(target=_worker, args=(host, port, reqs, pdf, fresh, names, weights, stop_at, seed + i, results))
+        for i in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(results, time.monotonic() - t0)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--concurrency", default="1,4,16", help="동시 연결 수 단계 (콤마구분)")
+    ap.add_argument("--duration", type=float, default=20.0, help="단계마다 부하를 거는 시간(초)")
+    ap.add_argument("--mix", default="match=5,detect=3,apply=2", help="엔드포인트 가중치")
+    ap.add_argument("--pages", type=int, default=10)
+    ap.add_argument("--words", type=int, default=300, help="페이지당 단어 수")
+    ap.add_argument("--density", default=None, help="규칙별 밀도. 예: all=0.005,rrn=0.02")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--allow-cache", action="store_true", help="같은 PDF를 그대로 보내 탐지 캐시 적중을 허용")
+    ap.add_argument("--rss-interval", type=float, default=0.5, help="RSS 측정 간격(초)")
+    ap.add_argument("--url", default=None, help="이미 떠 있는 서버 주소 (없으면 직접 띄움)")
+    ap.add_argument("--pid", type=int, default=None, help="--url 서버의 PID (RSS 측정용)")
+    ap.add_argument("--out", default=None, help="결과 JSON 경로")
+    args = ap.parse_args()
+    logging.getLogger("redaction").setLevel(logging.WARNING)
+
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    mix = parse_mix(args.mix)
+    texts, _ = make_pages(args.pages, args.words, parse_density(args.density), seed=args.seed)
+    pdf = make_pdf(texts)
+    reqs = build_requests("\n".join(texts))
+
+    proc: Optional[subprocess.Popen] = None
+    if args.url:
+        u = urlsplit(args.url)
+        host, port, pid = u.hostname or "127.0.0.1", u.port or 80, args.pid
+    else:
+        host, port = "127.0.0.1", _free_port()
+        proc = start_server(port)
+        pid = proc.pid
+    sampler: Optional[RssSampler] = None
+    report: dict = {
+        "params": {**vars(args), "pdf_bytes": len(pdf)},
+        "levels": [],
+    }
+    try:
+        wait_ready(host, port, proc)
+        if pid:
+            sampler = RssSampler(pid, args.rss_interval)
+            sampler.start()
+        print(f"target http://{host}:{port} pdf={len(pdf):,}B pages={args.pages} mix={mix}")
+        print(f"{'conc':>5} {'endpoint':>8} {'reqs':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+              f"{'err%':>6} {'429%':>6} {'rss MB':>8}")
+        for i, c in enumerate(levels):
+            if sampler:
+                sampler.stage = c
+            stats = run_level(host, port, reqs, pdf, not args.allow_cache, mix, c, args.duration, args.seed + i * 1000)
+            rss = [s["rss_tree_mb"] for s in (sampler.samples if sampler else []) if s["concurrency"] == c]
+            peak = max(rss) if rss else 0.0
+            report["levels"].append({"concurrency": c, "endpoints": stats, "rss_tree_peak_mb": peak})
+            for name in (*mix, "all"):
+                s = stats.get(name)
+                if not s:
+                    continue
+                print(f"{c:>5} {name:>8} {s['requests']:>6} {s['rps']:>8.2f} {s['p50_ms']:>8.1f} "
+                      f"{s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['error_rate'] * 100:>6.1f} "
+                      f"{s['busy_429_rate'] * 100:>6.1f} {peak if name == 'all' else '':>8}")
+    finally:
+        if sampler:
+            sampler.stop()
+            report["rss"] = sampler.samples
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"saved: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+normalize_text 벤치마크.
+
+기존(NFKC → 정규식 여러 번 → 줄 단위 rstrip) 구현과 단일 패스 구현의 시간을 비교하고,
+전체 위치 변환표(normalize_with_map)와 줄 단위 지연 변환표(LineOffsetMap, 1000곳 조회)의 비용을 잰다.
+동등성/위치 변환 퍼징은 tests/test_normalize.py (pytest).
+
+실행: python -m bench.normalize [--mb 10]
+"""
+import argparse
+import random
+import time
+
+from server.normalize import LineOffsetMap, normalize_text, normalize_with_map
+from tests.test_normalize import SPECIAL, WORDS, check_map, legacy_normalize
+
+# 단어 구분자: 대부분 공백/개행, 가끔 CRLF·이중 공백
+SEPS = [" "] * 8 + ["\n"] * 2 + ["\r\n", "  "]
+
+
+def make_text(size: int, special_ratio: float, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    parts, n = [], 0
+    while n < size:
+        t = rnd.choice(SPECIAL) if rnd.random() < special_ratio else rnd.choice(WORDS) + rnd.choice(SEPS)
+        parts.append(t)
+        n += len(t)
+    return "".join(parts)
+
+
+def _time(fn, s):
+    t0 = time.perf_counter()
+    out = fn(s)
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def _probe(omap, positions):
+    return omap, [omap.start(n) for n in positions]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mb", type=float, default=10.0)
+    args = ap.parse_args()
+
+    size = int(args.mb * 1024 * 1024)
+    print(f"{'input':>14} {'legacy ms':>10} {'single ms':>10} {'speedup':>8} {'map ms':>8} {'breakpoints':>12} {'lazy ms':>8}")
+    for label, ratio in (("plain", 0.0), ("special 2%", 0.02), ("special 20%", 0.2)):
+        s = make_text(size, ratio)
+        ref, t_old = _time(legacy_normalize, s)
+        out, t_new = _time(normalize_text, s)
+        assert out == ref, label
+        (mout, omap), t_map = _time(normalize_with_map, s)
+        assert mout == ref, label
+        probes = random.Random(1).sample(range(len(out)), min(1000, len(out)))
+        (lmap, _), t_lazy = _time(lambda src: _probe(LineOffsetMap(src, out), probes), s)
+        print(f"{label:>14} {t_old:>10.1f} {t_new:>10.1f} {t_old / t_new:>7.1f}x {t_map:>8.1f} {omap.breakpoints:>12} {t_lazy:>8.1f}")
+        if ratio:
+            head = s[:200_000]
+            check_map(head, *normalize_with_map(head))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+회귀 확인용 벤치마크 묶음.
+
+bench.synth로 합성 문서를 만들어 단계별 시간을 따로 잰다.
+  detect     detect_boxes_from_patterns (PRESET 패턴, 캐시 끔, 워커 수는 설정값)
+  apply      apply_redaction (detect 결과 박스 전체)
+  normalize  normalize_text (문서 전체 텍스트)
+  match      /text/match 핸들러 (정규화 + 규칙 전체 + context)
+  extract    extract_pdf_text
+단계마다 워밍업 1회 후 --repeat번 재서 min/median/mean/max(ms)를 JSON으로 남긴다.
+
+--baseline을 주면(또는 --compare로 결과 파일 둘을 주면) 단계별 median을 비교해
+--threshold(비율)보다 느려진 단계를 표시하고 종료 코드 1로 끝난다 (CI에서 사용).
+
+실행:
+  python -m bench.suite --out bench-base.json
+  python -m bench.suite --baseline bench-base.json [--threshold 0.15]
+  python -m bench.suite --compare bench-base.json bench-new.json
+  옵션: [--pages 50] [--words 300] [--density all=0.005,rrn=0.02] [--invalid-ratio 0.3]
+        [--repeat 5] [--seed 0] [--stages detect,apply,...]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+import fitz
+
+from server import config
+from server.extract_text import extract_pdf_text
+from server.normalize import normalize_text
+from server.pdf_redaction import apply_redaction, detect_boxes_from_patterns
+from server.redac_rules import PRESET_PATTERNS
+from server.routes.text import MatchRequest, match
+from server.schemas import PatternItem
+
+from .synth import make_pages, make_pdf, parse_density
+
+STAGES = ("detect", "apply", "normalize", "match", "extract")
+METRIC = "median_ms"
+
+
+def timeit(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    fn()  # 워밍업 (정규식 컴파일, 프로세스 풀 기동 등)
+    runs: List[float] = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - t0) * 1000)
+    return {
+        "runs": len(runs),
+        "min_ms": round(min(runs), 3),
+        "median_ms": round(statistics.median(runs), 3),
+        "mean_ms": round(statistics.fmean(runs), 3),
+        "max_ms": round(max(runs), 3),
+    }
+
+
+def run(args) -> dict:
+    density = parse_density(args.density)
+    texts, planted = make_pages(args.pages, args.words, density, args.invalid_ratio, args.seed)
+    pdf = make_pdf(texts)
+    full_text = "\n".join(texts)
+    patterns = [PatternItem(**p) for p in PRESET_PATTERNS]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise SystemExit(f"알 수 없는 단계: {', '.join(sorted(unknown))} (가능: {', '.join(STAGES)})")
+
+    boxes = detect_boxes_from_patterns(pdf, patterns, use_cache=False)
+    bench: Dict[str, Callable[[], object]] = {
+        "detect": lambda: detect_boxes_from_patterns(pdf, patterns, use_cache=False),
+        "apply": lambda: apply_redaction(pdf, boxes),
+        "normalize": lambda: normalize_text(full_text),
+        "match": lambda: asyncio.run(match(MatchRequest(text=full_text))),
+        "extract": lambda: extract_pdf_text(pdf),
+    }
+    results: Dict[str, dict] = {}
+    for name in stages:
+        results[name] = timeit(bench[name], args.repeat)
+        print(f"{name:>10} {results[name]['median_ms']:>10.2f} ms (min {results[name]['min_ms']:.2f})",
+              file=sys.stderr)
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "params": {
+            "pages": args.pages, "words": args.words, "density": density,
+            "invalid_ratio": args.invalid_ratio, "repeat": args.repeat, "seed": args.seed,
+        },
+        "env": {
+            "python": platform.python_version(),
+            "pymupdf": fitz.VersionBind,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "detect_workers": config.DETECT_WORKERS,
+            "save_profile": config.SAVE_PROFILE,
+        },
+        "input": {"pdf_bytes": len(pdf), "text_chars": len(full_text), "boxes": len(boxes), "planted": planted},
+        "stages": results,
+    }
+
+
+def compare(base: dict, cur: dict, threshold: float) -> List[str]:
+    """단계별 median 비교표를 출력하고 threshold보다 느려진 단계 이름을 돌려준다."""
+    if base.get("params") != cur.get("params"):
+        print("경고: 두 결과의 입력 파라미터가 다릅니다. 비교가 의미 없을 수 있습니다.")
+    if base.get("env") != cur.get("env"):
+        print("경고: 두 결과의 실행 환경이 다릅니다.")
+    regressed: List[str] = []
+    print(f"{'stage':>10} {'base ms':>10} {'now ms':>10} {'change':>8}")
+    for name, now in cur.get("stages", {}).items():
+        prev = base.get("stages", {}).get(name)
+        if not prev or METRIC not in prev or METRIC not in now:
+            continue
+        ratio = now[METRIC] / prev[METRIC] if prev[METRIC] else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        print(f"{name:>10} {prev[METRIC]:>10.2f} {now[METRIC]:>10.2f} {(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressed
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, default=50)
+    ap.add_argument("--words", type=int, default=300, help="페이지당 단어 수")
+    ap.add_argument("--density", default=None, help="규칙별 밀도. 예: all=0.005,rrn=0.02")
+    ap.add_argument("--invalid-ratio", type=float, default=0.3, help="심은 값 중 무효 값 비율")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--stages", default=",".join(STAGES))
+    ap.add_argument("--out", default=None, help="결과 JSON 경로 (없으면 표준 출력)")
+    ap.add_argument("--baseline", default=None, help="실행 후 이 결과 JSON과 비교")
+    ap.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="실행하지 않고 결과 파일 둘만 비교")
+    ap.add_argument("--threshold", type=float, default=0.15, help="이 비율보다 느려지면 회귀 (0.15 = 15%%)")
+    args = ap.parse_args()
+    logging.getLogger("redaction").setLevel(logging.WARNING)
+
+    if args.compare:
+        base, cur = (_load(p) for p in args.compare)
+    else:
+        cur = run(args)
+        text = json.dumps(cur, ensure_ascii=False, indent=2)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+            print(f"saved: {args.out}", file=sys.stderr)
+        elif not args.baseline:
+            print(text)
+        if not args.baseline:
+            return
+        base = _load(args.baseline)
+
+    regressed = compare(base, cur, args.threshold)
+    if regressed:
+        print(f"회귀: {', '.join(regressed)} (threshold {args.threshold:.0%})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
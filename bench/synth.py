@@ -0,0 +1,192 @@
+"""
+벤치마크용 합성 개인정보 문서 생성기.
+
+RULES 규칙마다 유효한 값(validator 통과)과 무효한 값(형식은 맞지만 validator 탈락,
+validator가 항상 통과하는 규칙은 형식이 살짝 어긋난 값)을 만들고,
+페이지 수 / 페이지당 단어 수 / 규칙별 밀도(단어 중 해당 규칙 값의 비율)를 정해 텍스트와 PDF를 만든다.
+같은 seed면 같은 문서가 나온다.
+
+실행: python -m bench.synth [--pages 5] [--words 300] [--density rrn=0.02,card=0.01] [--out sample.pdf]
+"""
+import argparse
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+import fitz
+
+from server.redac_rules import RULES
+
+W = [2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5]
+
+FILLER = [
+    "본", "문서는", "계약서", "신청인", "주소", "서울특별시", "담당자", "확인", "첨부", "사본",
+    "the", "account", "customer", "record", "page", "total", "date", "reference", "note", "id",
+    "2024-03-01", "12,500원", "No.", "(주)", "제1조", "성명", "연락처", "이메일", "카드", "비고",
+]
+
+# 기본 밀도: 규칙마다 단어 200개 중 1개
+DEFAULT_DENSITY = 0.005
+
+
+def _d(rnd: random.Random, n: int) -> str:
+    return "".join(rnd.choice("0123456789") for _ in range(n))
+
+
+def _ymd(rnd: random.Random) -> str:
+    # 정규식 범위 안에서 무작위 (없는 날짜/미래 날짜도 섞여 validator가 걸러낸다)
+    return f"{rnd.randint(0, 99):02d}{rnd.randint(1, 12):02d}{rnd.randint(1, 31):02d}"
+
+
+def _reg_no(rnd: random.Random, kinds: str, fgn: bool) -> str:
+    d = _ymd(rnd) + rnd.choice(kinds) + _d(rnd, 5)
+    chk = (11 - sum(int(x) * w for x, w in zip(d, W)) % 11) % 10
+    if fgn:
+        chk = (chk + 2) % 10
+    if rnd.random() < 0.5:
+        chk = rnd.randint(0, 9)
+    return f"{d[:6]}-{d[6:]}{chk}"
+
+
+def _card(rnd: random.Random) -> str:
+    head = rnd.choice(["4", "51", "35", "6", "9", "2221", "37"])
+    n = 15 if head == "37" else 16
+    d = head + _d(rnd, n - len(head) - 1)
+    total = 0
+    for i, x in enumerate(reversed(d)):
+        v = int(x) * (2 if i % 2 == 0 else 1)
+        total += v - 9 if v > 9 else v
+    chk = (10 - total % 10) % 10
+    if rnd.random() < 0.5:
+        chk = rnd.randint(0, 9)
+    d += str(chk)
+    return " ".join(d[i:i + 4] for i in range(0, n, 4))
+
+
+def _email(rnd: random.Random) -> str:
+    local = rnd.choice(["hong", "kim.lee", "park_j", "user+tag", "a.b.c"]) + _d(rnd, rnd.randint(0, 3))
+    return f"{local}@{rnd.choice(['example', 'mail', 'corp-x'])}.{rnd.choice(['com', 'co.kr', 'net'])}"
+
+
+# 규칙 정규식에 맞는 후보 (validator 결과는 섞여 있음)
+CANDIDATES: Dict[str, Callable[[random.Random], str]] = {
+    "rrn": lambda rnd: _reg_no(rnd, "1234", False),
+    "fgn": lambda rnd: _reg_no(rnd, "5678", True),
+    "email": _email,
+    "phone_mobile": lambda rnd: f"01{rnd.choice('016789')}-{_d(rnd, 4)}-{_d(rnd, 4)}",
+    "phone_city": lambda rnd: f"{rnd.choice(['02', '031', '042', '051', '064'])}-{_d(rnd, rnd.choice([3, 4]))}-{_d(rnd, 4)}",
+    "card": _card,
+    "passport": lambda rnd: rnd.choice("MSRODG") + (_d(rnd, 8) if rnd.random() < 0.5 else _d(rnd, 3) + rnd.choice("ABCXYZ") + _d(rnd, 4)),
+    "driver_license": lambda rnd: f"{rnd.randint(11, 28)}-{_d(rnd, 2)}-{_d(rnd, 6)}-{_d(rnd, 2)}",
+}
+
+# 정규식에 맞으면 항상 유효한 규칙용: 형식이 살짝 어긋난 값 (매치되지 않아야 정상)
+NEAR_MISS: Dict[str, Callable[[random.Random], str]] = {
+    "email": lambda rnd: f"{rnd.choice(['hong', 'kim'])}@{rnd.choice(['example', 'mail'])}",
+    "phone_city": lambda rnd: f"070-{_d(rnd, 4)}-{_d(rnd, 4)}",
+    "passport": lambda rnd: rnd.choice("MSRODG") + _d(rnd, 7),
+}
+
+
+def make_value(rule: str, valid: bool, rnd: random.Random, tries: int = 1000) -> str:
+    """rule의 유효/무효 값 하나. 후보를 만들어 validator 결과가 원하는 쪽일 때까지 반복."""
+    gen = CANDIDATES[rule]
+    check = RULES[rule]["validator"]
+    for _ in range(tries):
+        v = gen(rnd)
+        if bool(check(v, None)) == valid:
+            return v
+    if not valid and rule in NEAR_MISS:
+        return NEAR_MISS[rule](rnd)
+    raise ValueError(f"{rule}: {'유효' if valid else '무효'} 값을 만들 수 없습니다.")
+
+
+def parse_density(spec: Optional[str]) -> Dict[str, float]:
+    """'rrn=0.02,card=0.01' → 규칙별 밀도. 지정하지 않은 규칙은 DEFAULT_DENSITY, 'all=0.01'은 전체 기본값."""
+    base = DEFAULT_DENSITY
+    out: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name == "all":
+            base = float(value)
+        elif name in RULES:
+            out[name] = float(value)
+        else:
+            raise ValueError(f"알 수 없는 규칙: {name} (가능: all, {', '.join(RULES)})")
+    return {r: out.get(r, base) for r in RULES}
+
+
+def make_pages(
+    pages: int,
+    words: int,
+    density: Dict[str, float],
+    invalid_ratio: float = 0.3,
+    seed: int = 0,
+) -> Tuple[List[str], Dict[str, Dict[str, int]]]:
+    """
+    페이지별 텍스트(한 줄 12단어)와 심은 값 개수 {rule: {"valid": n, "invalid": n}}.
+    단어마다 규칙별 밀도 확률로 그 규칙 값을 넣고, 그중 invalid_ratio는 무효 값.
+    """
+    rnd = random.Random(seed)
+    planted = {r: {"valid": 0, "invalid": 0} for r in RULES}
+    rules = [(r, p) for r, p in density.items() if p > 0]
+    texts: List[str] = []
+    for _ in range(pages):
+        out: List[str] = []
+        for _ in range(words):
+            x = rnd.random()
+            token = None
+            for rule, p in rules:
+                if x < p:
+                    valid = rnd.random() >= invalid_ratio
+                    token = make_value(rule, valid, rnd)
+                    planted[rule]["valid" if valid else "invalid"] += 1
+                    break
+                x -= p
+            out.append(token or rnd.choice(FILLER))
+        lines = [" ".join(out[i:i + 12]) for i in range(0, len(out), 12)]
+        texts.append("\n".join(lines))
+    return texts, planted
+
+
+def make_pdf(texts: List[str]) -> bytes:
+    """페이지 텍스트 → 압축 저장한 PDF 바이트 (줄이 많으면 글자 크기를 줄여 한 페이지에 넣는다)."""
+    doc = fitz.open()
+    for text in texts:
+        page = doc.new_page()
+        lines = text.split("\n")
+        size = max(4.0, min(10.0, (page.rect.height - 100) / max(1, len(lines)) / 1.4))
+        y = 50 + size
+        for line in lines:
+            page.insert_text((40, y), line, fontname="korea", fontsize=size)
+            y += size * 1.4
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, default=5)
+    ap.add_argument("--words", type=int, default=300, help="페이지당 단어 수")
+    ap.add_argument("--density", default=None, help="규칙별 밀도. 예: all=0.01,rrn=0.02")
+    ap.add_argument("--invalid-ratio", type=float, default=0.3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default=None, help="PDF로 저장할 경로 (없으면 첫 페이지 텍스트 출력)")
+    args = ap.parse_args()
+
+    texts, planted = make_pages(args.pages, args.words, parse_density(args.density), args.invalid_ratio, args.seed)
+    for rule, c in planted.items():
+        print(f"{rule:>15} valid={c['valid']:>5} invalid={c['invalid']:>5}")
+    if args.out:
+        with open(args.out, "wb") as f:
+            f.write(make_pdf(texts))
+        print(f"saved: {args.out}")
+    else:
+        print(texts[0] if texts else "")
+
+
+if __name__ == "__main__":
+    main()
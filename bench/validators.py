@@ -0,0 +1,69 @@
+"""
+스칼라 validator vs 배치(NumPy) validator 벤치마크.
+
+규칙별로 후보 N개(유효/무효 섞임)를 만들어 두 방식의 시간을 재고 결과가 같은지 확인한다.
+
+실행: python -m bench.validators [--n 100000]
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from server.batch_validators import validate_batch
+from server.redac_rules import RULES
+
+W = [2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5]
+
+
+def _rrn_like(rnd: random.Random, gender: str) -> str:
+    d = f"{rnd.randint(0, 99):02d}{rnd.randint(1, 12):02d}{rnd.randint(1, 31):02d}{gender}{rnd.randint(0, 99999):05d}"
+    chk = (11 - sum(int(x) * w for x, w in zip(d, W)) % 11) % 10
+    if rnd.random() < 0.3:
+        chk = (chk + 1) % 10
+    return f"{d[:6]}-{d[6:]}{chk}"
+
+
+def _card_like(rnd: random.Random) -> str:
+    head = rnd.choice(["4", "51", "35", "6", "9", "2221", "37"])
+    n = 15 if head == "37" else 16
+    d = head + "".join(rnd.choice("0123456789") for _ in range(n - len(head)))
+    return " ".join(d[i:i + 4] for i in range(0, n, 4))
+
+
+def make_values(rule: str, n: int, seed: int = 0) -> List[str]:
+    rnd = random.Random(seed)
+    if rule == "rrn":
+        return [_rrn_like(rnd, rnd.choice("1234")) for _ in range(n)]
+    if rule == "fgn":
+        return [_rrn_like(rnd, rnd.choice("5678")) for _ in range(n)]
+    if rule == "card":
+        return [_card_like(rnd) for _ in range(n)]
+    if rule == "driver_license":
+        return [f"{rnd.randint(11, 28)}-{rnd.randint(0, 99):02d}-{rnd.randint(0, 999999):06d}-{rnd.randint(0, 99):02d}"
+                for _ in range(n)]
+    raise ValueError(rule)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--n", type=int, default=100_000)
+    args = ap.parse_args()
+
+    print(f"{'rule':>15} {'n':>8} {'scalar ms':>10} {'batch ms':>9} {'speedup':>8} {'valid':>7}")
+    for rule in ("rrn", "fgn", "card", "driver_license"):
+        values = make_values(rule, args.n)
+        fn = RULES[rule]["validator"]
+        t0 = time.perf_counter()
+        scalar = [bool(fn(v, None)) for v in values]
+        t_scalar = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        batch = validate_batch(rule, values).tolist()
+        t_batch = time.perf_counter() - t0
+        assert scalar == batch, rule
+        print(f"{rule:>15} {args.n:>8} {t_scalar * 1000:>10.1f} {t_batch * 1000:>9.1f} "
+              f"{t_scalar / t_batch:>7.1f}x {sum(batch):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+매치 → 토큰 범위 변환 마이크로벤치마크.
+
+전화번호/이메일이 빽빽한 합성 페이지에서 PageLayout.word_range(bisect)와
+기존 방식(매치마다 전체 토큰 재스캔)을 단어 수를 늘려가며 비교한다.
+word_range는 단어 수에 선형(µs/word 거의 일정), 기존 방식은 제곱으로 늘어나야 한다.
+
+실행: python -m bench.word_index [--sizes 1000,2000,4000,8000] [--repeat 3]
+"""
+import argparse
+import random
+import time
+from typing import List, Optional, Tuple
+
+from server.pdf_redaction import PageLayout
+from server.redac_rules import MOBILE_RE, EMAIL_RE
+
+
+def make_dense_words(n_words: int, seed: int = 0) -> List[tuple]:
+    """get_text("words")와 같은 튜플 형식의 합성 단어 목록 (PII 밀도 높음)."""
+    rnd = random.Random(seed)
+    words = []
+    x, y = 20.0, 20.0
+    for i in range(n_words):
+        k = rnd.randint(0, 3)
+        if k == 0:
+            t = f"010-{rnd.randint(1000, 9999)}-{rnd.randint(1000, 9999)}"
+        elif k == 1:
+            t = f"user{rnd.randint(1, 9999)}@example.com"
+        else:
+            t = rnd.choice(["tel", "mail", "연락처", "담당"])
+        w = 5.0 * len(t)
+        if x + w > 580:
+            x, y = 20.0, y + 12.0
+        words.append((x, y, x + w, y + 10.0, t, 0, y // 12, i))
+        x += w + 4.0
+    return words
+
+
+def _legacy_word_range(tokens: List[str], start_char: int, end_char: int) -> Optional[Tuple[int, int]]:
+    start_idx = end_idx = None
+    acc = 0
+    for i, t in enumerate(tokens):
+        if i > 0:
+            acc += 1
+        token_start, token_end = acc, acc + len(t)
+        if token_end > start_char and token_start < end_char:
+            if start_idx is None:
+                start_idx = i
+            end_idx = i + 1
+        acc += len(t)
+    if start_idx is None:
+        return None
+    return start_idx, end_idx
+
+
+def _time_indexed(words: List[tuple]) -> Tuple[float, int]:
+    t0 = time.perf_counter()
+    layout = PageLayout(words)
+    n = 0
+    for comp in (MOBILE_RE, EMAIL_RE):
+        for m in comp.finditer(layout.joined):
+            if layout.word_range(m.start(), m.end()) is not None:
+                n += 1
+    return time.perf_counter() - t0, n
+
+
+def _time_legacy(words: List[tuple]) -> Tuple[float, int]:
+    t0 = time.perf_counter()
+    tokens = [w[4] for w in words]
+    joined = " ".join(tokens)
+    n = 0
+    for comp in (MOBILE_RE, EMAIL_RE):
+        for m in comp.finditer(joined):
+            if _legacy_word_range(tokens, m.start(), m.end()) is not None:
+                n += 1
+    return time.perf_counter() - t0, n
+
+
+def run(sizes: List[int], repeat: int = 3, legacy: bool = True) -> List[dict]:
+    rows = []
+    for n_words in sizes:
+        words = make_dense_words(n_words)
+        t_idx, matches = min(_time_indexed(words) for _ in range(repeat))
+        row = {"words": n_words, "matches": matches, "indexed_ms": t_idx * 1000}
+        if legacy:
+            t_old, matches_old = min(_time_legacy(words) for _ in range(repeat))
+            assert matches_old == matches
+            row["legacy_ms"] = t_old * 1000
+        rows.append(row)
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="1000,2000,4000,8000")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-legacy", action="store_true", help="기존 방식 측정 생략 (큰 size용)")
+    args = ap.parse_args()
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+
+    rows = run(sizes, args.repeat, legacy=not args.no_legacy)
+    print(f"{'words':>8} {'matches':>8} {'indexed ms':>11} {'us/word':>8} {'legacy ms':>10} {'us/word':>8}")
+    for r in rows:
+        line = f"{r['words']:>8} {r['matches']:>8} {r['indexed_ms']:>11.2f} {r['indexed_ms'] * 1000 / r['words']:>8.2f}"
+        if "legacy_ms" in r:
+            line += f" {r['legacy_ms']:>10.2f} {r['legacy_ms'] * 1000 / r['words']:>8.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -98,9 +98,24 @@ $('#btn-scan')?.addEventListener('click', async () => {
   $('#status').textContent = '처리 중...'
 
   try {
+    // 0. PDF는 한 번만 업로드해 문서 세션 생성 → 이후 doc_id로 호출
+    const isPdf = f.type === 'application/pdf'
+    let docId = null
+    if (isPdf) {
+      const fd0 = new FormData()
+      fd0.append('file', f)
+      const docResp = await fetch(`${API_BASE()}/documents`, {
+        method: 'POST',
+        body: fd0,
+      })
+      if (!docResp.ok) throw new Error(`documents ${docResp.status}`)
+      docId = (await docResp.json()).doc_id
+    }
+
     // 1. 텍스트 추출
     const fd = new FormData()
-    fd.append('file', f)
+    if (docId) fd.append('doc_id', docId)
+    else fd.append('file', f)
     const extResp = await fetch(`${API_BASE()}/text/extract`, {
       method: 'POST',
       body: fd,
@@ -154,9 +169,9 @@ $('#btn-scan')?.addEventListener('click', async () => {
 
     // 3. detect (PDF일 때만)
     let boxes = []
-    if (f.type === 'application/pdf') {
+    if (isPdf) {
       const fd2 = new FormData()
-      fd2.append('file', f)
+      fd2.append('doc_id', docId)
       const detResp = await fetch(`${API_BASE()}/redactions/detect`, {
         method: 'POST',
         body: fd2,
@@ -187,10 +202,10 @@ $('#btn-scan')?.addEventListener('click', async () => {
     __lastRedactedBlob = null
     const saveBtn = $('#btn-save-redacted')
 
-    if (f.type === 'application/pdf' && boxes.length > 0) {
+    if (isPdf && boxes.length > 0) {
       const req = { boxes, fill: 'black' }
       const fd3 = new FormData()
-      fd3.append('file', f)
+      fd3.append('doc_id', docId)
       fd3.append('req', JSON.stringify(req))
 
       const redResp = await fetch(`${API_BASE()}/redactions/apply`, {
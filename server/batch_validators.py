@@ -0,0 +1,190 @@
+# batch_validators.py
+"""
+규칙별 후보 값을 한 번에 검증하는 배치 API (NumPy).
+
+validators.py의 스칼라 함수와 결과가 정확히 같아야 한다.
+숫자만 남긴 값을 길이별로 묶어 (n, L) 자리수 배열로 만들고
+날짜/체크섬/Luhn/IIN을 벡터 연산으로 계산한다. 오늘 날짜는 배치마다 한 번만 구한다.
+ASCII 숫자가 아닌 값(전각 숫자 등)은 스칼라 함수로 처리한다.
+"""
+import re
+import logging
+from datetime import date
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from . import validators as V
+
+_NON_DIGIT = re.compile(r"\D")
+_WEIGHTS = np.array([2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5], dtype=np.int64)
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+log = logging.getLogger("redaction.validators")
+
+# 이 개수 미만이면 스칼라 루프가 더 싸다
+BATCH_MIN = 8
+
+
+def _digit_matrix(ds: List[str], length: int) -> np.ndarray:
+    """같은 길이의 ASCII 숫자 문자열 목록 → (n, length) int64 배열."""
+    buf = np.frombuffer("".join(ds).encode("ascii"), dtype=np.uint8)
+    return (buf.reshape(len(ds), length) - 48).astype(np.int64)
+
+
+def _num(m: np.ndarray, a: int, b: int) -> np.ndarray:
+    """m[:, a:b] 자리수를 정수로."""
+    out = np.zeros(m.shape[0], dtype=np.int64)
+    for i in range(a, b):
+        out = out * 10 + m[:, i]
+    return out
+
+
+def _valid_date6(m: np.ndarray, today: date) -> np.ndarray:
+    """validators.is_valid_date6과 동일: strptime('%y%m%d') 규칙(69~99 → 1900년대) + 오늘 이전."""
+    yy, mm, dd = _num(m, 0, 2), _num(m, 2, 4), _num(m, 4, 6)
+    year = np.where(yy < 69, 2000 + yy, 1900 + yy)
+    ok = (mm >= 1) & (mm <= 12) & (dd >= 1)
+    dim = _DAYS_IN_MONTH[np.clip(mm, 0, 12)]
+    leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    dim = np.where((mm == 2) & leap, 29, dim)
+    ok &= dd <= dim
+    ymd = year * 10000 + mm * 100 + dd
+    ok &= ymd <= today.year * 10000 + today.month * 100 + today.day
+    return ok
+
+
+def _checksum11(m: np.ndarray) -> np.ndarray:
+    total = m[:, :12] @ _WEIGHTS
+    return (11 - total % 11) % 10
+
+
+def _full_year(yy: np.ndarray, today: date) -> np.ndarray:
+    this_year = int(str(today.year)[2:])
+    return np.where(yy > this_year, 1900 + yy, 2000 + yy)
+
+
+def _rrn(m: np.ndarray, opts: Optional[dict], today: date) -> np.ndarray:
+    ok = _valid_date6(m, today)
+    if (opts or {}).get("rrn_checksum", True):
+        ok &= _checksum11(m) == m[:, 12]
+    return ok
+
+
+def _fgn(m: np.ndarray, opts: Optional[dict], today: date) -> np.ndarray:
+    ok = _valid_date6(m, today)
+    ok &= (m[:, 6] >= 5) & (m[:, 6] <= 8)
+    full_year = _full_year(_num(m, 0, 2), today)
+    chk = (_checksum11(m) + 2) % 10
+    ok &= (full_year >= 2020) | (chk == m[:, 12])
+    return ok
+
+
+def _driver_license(m: np.ndarray, opts: Optional[dict], today: date) -> np.ndarray:
+    full_year = _full_year(_num(m, 2, 4), today)
+    return (full_year >= 1960) & (full_year <= today.year)
+
+
+def _luhn(m: np.ndarray) -> np.ndarray:
+    n = m.shape[1]
+    # 오른쪽 끝에서 두 번째 자리부터 한 칸씩 건너 2배
+    dbl = np.zeros(n, dtype=bool)
+    dbl[n - 2::-2] = True
+    v = np.where(dbl, m * 2, m)
+    v = np.where(v > 9, v - 9, v)
+    return v.sum(axis=1) % 10 == 0
+
+
+def _card(m: np.ndarray, opts: Optional[dict], today: date) -> np.ndarray:
+    o = {"luhn": True, "iin": True}
+    if opts:
+        o.update(opts)
+    ok = np.ones(m.shape[0], dtype=bool)
+    if o["iin"]:
+        if m.shape[1] == 16:
+            d0 = m[:, 0]
+            p2 = _num(m, 0, 2)
+            p4 = _num(m, 0, 4)
+            ok = (
+                (d0 == 4)
+                | ((d0 == 5) & (p2 >= 51) & (p2 <= 55))
+                | ((d0 == 2) & (p4 >= 2221) & (p4 <= 2720))
+                | (d0 == 6)
+                | (d0 == 9)
+                | (p2 == 35)
+            )
+        else:  # 15자리 → Amex
+            p2 = _num(m, 0, 2)
+            ok = (p2 == 34) | (p2 == 37)
+    if o["luhn"]:
+        ok &= _luhn(m)
+    return ok
+
+
+# rule -> (허용 길이, 배치 함수, 스칼라 함수)
+_NUMERIC_RULES: Dict[str, tuple] = {
+    "rrn": ((13,), _rrn, V.is_valid_rrn),
+    "fgn": ((13,), _fgn, V.is_valid_fgn),
+    "driver_license": ((12,), _driver_license, V.is_valid_driver_license),
+    "card": ((15, 16), _card, V.is_valid_card),
+}
+
+
+def _safe_scalar(fn: Callable, value: str, opts: Optional[dict]) -> bool:
+    try:
+        return bool(fn(value, opts))
+    except Exception as e:
+        log.debug("[VALIDATOR ERROR] fn=%s err=%s", getattr(fn, "__name__", fn), e)
+        return False
+
+
+def supports(rule: str) -> bool:
+    return rule in _NUMERIC_RULES
+
+
+def validate_batch(rule: str, values: Sequence[str], opts: Optional[dict] = None) -> np.ndarray:
+    """
+    rule의 후보 값들을 한 번에 검증해 bool 배열 반환.
+    숫자 규칙(rrn/fgn/card/driver_license)은 벡터화, 그 외는 스칼라 validator 루프.
+    스칼라 validator가 예외를 던지는 값은 False (기존 파이프라인과 동일).
+    """
+    out = np.zeros(len(values), dtype=bool)
+    spec = _NUMERIC_RULES.get(rule)
+    if spec is None:
+        from .redac_rules import RULES  # 순환 import 방지
+        fn = RULES[rule]["validator"]
+        for i, v in enumerate(values):
+            out[i] = _safe_scalar(fn, v, opts)
+        return out
+
+    lengths, batch_fn, scalar_fn = spec
+    today = date.today()
+    groups: Dict[int, List[int]] = {L: [] for L in lengths}
+    digits: List[str] = []
+    for i, v in enumerate(values):
+        d = _NON_DIGIT.sub("", v or "")
+        digits.append(d)
+        if not d.isascii():
+            out[i] = _safe_scalar(scalar_fn, v, opts)
+        elif len(d) in groups:
+            groups[len(d)].append(i)
+        # 그 외 길이는 False
+
+    for L, idx in groups.items():
+        if not idx:
+            continue
+        m = _digit_matrix([digits[i] for i in idx], L)
+        out[np.asarray(idx)] = batch_fn(m, opts, today)
+    return out
+
+
+def validate_many(rule: str, validator: Optional[Callable], values: Sequence[str], opts: Optional[dict] = None) -> List[bool]:
+    """
+    파이프라인용: 후보가 BATCH_MIN개 이상이고 배치 지원 규칙이면 validate_batch,
+    아니면 스칼라 validator 루프. validator가 없으면 모두 True.
+    """
+    if not callable(validator):
+        return [True] * len(values)
+    if len(values) >= BATCH_MIN and supports(rule) and validator is _NUMERIC_RULES[rule][2]:
+        return validate_batch(rule, values, opts).tolist()
+    return [_safe_scalar(validator, v, opts) for v in values]
@@ -0,0 +1,112 @@
+# box_index.py
+"""
+Box 중복 제거 / 겹침 병합.
+
+- dedup_boxes: 페이지별 격자 버킷(셀 크기 = tol)으로 근접 후보만 비교. 기존 O(n²) 비교와 결과 동일.
+- merge_boxes: 같은 줄에서 겹치거나 gap 이하로 붙은 박스를 하나로 합친다. O(n log n).
+"""
+import math
+from typing import Dict, List, Tuple
+
+from .schemas import Box
+
+
+def _same(a: Box, b: Box, tol: float) -> bool:
+    return (
+        abs(a.x0 - b.x0) <= tol and
+        abs(a.y0 - b.y0) <= tol and
+        abs(a.x1 - b.x1) <= tol and
+        abs(a.y1 - b.y1) <= tol
+    )
+
+
+def dedup_boxes(boxes: List[Box], tol: float = 0.25) -> List[Box]:
+    """
+    좌표가 tol 이내로 같은 박스 제거 (먼저 나온 박스 유지, 입력 순서 보존).
+    (page, x0/cell, y0/cell) 격자에 남긴 박스를 넣고, 주변 3x3 셀만 비교한다.
+    """
+    cell = max(tol, 1e-6)
+    grid: Dict[Tuple[int, int, int], List[Box]] = {}
+    out: List[Box] = []
+    for b in boxes:
+        cx = math.floor(b.x0 / cell)
+        cy = math.floor(b.y0 / cell)
+        dup = False
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for k in grid.get((b.page, cx + dx, cy + dy), ()):
+                    if _same(b, k, tol):
+                        dup = True
+                        break
+                if dup:
+                    break
+            if dup:
+                break
+        if dup:
+            continue
+        grid.setdefault((b.page, cx, cy), []).append(b)
+        out.append(b)
+    return out
+
+
+def _same_line(b: Box, band: Tuple[float, float], min_overlap: float) -> bool:
+    overlap = min(b.y1, band[1]) - max(b.y0, band[0])
+    h = min(b.y1 - b.y0, band[1] - band[0])
+    if h <= 0:
+        return overlap >= 0
+    return overlap >= min_overlap * h
+
+
+def _union(group: List[Box]) -> Box:
+    if len(group) == 1:
+        return group[0]
+    names = sorted({b.pattern_name for b in group if b.pattern_name})
+    texts = [b.matched_text for b in group if b.matched_text]
+    return Box(
+        page=group[0].page,
+        x0=min(b.x0 for b in group),
+        y0=min(b.y0 for b in group),
+        x1=max(b.x1 for b in group),
+        y1=max(b.y1 for b in group),
+        matched_text=" ".join(texts) or None,
+        pattern_name="+".join(names) or None,
+    )
+
+
+def merge_boxes(boxes: List[Box], gap: float = 1.0, min_line_overlap: float = 0.5) -> List[Box]:
+    """
+    같은 줄(세로 겹침이 낮은 쪽 높이의 min_line_overlap 이상)에서
+    겹치거나 가로 간격이 gap 이하인 박스를 합집합 사각형 하나로 병합.
+    결과는 (page, y0, x0) 순으로 정렬된다.
+    """
+    by_page: Dict[int, List[Box]] = {}
+    for b in boxes:
+        by_page.setdefault(b.page, []).append(b)
+
+    out: List[Box] = []
+    for pno in sorted(by_page):
+        # 1) 세로 중심 순으로 줄 묶기
+        lines: List[List[Box]] = []
+        band: Tuple[float, float] = (0.0, 0.0)
+        for b in sorted(by_page[pno], key=lambda r: ((r.y0 + r.y1) / 2, r.x0)):
+            if lines and _same_line(b, band, min_line_overlap):
+                lines[-1].append(b)
+                band = (min(band[0], b.y0), max(band[1], b.y1))
+            else:
+                lines.append([b])
+                band = (b.y0, b.y1)
+
+        # 2) 줄 안에서 x 순 스윕 병합
+        for line in lines:
+            line.sort(key=lambda r: r.x0)
+            group = [line[0]]
+            right = line[0].x1
+            for b in line[1:]:
+                if b.x0 <= right + gap:
+                    group.append(b)
+                    right = max(right, b.x1)
+                else:
+                    out.append(_union(group))
+                    group, right = [b], b.x1
+            out.append(_union(group))
+    return out
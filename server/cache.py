@@ -0,0 +1,109 @@
+# cache.py
+"""
+프로세스 내 LRU + TTL 캐시.
+엔트리 수(max_entries)와 선택적 총 무게(max_weight, weigher로 계산)로 제한하고,
+ttl_seconds가 지난 항목은 조회 시점에 버린다. 스레드 안전.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_weight: int = 0,
+        weigher: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.max_weight = max(0, max_weight)
+        self._weigher = weigher
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, weight, value)
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _drop(self, key: Hashable) -> None:
+        _, weight, _ = self._data.pop(key)
+        self._weight -= weight
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            if item[0] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[2]
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """저장했으면 True. 캐시가 꺼져 있거나 단일 항목이 무게 한도보다 크면 저장하지 않고 False."""
+        if self.max_entries == 0:
+            return False
+        weight = self._weigher(value) if self._weigher else 0
+        if self.max_weight and weight > self.max_weight:
+            return False
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (time.monotonic() + self.ttl_seconds, weight, value)
+            self._weight += weight
+            while len(self._data) > self.max_entries or (self.max_weight and self._weight > self.max_weight):
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self.evictions += 1
+        return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._data[key][2]
+            self._drop(key)
+            return value
+
+    def purge_expired(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (exp, _, _) in self._data.items() if exp <= now]
+            for k in expired:
+                self._drop(k)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "weight": self._weight,
+                "max_weight": self.max_weight,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,163 @@
+# config.py
+"""
+환경변수 기반 서버 설정.
+값은 import 시점에 한 번 읽는다. (REDACTION_ 접두사)
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+# --------------------------
+# 탐지 병렬화 (프로세스 풀)
+# --------------------------
+# 0 또는 1이면 병렬 모드 끔 (기본). 2 이상이면 해당 개수의 워커 프로세스로 페이지 샤딩.
+DETECT_WORKERS = _env_int("REDACTION_DETECT_WORKERS", 0)
+# 샤드 하나가 맡을 최소 페이지 수. 페이지 수가 이 값의 2배 미만이면 프로세스 내에서 처리.
+DETECT_MIN_SHARD_PAGES = _env_int("REDACTION_DETECT_MIN_SHARD_PAGES", 50)
+
+
+# --------------------------
+# 문서 처리 스레드 풀 (executor.py)
+# --------------------------
+# 동시에 실행할 문서 작업 수
+DOC_WORKERS = _env_int("REDACTION_DOC_WORKERS", min(4, os.cpu_count() or 1))
+# 실행 대기 가능한 작업 수. 초과하면 429
+DOC_QUEUE = _env_int("REDACTION_DOC_QUEUE", 16)
+# 스트리밍 응답 소비 쪽이 이 시간(초) 동안 항목을 가져가지 않으면 생산 작업을 멈춘다 (0이면 끔)
+STREAM_IDLE_TIMEOUT_SECONDS = _env_int("REDACTION_STREAM_IDLE_TIMEOUT_SECONDS", 300)
+
+
+# --------------------------
+# 탐지 결과 캐시 (PDF 내용 해시 + 패턴 지문)
+# --------------------------
+# 0이면 캐시 끔
+DETECT_CACHE_ENTRIES = _env_int("REDACTION_DETECT_CACHE_ENTRIES", 64)
+DETECT_CACHE_TTL_SECONDS = _env_int("REDACTION_DETECT_CACHE_TTL_SECONDS", 600)
+# 캐시 전체에 보관할 최대 박스 수
+DETECT_CACHE_MAX_BOXES = _env_int("REDACTION_DETECT_CACHE_MAX_BOXES", 200_000)
+
+
+# --------------------------
+# 문서 세션 (업로드 1회 → doc_id로 재사용)
+# --------------------------
+SESSION_TTL_SECONDS = _env_int("REDACTION_SESSION_TTL_SECONDS", 1800)
+SESSION_MAX_DOCS = _env_int("REDACTION_SESSION_MAX_DOCS", 32)
+# 세션 전체 메모리 한도 (PDF 바이트 + 파싱된 단어/텍스트 추정치)
+SESSION_MAX_BYTES = _env_int("REDACTION_SESSION_MAX_BYTES", 512 * 1024 * 1024)
+
+
+# --------------------------
+# 사용자 패턴 컴파일 캐시 / 정규식 비용 가드
+# --------------------------
+PATTERN_CACHE_SIZE = _env_int("REDACTION_PATTERN_CACHE_SIZE", 256)
+# reject: 위험 패턴 400 거부 | flag: 경고 로그만 남기고 허용 | off: 검사 안 함
+PATTERN_GUARD = os.getenv("REDACTION_PATTERN_GUARD", "reject").strip().lower()
+# 요청 1건의 탐지 시간 한도(초). 페이지/패턴 사이에서 확인한다 (스트리밍은 소비를 기다린 시간 제외). 0이면 무제한
+DETECT_TIME_BUDGET_SECONDS = _env_int("REDACTION_DETECT_TIME_BUDGET_SECONDS", 60)
+# 프리셋이 아닌 패턴은 별도 프로세스에서 실행하고, 페이지 스캔 1회가 이 시간(초)(과 남은 탐지 한도 중 짧은 쪽)을
+# 넘으면 워커를 종료하고 422. 0이면 프로세스 내에서 실행 (정적 검사만)
+USER_REGEX_TIMEOUT_SECONDS = _env_int("REDACTION_USER_REGEX_TIMEOUT_SECONDS", 5)
+# 재사용할 유휴 샌드박스 워커 프로세스 수
+USER_REGEX_WORKERS = _env_int("REDACTION_USER_REGEX_WORKERS", DOC_WORKERS)
+
+
+# --------------------------
+# 대용량 텍스트 스트리밍 탐지 (/text/match/stream)
+# --------------------------
+# 창 하나의 크기(글자). 창마다 정규화/탐지 후 결과를 내보낸다.
+TEXT_STREAM_WINDOW_CHARS = _env_int("REDACTION_TEXT_STREAM_WINDOW_CHARS", 1 << 20)
+# 개행 없이 긴 줄을 강제로 자를 때 더 읽는 겹침 구간(글자). 이보다 긴 매치는 경계에서 놓칠 수 있다.
+TEXT_STREAM_OVERLAP_CHARS = _env_int("REDACTION_TEXT_STREAM_OVERLAP_CHARS", 4096)
+# 원시 본문을 받아 둘 임시 파일의 메모리 한도(바이트). 넘으면 디스크로 넘긴다.
+TEXT_STREAM_SPOOL_BYTES = _env_int("REDACTION_TEXT_STREAM_SPOOL_BYTES", 8 * 1024 * 1024)
+
+
+# --------------------------
+# 배치 레닥션 (/redactions/batch)
+# --------------------------
+# 동시에 처리할 파일 수. 0이면 문서 처리 풀 워커 수
+BATCH_CONCURRENCY = _env_int("REDACTION_BATCH_CONCURRENCY", 0)
+# 요청 1건의 최대 파일 수 / zip 항목 1개의 최대 크기(바이트)
+BATCH_MAX_FILES = _env_int("REDACTION_BATCH_MAX_FILES", 1000)
+BATCH_MAX_FILE_BYTES = _env_int("REDACTION_BATCH_MAX_FILE_BYTES", 200 * 1024 * 1024)
+# 업로드 파일 1개를 메모리에 둘 한도(바이트). 넘으면 디스크 임시 파일로
+BATCH_SPOOL_BYTES = _env_int("REDACTION_BATCH_SPOOL_BYTES", 1024 * 1024)
+
+
+# --------------------------
+# 비동기 레닥션 작업 (/redactions/jobs)
+# --------------------------
+# 작업 전용 풀 크기 / 대기열 길이 (요청-응답 처리용 문서 풀과 분리)
+JOB_WORKERS = _env_int("REDACTION_JOB_WORKERS", 1)
+JOB_QUEUE = _env_int("REDACTION_JOB_QUEUE", 32)
+# 끝난 작업(결과 PDF)을 보관하는 시간(초) / 개수 / 결과 바이트 총량
+JOB_RESULT_TTL_SECONDS = _env_int("REDACTION_JOB_RESULT_TTL_SECONDS", 600)
+JOB_MAX_FINISHED = _env_int("REDACTION_JOB_MAX_FINISHED", 64)
+JOB_MAX_RESULT_BYTES = _env_int("REDACTION_JOB_MAX_RESULT_BYTES", 512 * 1024 * 1024)
+# 작업 1건의 실행 시간 한도(초). 탐지 시간 한도도 이 값을 쓴다. 0이면 무제한
+JOB_TIMEOUT_SECONDS = _env_int("REDACTION_JOB_TIMEOUT_SECONDS", 1800)
+
+
+# --------------------------
+# 스캔 페이지 OCR (ocr=true일 때, 텍스트 레이어가 없는 페이지만)
+# --------------------------
+# 렌더링 해상도(DPI). 높을수록 정확하지만 OCR 시간이 길어진다
+OCR_DPI = _env_int("REDACTION_OCR_DPI", 300)
+# tesseract 언어 (설치된 traineddata 기준)
+OCR_LANG = os.getenv("REDACTION_OCR_LANG", "kor+eng").strip() or "eng"
+# OCR 워커 프로세스 수. 0 또는 1이면 프로세스 내에서 순차 처리
+OCR_WORKERS = _env_int("REDACTION_OCR_WORKERS", min(4, os.cpu_count() or 1))
+# 이 신뢰도(0~100) 미만인 OCR 단어는 버린다
+OCR_MIN_CONFIDENCE = _env_int("REDACTION_OCR_MIN_CONFIDENCE", 30)
+# 텍스트 레이어의 글자 수(공백 제외)가 이보다 적고 이미지가 있는 페이지를 스캔 페이지로 본다
+OCR_MIN_TEXT_CHARS = _env_int("REDACTION_OCR_MIN_TEXT_CHARS", 10)
+# 페이지 이미지 해시별 OCR 결과 캐시 (0이면 끔) / 보관 시간 / 캐시 전체 최대 단어 수
+OCR_CACHE_ENTRIES = _env_int("REDACTION_OCR_CACHE_ENTRIES", 4096)
+OCR_CACHE_TTL_SECONDS = _env_int("REDACTION_OCR_CACHE_TTL_SECONDS", 24 * 3600)
+OCR_CACHE_MAX_WORDS = _env_int("REDACTION_OCR_CACHE_MAX_WORDS", 2_000_000)
+
+
+# --------------------------
+# 레닥션 저장 프로파일 (pdf_redaction.SAVE_PROFILES)
+# --------------------------
+# standard: 기존 동작(기본값, 출력 바이트가 예전과 같음) | compact: 고아 객체 정리 + 압축
+# strip: 박스에 닿은 이미지/그래픽 통째 제거 + 압축 — compact/strip은 요청이나 이 설정으로 골라 쓴다
+SAVE_PROFILE = os.getenv("REDACTION_SAVE_PROFILE", "standard").strip().lower() or "standard"
+
+
+# --------------------------
+# 업로드 spool (/redactions/detect, apply, jobs, /text/extract)
+# --------------------------
+# 업로드 PDF는 메모리에 올리지 않고 이 디렉터리의 임시 파일로 받아 경로로 연다. 비우면 시스템 임시 디렉터리
+UPLOAD_SPOOL_DIR = os.getenv("REDACTION_UPLOAD_SPOOL_DIR", "").strip() or None
+# 업로드 파일 1개의 최대 크기(바이트). 넘으면 413. 0이면 무제한
+UPLOAD_MAX_BYTES = _env_int("REDACTION_UPLOAD_MAX_BYTES", 512 * 1024 * 1024)
+
+
+# --------------------------
+# 지표 (/metrics, Prometheus 텍스트 형식)
+# --------------------------
+# 0이면 단계별 시간/카운터 집계를 끈다
+METRICS_ENABLED = _env_int("REDACTION_METRICS_ENABLED", 1) != 0
+
+
+# --------------------------
+# 요청 프로파일링 (X-Redaction-Trace 헤더 또는 ?trace= 로 관리자만 요청)
+# --------------------------
+# 관리자 토큰. 비어 있으면 프로파일링 요청을 모두 거부(403)
+TRACE_TOKEN = os.getenv("REDACTION_TRACE_TOKEN", "").strip()
+# 보관할 트레이스 수 / 보관 시간(초)
+TRACE_MAX_ENTRIES = _env_int("REDACTION_TRACE_MAX_ENTRIES", 32)
+TRACE_TTL_SECONDS = _env_int("REDACTION_TRACE_TTL_SECONDS", 3600)
+# 트레이스 1건의 최대 span 수 (넘으면 버리고 개수만 기록) / 상위 함수 개수
+TRACE_MAX_SPANS = _env_int("REDACTION_TRACE_MAX_SPANS", 20000)
+TRACE_TOP_FUNCTIONS = _env_int("REDACTION_TRACE_TOP_FUNCTIONS", 30)
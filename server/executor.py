@@ -0,0 +1,239 @@
+# executor.py
+"""
+문서 처리(PyMuPDF) 전용 스레드 풀.
+
+async 핸들러에서 fitz 작업을 이벤트 루프 밖으로 빼고,
+동시 처리 수(workers)와 대기열 길이(max_queue)를 제한한다.
+대기열이 가득 차면 ExecutorBusy를 던지고, main.py에서 429로 변환한다.
+"""
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from . import config
+
+log = logging.getLogger("redaction.executor")
+
+
+class ExecutorBusy(Exception):
+    """실행 중 + 대기 작업 수가 한도에 도달함."""
+
+    def __init__(self, limit: int, retry_after: int = 1):
+        super().__init__(f"문서 처리 대기열이 가득 찼습니다. (limit={limit})")
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+class DocumentExecutor:
+    def __init__(self, workers: int, max_queue: int, name: str = "doc-worker"):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        # 누적 지표
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_queued = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+
+    @property
+    def limit(self) -> int:
+        return self.workers + self.max_queue
+
+    def _check_room(self) -> None:
+        """가득 찼으면 ExecutorBusy (_lock을 잡은 상태에서 호출)."""
+        if self._queued + self._running >= self.limit:
+            self._rejected += 1
+            raise ExecutorBusy(self.limit)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """한도 확인 후 작업 제출. 가득 차면 ExecutorBusy."""
+        with self._lock:
+            self._check_room()
+            self._queued += 1
+            self._submitted += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        submitted_at = time.perf_counter()
+
+        def _call():
+            started = time.perf_counter()
+            wait = started - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self._running -= 1
+                    self._run_total += elapsed
+                    self._run_max = max(self._run_max, elapsed)
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+
+        fut = self._pool.submit(_call)
+
+        def _on_done(f: Future) -> None:
+            # 시작 전에 취소된 작업은 _call이 실행되지 않으므로 대기 카운트만 되돌린다
+            if f.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        fut.add_done_callback(_on_done)
+        return fut
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """이벤트 루프에서 호출: 풀에서 fn 실행 후 결과 반환."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stream(
+        self,
+        fn: Callable[..., Iterator],
+        *args,
+        buffer: int = 8,
+        idle_timeout: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator:
+        """
+        fn(*args)이 돌려주는 동기 이터레이터를 풀에서 돌리고, 항목을 async 이터레이터로 넘긴다.
+        한도는 호출 시점에 확인하므로 포화 시 ExecutorBusy는 응답 시작 전에 발생한다.
+        생산 작업은 첫 항목을 요청할 때 제출한다 (만들기만 하고 버린 스트림은 풀 자리를 잡지 않음).
+        buffer개를 넘게 앞서가면 생산 쪽이 기다린다. 소비 쪽이 닫히거나 버려지거나(GC)
+        idle_timeout초(기본 config.STREAM_IDLE_TIMEOUT_SECONDS) 동안 가져가지 않으면 생산도 멈춘다.
+        """
+        with self._lock:
+            self._check_room()
+        if idle_timeout is None:
+            idle_timeout = config.STREAM_IDLE_TIMEOUT_SECONDS
+        return _Stream(self, fn, args, kwargs, buffer, idle_timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._failed + self._running
+            finished = self._completed + self._failed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "max_queued": self._max_queued,
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "completed": self._completed,
+                "failed": self._failed,
+                "wait_ms_avg": (self._wait_total / started * 1000) if started else 0.0,
+                "wait_ms_max": self._wait_max * 1000,
+                "run_ms_avg": (self._run_total / finished * 1000) if finished else 0.0,
+                "run_ms_max": self._run_max * 1000,
+            }
+
+
+def _produce(
+    fn: Callable[..., Iterator],
+    args: tuple,
+    kwargs: dict,
+    push: Callable[[str, Any], None],
+    slots: threading.Semaphore,
+    stop: threading.Event,
+    idle_timeout: float,
+) -> None:
+    """풀 스레드에서 fn 이터레이터를 돌려 push로 넘긴다. _Stream 객체는 참조하지 않는다 (GC로 멈출 수 있게)."""
+    it = fn(*args, **kwargs)
+    try:
+        for item in it:
+            waited_from = time.monotonic()
+            while not slots.acquire(timeout=0.5):
+                if stop.is_set():
+                    return
+                if idle_timeout > 0 and time.monotonic() - waited_from > idle_timeout:
+                    log.warning("stream consumer idle for %.0fs, stopping producer", idle_timeout)
+                    raise TimeoutError(f"스트림 소비가 {idle_timeout:g}초 동안 없어 중단했습니다.")
+            if stop.is_set():
+                return
+            push("item", item)
+    except Exception as e:
+        push("error", e)
+    finally:
+        close = getattr(it, "close", None)
+        if callable(close):
+            close()
+        push("end", None)
+
+
+class _Stream:
+    """DocumentExecutor.stream()의 async 이터레이터."""
+
+    def __init__(self, executor: DocumentExecutor, fn, args, kwargs, buffer: int, idle_timeout: float):
+        self._executor = executor
+        self._job = (fn, args, kwargs)
+        self._idle_timeout = idle_timeout
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._slots = threading.Semaphore(max(1, buffer))
+        self._stop = threading.Event()
+        self._started = False
+        self._done = False
+        # 소비 쪽이 aclose 없이 버려져도 생산 스레드가 풀 자리를 계속 잡지 않도록
+        weakref.finalize(self, self._stop.set)
+
+    def __aiter__(self) -> "_Stream":
+        return self
+
+    def _start(self) -> None:
+        loop, queue, stop = self._loop, self._queue, self._stop
+
+        def _push(kind: str, item: Any) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (kind, item))
+            except RuntimeError:  # 이벤트 루프 종료
+                stop.set()
+
+        fn, args, kwargs = self._job
+        self._started = True
+        self._executor.submit(_produce, fn, args, kwargs, _push, self._slots, stop, self._idle_timeout)
+
+    async def __anext__(self) -> Any:
+        if self._done:
+            raise StopAsyncIteration
+        if not self._started:
+            try:
+                self._start()
+            except BaseException:
+                self._done = True
+                raise
+        kind, item = await self._queue.get()
+        if kind == "end":
+            self._done = True
+            raise StopAsyncIteration
+        if kind == "error":
+            self._done = True
+            self._stop.set()
+            raise item
+        self._slots.release()
+        return item
+
+    async def aclose(self) -> None:
+        self._done = True
+        self._stop.set()
+
+
+doc_executor = DocumentExecutor(config.DOC_WORKERS, config.DOC_QUEUE)
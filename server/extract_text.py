@@ -1,24 +1,35 @@
-import fitz  # PyMuPDF
+from starlette.concurrency import run_in_threadpool
 
-def extract_pdf_text(data: bytes) -> dict:
-    """PDF 바이트에서 페이지별 텍스트 추출"""
+from .executor import doc_executor
+from .page_ranges import resolve_pages
+from .pdf_redaction import open_pdf
+from .uploads import remove_quietly, spool_to_path
+
+def build_extract_result(texts, page_numbers=None) -> dict:
+    """페이지별 텍스트 목록 → extract 응답 형식 (page_numbers: 1부터 센 쪽 번호, 없으면 1..n)"""
     pages = []
     full = []
-    with fitz.open(stream=data, filetype="pdf") as doc:
-        for i, page in enumerate(doc, start=1):
-            txt = page.get_text("text") or ""
-            pages.append({"page": i, "text": txt})
-            full.append(f"===== [Page {i}] =====\n{txt}")
+    for i, txt in zip(page_numbers or range(1, len(texts) + 1), texts):
+        pages.append({"page": i, "text": txt})
+        full.append(f"===== [Page {i}] =====\n{txt}")
     return {"full_text": "\n".join(full), "pages": pages}
 
 
-async def extract_text_from_file(file) -> dict:
+def extract_pdf_text(data, pages=None) -> dict:
+    """PDF(바이트 또는 경로)에서 페이지별 텍스트 추출 (pages: page_ranges.parse_pages 결과면 그 페이지만)"""
+    with open_pdf(data) as doc:
+        pnos = resolve_pages(pages, len(doc))
+        texts = [doc.load_page(pno).get_text("text") or "" for pno in pnos]
+    return build_extract_result(texts, [pno + 1 for pno in pnos])
+
+
+async def extract_text_from_file(file, pages=None) -> dict:
     """
     UploadFile 받아서 PDF 또는 TXT 처리
-    - PDF: PyMuPDF로 추출
+    - PDF: PyMuPDF로 추출 (문서 처리 풀에서 실행, pages가 있으면 그 페이지만)
     - TXT: 그대로 읽어서 반환
+    PDF는 메모리에 읽지 않고 임시 파일로 받아 경로로 연다.
     """
-    data = await file.read()
     name = (getattr(file, "filename", "") or "").lower()
     ctype = (getattr(file, "content_type", "") or "").lower()
 
@@ -26,8 +37,13 @@ async def extract_text_from_file(file) -> dict:
     is_txt = ctype.startswith("text/") or name.endswith(".txt")
 
     if is_pdf:
-        return extract_pdf_text(data)
+        path = await run_in_threadpool(spool_to_path, file.file)
+        try:
+            return await doc_executor.run(extract_pdf_text, path, pages)
+        finally:
+            remove_quietly(path)
 
+    data = await file.read()
     if is_txt:
         try:
             text = data.decode("utf-8", errors="ignore")
@@ -0,0 +1,211 @@
+# jobs.py
+"""
+비동기 레닥션 작업: 제출 즉시 job_id를 돌려주고, 전용 풀(job_executor)에서 실행한다.
+실행 중에는 단계/페이지 진행률을 갱신하고, 끝난 작업은 결과와 함께 TTL 동안 보관한다.
+취소는 대기 중이면 바로, 실행 중이면 다음 진행률 보고(페이지 경계)에서 JobCancelled로 멈춘다.
+요청과 분리돼 있으므로 느린 클라이언트나 끊긴 연결이 작업에 영향을 주지 않는다.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from . import config
+from .cache import TTLCache
+from .executor import DocumentExecutor
+
+log = logging.getLogger("redaction.jobs")
+
+
+class JobCancelled(Exception):
+    """취소 요청 또는 작업 시간 한도 초과로 중단됨."""
+
+
+# queued → running → done | failed | cancelled
+FINISHED = ("done", "failed", "cancelled")
+
+
+class Job:
+    __slots__ = (
+        "job_id", "filename", "status", "stage", "pages_done", "pages_total",
+        "created_at", "started_at", "finished_at", "error", "result", "boxes", "save_stats",
+        "future", "_cancel", "_deadline",
+    )
+
+    def __init__(self, job_id: str, filename: str = ""):
+        self.job_id = job_id
+        self.filename = filename
+        self.status = "queued"
+        self.stage: Optional[str] = None
+        self.pages_done = 0
+        self.pages_total = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.result: Optional[bytes] = None
+        self.boxes = 0
+        self.save_stats: Optional[Dict[str, Any]] = None
+        self.future: Optional[Future] = None
+        self._cancel = threading.Event()
+        self._deadline: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def progress(self, stage: str, done: int, total: int) -> None:
+        """작업 함수가 페이지마다 호출. 취소/시간 초과면 JobCancelled로 작업을 멈춘다."""
+        if self._cancel.is_set():
+            raise JobCancelled("작업이 취소되었습니다.")
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise JobCancelled(f"작업 시간 한도({config.JOB_TIMEOUT_SECONDS}s)를 초과했습니다.")
+        self.stage, self.pages_done, self.pages_total = stage, done, total
+
+    def info(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        out = {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "status": self.status,
+            "stage": self.stage,
+            "pages_done": self.pages_done,
+            "pages_total": self.pages_total,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_ms": round((end - self.started_at) * 1000, 2) if self.started_at else 0.0,
+            "error": self.error,
+        }
+        if self.status == "done":
+            out["boxes"] = self.boxes
+            out["result_bytes"] = len(self.result or b"")
+            out["save"] = self.save_stats
+        if self.finished:
+            out["expires_in"] = max(0, int(self.finished_at + config.JOB_RESULT_TTL_SECONDS - time.time()))
+        return out
+
+
+class JobStore:
+    """
+    진행 중인 작업은 dict에, 끝난 작업은 TTLCache(개수/결과 바이트 한도)에 둔다.
+    작업 함수는 fn(*args, progress=job.progress, **kwargs) 형태로 호출되고
+    (결과 바이트, 박스 수, 저장 통계)를 돌려준다.
+    cleanup은 작업이 어떻게 끝나든(실행 전 취소 포함) 한 번 호출된다 (입력 임시 파일 삭제 등).
+    """
+
+    def __init__(self, executor: DocumentExecutor):
+        self.executor = executor
+        self._active: Dict[str, Job] = {}
+        self._finished = TTLCache(
+            config.JOB_MAX_FINISHED,
+            config.JOB_RESULT_TTL_SECONDS,
+            max_weight=config.JOB_MAX_RESULT_BYTES,
+            weigher=lambda j: len(j.result or b""),
+        )
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.cancelled = 0
+
+    def submit(
+        self, fn: Callable, *args, filename: str = "", cleanup: Optional[Callable[[], None]] = None, **kwargs,
+    ) -> Job:
+        """작업 등록 후 풀에 제출. 풀이 가득 차면 ExecutorBusy (등록도 취소, cleanup은 호출자 몫)."""
+        job = Job(uuid.uuid4().hex, filename)
+        with self._lock:
+            self._active[job.job_id] = job
+        try:
+            job.future = self.executor.submit(self._run, job, fn, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._active.pop(job.job_id, None)
+            raise
+        self.submitted += 1
+        job.future.add_done_callback(lambda f: self._finish(job, f, cleanup))
+        return job
+
+    @staticmethod
+    def _run(job: Job, fn: Callable, args: tuple, kwargs: dict):
+        if job._cancel.is_set():
+            raise JobCancelled("작업이 취소되었습니다.")
+        job.started_at = time.time()
+        if config.JOB_TIMEOUT_SECONDS > 0:
+            job._deadline = time.monotonic() + config.JOB_TIMEOUT_SECONDS
+        job.status = "running"
+        return fn(*args, progress=job.progress, **kwargs)
+
+    def _finish(self, job: Job, fut: Future, cleanup: Optional[Callable[[], None]] = None) -> None:
+        if cleanup is not None:
+            try:
+                cleanup()
+            except Exception:
+                log.exception("작업 정리 실패: id=%s", job.job_id)
+        if fut.cancelled():
+            job.status = "cancelled"
+        else:
+            err = fut.exception()
+            if err is None:
+                job.result, job.boxes, job.save_stats = fut.result()
+                job.status = "done"
+            elif job._cancel.is_set():
+                job.status = "cancelled"
+            else:
+                job.status = "failed"
+                job.error = str(getattr(err, "detail", None) or err)
+        job.finished_at = time.time()
+        job.future = None  # 입력 PDF 등 작업 인자를 놓아 준다
+        if not self._finished.put(job.job_id, job):
+            # 결과가 보관 한도보다 크면 조용히 사라지지 않게 실패로 남긴다
+            size = len(job.result or b"")
+            job.result, job.save_stats = None, None
+            job.status = "failed"
+            job.error = f"결과가 보관 한도({self._finished.max_weight}B)보다 큽니다. (result_bytes={size})"
+            self._finished.put(job.job_id, job)
+        # _finished에 먼저 넣고 _active에서 빼야 그 사이 상태 조회가 404를 보지 않는다
+        with self._lock:
+            self._active.pop(job.job_id, None)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._active.get(job_id)
+        return job if job is not None else self._finished.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """대기/실행 중이면 취소 요청, 끝난 작업이면 결과와 함께 삭제. 없으면 None."""
+        with self._lock:
+            job = self._active.get(job_id)
+        if job is None:
+            return self._finished.pop(job_id)
+        if not job._cancel.is_set():
+            job._cancel.set()
+            self.cancelled += 1
+        fut = job.future
+        if fut is not None:
+            fut.cancel()  # 아직 시작 전이면 즉시 취소 (실행 중이면 진행률 보고에서 멈춤)
+        return job
+
+    def cancel_all(self) -> int:
+        with self._lock:
+            active: List[str] = list(self._active)
+        for job_id in active:
+            self.cancel(job_id)
+        return len(active)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            states: Dict[str, int] = {"queued": 0, "running": 0}
+            for job in self._active.values():
+                states[job.status] = states.get(job.status, 0) + 1
+        return {
+            **states,
+            "submitted": self.submitted,
+            "cancel_requests": self.cancelled,
+            "finished": self._finished.stats(),
+            "executor": self.executor.stats(),
+        }
+
+
+job_executor = DocumentExecutor(config.JOB_WORKERS, config.JOB_QUEUE, name="job-worker")
+job_store = JobStore(job_executor)
@@ -1,8 +1,27 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .routes import text, redaction
+from fastapi.responses import JSONResponse, PlainTextResponse
+from .executor import ExecutorBusy, doc_executor
+from .pdf_redaction import ScanBudgetExceeded, detect_cache, pattern_cache_info
+from .sessions import session_store
+from .ocr import ocr_cache
+from .page_ranges import PageRangeError
+from .regex_sandbox import RegexTimeout
+from .jobs import job_store
+from .uploads import UploadTooLarge
+from . import metrics, regex_sandbox
+from .routes import text, redaction, documents
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 종료 시 대기/실행 중인 비동기 작업을 멈춘다 (실행 중이면 다음 페이지 경계에서)
+    job_store.cancel_all()
+    regex_sandbox.shutdown()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS 허용
 app.add_middleware(
@@ -12,12 +31,68 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.MetricsMiddleware)
 
 # 전역 헬스체크 (데모라서 main에 둠)
 @app.get("/health")
 async def health():
     return {"ok": True}
 
+# 문서 처리 풀 상태 (대기열 길이/대기 시간 등)
+@app.get("/stats/executor")
+async def executor_stats():
+    return doc_executor.stats()
+
+# 비동기 작업 상태별 개수 / 작업 풀
+@app.get("/stats/jobs")
+async def job_stats():
+    return job_store.stats()
+
+# 탐지 결과 캐시 적중/미스
+@app.get("/stats/cache")
+async def cache_stats():
+    return {
+        "detect": detect_cache.stats(),
+        "sessions": session_store.stats(),
+        "patterns": pattern_cache_info(),
+        "ocr": ocr_cache.stats(),
+    }
+
+# 단계별 시간/카운터 (Prometheus 텍스트 형식, 매치 값은 포함하지 않음)
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# 문서 처리 풀 포화 → 429
+@app.exception_handler(ExecutorBusy)
+async def executor_busy_handler(request: Request, exc: ExecutorBusy):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+# 탐지 시간 한도 초과 → 422
+@app.exception_handler(ScanBudgetExceeded)
+async def scan_budget_handler(request: Request, exc: ScanBudgetExceeded):
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+# 사용자 패턴이 샌드박스 제한 시간을 넘음 → 422
+@app.exception_handler(RegexTimeout)
+async def regex_timeout_handler(request: Request, exc: RegexTimeout):
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+# 페이지 범위 형식 오류 / 문서 페이지 수 초과 → 400
+@app.exception_handler(PageRangeError)
+async def page_range_handler(request: Request, exc: PageRangeError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+# 업로드 크기 한도 초과 → 413
+@app.exception_handler(UploadTooLarge)
+async def upload_too_large_handler(request: Request, exc: UploadTooLarge):
+    return JSONResponse(status_code=413, content={"detail": str(exc)})
+
 # 라우터 등록
 app.include_router(text.router)
 app.include_router(redaction.router)
+app.include_router(documents.router)
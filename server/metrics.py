@@ -0,0 +1,238 @@
+# metrics.py
+"""
+Prometheus 텍스트 형식(/metrics) 카운터/게이지/히스토그램.
+
+외부 의존성 없이 프로세스 내에서 집계한다. 값 갱신은 락 한 번 + 버킷 bisect라
+페이지/패턴 단위로 호출해도 운영에서 켜 둘 수 있는 비용이다.
+
+- 라벨 값에는 단계/규칙/경로 템플릿 같은 고정된 이름만 쓴다. 매치된 값(개인정보)은 절대 넣지 않는다.
+  사용자 패턴 이름은 임의 문자열이라 pattern_label()로 "custom"에 묶는다.
+- 탐지 샤드는 워커 프로세스에서 돌므로, 워커는 drain()으로 모은 값을 결과와 함께 돌려주고
+  부모가 merge()로 합친다.
+- METRICS_ENABLED=0이면 갱신이 모두 무시되고 /metrics는 비어 있다.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from . import config
+from .redac_rules import RULES
+
+Labels = Tuple[str, ...]
+
+# 초 단위 기본 버킷 (페이지 단위 단계 ~ 요청 전체)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def pattern_label(name: str) -> str:
+    """패턴 이름 → 라벨 값. 내장 규칙 이름만 그대로, 사용자 패턴은 "custom" (카디널리티/유출 방지)."""
+    return name if name in RULES else "custom"
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Sequence[str]) -> Labels:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {self.labelnames} 값이 필요합니다. (받은 값 {len(labels)}개)")
+        return tuple(str(v) for v in labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        if not config.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        out = super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        out.extend(f"{self.name}{_fmt_labels(self.labelnames, k)} {_fmt_value(v)}" for k, v in items)
+        return out
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    @contextmanager
+    def track(self, *labels: str) -> Iterator[None]:
+        self.inc(*labels)
+        try:
+            yield
+        finally:
+            self.dec(*labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not config.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            st = self._values.get(key)
+            if st is None:
+                st = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            st[0][i] += 1
+            st[1] += value
+            st[2] += 1
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, *labels)
+
+    def render(self) -> List[str]:
+        out = super().render()
+        with self._lock:
+            items = sorted((k, (list(st[0]), st[1], st[2])) for k, st in self._values.items())
+        for key, (counts, total, n) in items:
+            acc = 0
+            for le, c in zip((*self.buckets, float("inf")), counts):
+                acc += c
+                le_label = 'le="+Inf"' if le == float("inf") else f'le="{le!r}"'
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le_label)} {acc}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labelnames, key)} {_fmt_value(total)}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labelnames, key)} {n}")
+        return out
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> str:
+    """/metrics 응답 본문 (Prometheus 텍스트 형식 0.0.4)."""
+    lines: List[str] = []
+    for m in REGISTRY:
+        lines.extend(m.render())
+    return "\n".join(lines) + "\n"
+
+
+def drain() -> Dict[str, Dict[Labels, object]]:
+    """이 프로세스에서 모은 값을 꺼내고 비운다 (탐지 워커 프로세스 전용, merge()로 부모에 합침)."""
+    out: Dict[str, Dict[Labels, object]] = {}
+    for m in REGISTRY:
+        with m._lock:
+            if m._values:
+                out[m.name] = m._values
+                m._values = {}
+    return out
+
+
+def merge(state: Dict[str, Dict[Labels, object]]) -> None:
+    """drain() 결과를 이 프로세스 값에 더한다."""
+    if not state:
+        return
+    by_name = {m.name: m for m in REGISTRY}
+    for name, values in state.items():
+        m = by_name.get(name)
+        if m is None:
+            continue
+        with m._lock:
+            for key, v in values.items():
+                if isinstance(m, Histogram):
+                    st = m._values.get(key)
+                    if st is None:
+                        m._values[key] = [list(v[0]), v[1], v[2]]
+                    else:
+                        st[0] = [a + b for a, b in zip(st[0], v[0])]
+                        st[1] += v[1]
+                        st[2] += v[2]
+                else:
+                    m._values[key] = m._values.get(key, 0.0) + v
+
+
+# --------------------------
+# 서비스 지표
+# --------------------------
+# stage: upload(업로드 수신) | open(fitz.open) | words(페이지 단어 추출) | scan(페이지 결합 정규식 1회)
+#        | apply(페이지 apply_redactions) | save(문서 저장)
+STAGE_SECONDS = Histogram("redaction_stage_seconds", "처리 단계별 소요 시간(초)", ("stage",))
+# 패턴별 후보 위치 찾기(매치 구간 → 단어 박스, card는 토큰 정규식 포함), 페이지당 1회
+PATTERN_SECONDS = Histogram("redaction_pattern_locate_seconds", "패턴별 페이지당 후보 위치 계산 시간(초)", ("pattern",))
+VALIDATE_SECONDS = Histogram("redaction_validate_seconds", "규칙별 페이지당 validator 시간(초)", ("pattern",))
+VALIDATE_CANDIDATES = Counter("redaction_validate_candidates_total", "validator에 넘긴 후보 수", ("pattern",))
+VALIDATE_REJECTED = Counter("redaction_validate_rejected_total", "validator가 거부한 후보 수", ("pattern",))
+PAGES = Counter("redaction_pages_total", "처리한 페이지 수", ("op",))
+BOXES = Counter("redaction_boxes_total", "탐지해 내보낸 박스 수", ("pattern",))
+HTTP_IN_FLIGHT = Gauge("redaction_http_in_flight_requests", "처리 중인 HTTP 요청 수")
+HTTP_SECONDS = Histogram("redaction_http_request_seconds", "HTTP 요청 처리 시간(초)", ("method", "path"))
+HTTP_REQUESTS = Counter("redaction_http_requests_total", "HTTP 응답 수", ("method", "path", "status"))
+
+
+class MetricsMiddleware:
+    """
+    HTTP 요청 수/시간/처리 중 요청 수 (순수 ASGI, 스트리밍 응답은 본문 전송 끝까지 잰다).
+    경로 라벨은 라우트 템플릿(/redactions/jobs/{job_id})이고, 라우트가 없으면 "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        t0 = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            path = getattr(scope.get("route"), "path", "unmatched")
+            method = scope.get("method", "")
+            HTTP_SECONDS.observe(time.perf_counter() - t0, method, path)
+            HTTP_REQUESTS.inc(method, path, str(status))
@@ -1,4 +1,7 @@
 import re, unicodedata
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Tuple
 
 _ZERO_WIDTH = re.compile(r"[\u200B\u200C\u200D\u2060\ufeff]")
 _NBSP       = re.compile(r"[\u00A0\u2007\u202F]")
@@ -12,13 +15,200 @@ def strip_invisible(s: str) -> str:
     s = _NBSP.sub(" ", s)
     return s
 
+# ---------- 정규화 ----------
+# 입력이 이미 NFKC면 정규화를 건너뛰고, 나머지는 C 수준 치환(replace/정규식 sub) 몇 번으로 끝낸다.
+# (str.translate는 비ASCII 문자마다 dict 조회를 해서 한글 본문에서 오히려 느리다)
+_SPACE_LIKE = re.compile(r"[\t\f\v\u00A0\u2007\u202F]")   # 1:1 → 공백
+_Z = "\u200B\u200C\u200D\u2060\ufeff"
+# 위치 변환표용: 길이가 바뀌는 처리(개행 통일, 폭 없는 문자 제거, 공백 축약, 줄끝 공백 제거)를
+# 결합 정규식 한 번으로 훑으며 편집 위치를 모은다.
+_REWRITE = re.compile(
+    rf"(?=[\r{_Z}]| [ {_Z}\r\n]| \Z)(?:"      # 관문: 홑공백 대부분을 갈래 시도 없이 건너뛴다
+    rf"(?P<nl>\r\n?|[ {_Z}]+\r\n?)"           # (공백) + \r\n / \r → \n
+    rf"|(?P<eol>[ {_Z}]+(?=\n|\Z))"             # 줄끝 공백/폭 없는 문자 → 제거
+    rf"|(?P<zw> *[{_Z}][ {_Z}]*)"                # 폭 없는 문자가 섞인 공백 → 공백 하나(공백이 없으면 제거)
+    rf"|(?P<sp> {{2,}}))"                       # 연속 공백 → 공백 하나
+)
+
+_ASCII = re.compile(r"[\x00-\x7f]")
+
+def _starts_cluster(c: str) -> bool:
+    """결합 문자도, 앞 글자와 합쳐지는 한글 중성/종성 자모도 아니면 새 글자 묶음의 시작."""
+    o = ord(c)
+    if 0x1160 <= o <= 0x11FF or 0xD7B0 <= o <= 0xD7FF:
+        return False
+    return unicodedata.combining(c) == 0
+
+def _nfkc_units(s: str, lo: int, hi: int, units: List[Tuple[int, int, str]]) -> None:
+    """
+    s[lo:hi]에서 NFKC로 길이가 바뀌는 구간을 (orig_start, orig_end, normalized) 로 모은다.
+    이미 정규형인 덩어리는 C 수준 is_normalized로 건너뛰고, 아닌 덩어리만 반으로 나눠 내려간다.
+    ASCII 문자 앞에서 자르면 안전(ASCII는 앞 문자와 결합/재배열되지 않음).
+    """
+    chunk = s[lo:hi]
+    if unicodedata.is_normalized("NFKC", chunk):
+        return
+    if hi - lo > 64:
+        m = _ASCII.search(s, (lo + hi) // 2, hi)
+        if m is None or m.start() == lo:
+            m = _ASCII.search(s, lo + 1, hi)
+        if m is not None:
+            _nfkc_units(s, lo, m.start(), units)
+            _nfkc_units(s, m.start(), hi, units)
+            return
+    # 작은 덩어리: 결합 문자열(기저 + 결합 문자) 단위로 정규화. 합쳐서 전체 결과와 다르면 덩어리 통째로
+    whole = unicodedata.normalize("NFKC", chunk)
+    pieces = []
+    start = 0
+    for i in range(1, len(chunk) + 1):
+        if i == len(chunk) or _starts_cluster(chunk[i]):
+            pieces.append((start, i, unicodedata.normalize("NFKC", chunk[start:i])))
+            start = i
+    if "".join(p[2] for p in pieces) != whole:
+        units.append((lo, hi, whole))
+        return
+    for a, b, out in pieces:
+        if out != chunk[a:b]:
+            units.append((lo + a, lo + b, out))
+
+class OffsetMap:
+    """
+    정규화 텍스트 위치 → 원문 위치 변환표.
+    길이가 바뀐 지점에만 중단점(norm, orig)을 두고 그 사이는 선형으로 계산한다.
+    길이가 바뀐 구간 안쪽은 시작 위치는 구간 시작, 끝 위치는 구간 끝으로 대응시킨다.
+    inner가 있으면 (이 표의 원문 = inner의 정규화 텍스트) 순서로 이어서 변환한다.
+    """
+    __slots__ = ("_nb", "_ob", "inner")
+
+    def __init__(self, nb: array, ob: array, inner: Optional["OffsetMap"] = None):
+        self._nb = nb
+        self._ob = ob
+        self.inner = inner
+
+    @classmethod
+    def from_units(cls, units, norm_len: int, orig_len: int, inner: Optional["OffsetMap"] = None) -> "OffsetMap":
+        """units: 원문 순서의 (orig_start, orig_end, 바뀐 길이) — 길이가 같은 구간은 무시."""
+        nb, ob = array("q", [0]), array("q", [0])
+        shift = 0  # norm - orig
+        for o_s, o_e, n_len in units:
+            if n_len == o_e - o_s:
+                continue
+            if ob[-1] != o_s:
+                nb.append(o_s + shift); ob.append(o_s)
+            shift += n_len - (o_e - o_s)
+            nb.append(o_e + shift); ob.append(o_e)
+        if ob[-1] != orig_len:
+            nb.append(norm_len); ob.append(orig_len)
+        return cls(nb, ob, inner)
+
+    @property
+    def breakpoints(self) -> int:
+        return len(self._nb)
+
+    def _linear(self, k: int) -> bool:
+        return self._nb[k + 1] - self._nb[k] == self._ob[k + 1] - self._ob[k]
+
+    def start(self, n: int) -> int:
+        """정규화 텍스트의 시작 위치 n → 원문 시작 위치."""
+        nb, ob = self._nb, self._ob
+        if n >= nb[-1]:
+            o = ob[-1]
+        else:
+            k = bisect_right(nb, n) - 1
+            o = ob[k] + (n - nb[k]) if self._linear(k) else ob[k]
+        return self.inner.start(o) if self.inner else o
+
+    def end(self, n: int) -> int:
+        """정규화 텍스트의 끝 위치 n(배타) → 원문 끝 위치."""
+        if n <= 0:
+            return self.start(0)
+        nb, ob = self._nb, self._ob
+        k = min(bisect_right(nb, n - 1), len(nb) - 1) - 1
+        o = ob[k] + (n - nb[k]) if self._linear(k) else ob[k + 1]
+        return self.inner.end(o) if self.inner else o
+
+def _nfkc(s: str, with_map: bool) -> Tuple[str, Optional[OffsetMap]]:
+    if unicodedata.is_normalized("NFKC", s):
+        return s, None
+    if not with_map:
+        return unicodedata.normalize("NFKC", s), None
+    units: List[Tuple[int, int, str]] = []
+    _nfkc_units(s, 0, len(s), units)
+    parts, prev = [], 0
+    for a, b, out in units:
+        parts.append(s[prev:a]); parts.append(out)
+        prev = b
+    parts.append(s[prev:])
+    t = "".join(parts)
+    return t, OffsetMap.from_units([(a, b, len(out)) for a, b, out in units], len(t), len(s))
+
+def normalize_with_map(s: str | None) -> Tuple[str, OffsetMap]:
+    """normalize_text와 같은 결과 + 정규화 위치 → 원문 위치 변환표."""
+    if not s:
+        return "", OffsetMap(array("q", [0]), array("q", [0]))
+    t, inner = _nfkc(s, True)
+    t = _DASHES.sub("-", _SPACE_LIKE.sub(" ", t))
+    parts, units, prev = [], [], 0
+    append, add_unit = parts.append, units.append
+    for m in _REWRITE.finditer(t):
+        a, b = m.span()
+        kind = m.lastgroup
+        if kind == "nl":
+            rep = "\n"
+        elif kind == "eol":
+            rep = ""
+        elif kind == "sp" or " " in m.group():
+            rep = " "
+        else:
+            rep = ""
+        append(t[prev:a]); append(rep)
+        add_unit((a, b, len(rep)))
+        prev = b
+    append(t[prev:])
+    out = "".join(parts)
+    return out, OffsetMap.from_units(units, len(out), len(t), inner)
+
+_LINE_END = re.compile(r"\r\n?|\n")
+
+class LineOffsetMap:
+    """
+    normalize_text 결과 위치 → 원문 위치를 필요한 줄만 계산하는 변환표 (OffsetMap과 같은 start/end).
+    정규화는 줄(개행 포함)을 넘지 않으므로, 물어본 위치가 든 원문 줄만 normalize_with_map으로 변환한다.
+    매치가 없거나 일부 줄에만 있으면 전체 변환표를 만드는 비용을 치르지 않는다.
+    """
+    __slots__ = ("_orig", "_os", "_ns", "_lines")
+
+    def __init__(self, orig: str, norm: str):
+        self._orig = orig
+        self._os = [0] + [m.end() for m in _LINE_END.finditer(orig)]
+        self._ns = [0] + [m.end() for m in re.finditer("\n", norm)]
+        self._lines: dict = {}
+        if len(self._os) != len(self._ns):   # 줄 수가 어긋나면(없어야 함) 통째로 한 줄 취급
+            self._os, self._ns = [0], [0]
+
+    def _line(self, k: int) -> OffsetMap:
+        m = self._lines.get(k)
+        if m is None:
+            hi = self._os[k + 1] if k + 1 < len(self._os) else len(self._orig)
+            m = self._lines[k] = normalize_with_map(self._orig[self._os[k]:hi])[1]
+        return m
+
+    def start(self, n: int) -> int:
+        k = bisect_right(self._ns, n) - 1
+        return self._os[k] + self._line(k).start(n - self._ns[k])
+
+    def end(self, n: int) -> int:
+        if n <= 0:
+            return self.start(0)
+        k = bisect_right(self._ns, n - 1) - 1
+        return self._os[k] + self._line(k).end(n - self._ns[k])
+
 def normalize_text(s: str | None) -> str:
     if not s: return ""
-    s = unicodedata.normalize("NFKC", s)
-    s = re.sub(r"\r\n?", "\n", s)
-    s = strip_invisible(s)
-    s = _DASHES.sub("-", s)
-    s = s.replace("\t", " ")
-    s = re.sub(r"[ \f\v]+", " ", s)
-    s = "\n".join(re.sub(r"[ \t]+$", "", line) for line in s.split("\n"))
-    return s
+    s, _ = _nfkc(s, False)
+    if "\r" in s:
+        s = s.replace("\r\n", "\n").replace("\r", "\n")
+    s = _ZERO_WIDTH.sub("", _DASHES.sub("-", _SPACE_LIKE.sub(" ", s)))
+    while "  " in s:
+        s = s.replace("  ", " ")
+    return s.replace(" \n", "\n").rstrip(" ")
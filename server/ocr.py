@@ -0,0 +1,191 @@
+# ocr.py
+"""
+텍스트 레이어가 없는(스캔) 페이지용 OCR.
+
+탐지에서 ocr=true일 때, 단어가 거의 없고 이미지가 있는 페이지만 OCR_DPI로 렌더링해
+tesseract(pytesseract)로 단어와 bbox를 얻는다. 단어는 get_text("words")와 같은 튜플 형식
+(x0, y0, x1, y1, text, block, line, word)의 PDF 좌표로 돌려주므로 이후 패턴/검증 과정은 같다.
+
+- 렌더링은 호출 프로세스에서, OCR은 spawn 워커 프로세스(OCR_WORKERS)에서 병렬로 한다.
+- 결과는 렌더링한 페이지 이미지의 해시로 캐시한다 (OCR이 가장 비싼 단계).
+  캐시에는 픽셀 좌표를 두고, 페이지 크기/회전에 맞는 PDF 좌표 변환은 꺼낼 때 한다.
+- pytesseract/Pillow 또는 tesseract 실행 파일이 없으면 ocr_available()이 False다.
+"""
+import hashlib
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import fitz
+
+from . import config
+from .cache import TTLCache
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    pytesseract = None  # type: ignore
+    Image = None  # type: ignore
+
+log = logging.getLogger("redaction.ocr")
+
+# (x0, y0, x1, y1, text, block, line, word) — get_text("words")와 같은 형식
+Word = Tuple[float, float, float, float, str, int, int, int]
+
+
+class OcrUnavailable(RuntimeError):
+    """OCR을 요청했지만 pytesseract/tesseract를 쓸 수 없음."""
+
+    def __init__(self):
+        super().__init__("OCR 엔진(pytesseract/tesseract)을 사용할 수 없습니다.")
+
+
+@lru_cache(maxsize=1)
+def ocr_available() -> bool:
+    if pytesseract is None or Image is None:
+        return False
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        log.warning("tesseract를 찾을 수 없습니다: %s", e)
+        return False
+    return True
+
+
+def needs_ocr(page: fitz.Page, tokens: Sequence[str]) -> bool:
+    """쓸 만한 텍스트 레이어가 없고(공백 제외 OCR_MIN_TEXT_CHARS 미만) 이미지가 있는 페이지인지."""
+    if sum(len(t.strip()) for t in tokens) >= config.OCR_MIN_TEXT_CHARS:
+        return False
+    return bool(page.get_images(full=False))
+
+
+# 페이지 이미지 해시 → 픽셀 좌표 단어 튜플
+ocr_cache = TTLCache(
+    config.OCR_CACHE_ENTRIES,
+    config.OCR_CACHE_TTL_SECONDS,
+    max_weight=config.OCR_CACHE_MAX_WORDS,
+    weigher=len,
+)
+
+
+def _ocr_image(png: bytes, lang: str, min_conf: int) -> List[Word]:
+    """워커 프로세스 진입점: PNG 한 장 → 픽셀 좌표 단어 목록 (읽는 순서)."""
+    data = pytesseract.image_to_data(
+        Image.open(io.BytesIO(png)), lang=lang, output_type=pytesseract.Output.DICT,
+    )
+    words: List[Word] = []
+    lines: Dict[Tuple[int, int, int], int] = {}
+    for i, text in enumerate(data["text"]):
+        text = (text or "").strip()
+        if not text or float(data["conf"][i]) < min_conf:
+            continue
+        block = int(data["block_num"][i])
+        line = lines.setdefault((block, int(data["par_num"][i]), int(data["line_num"][i])), len(lines))
+        x, y, w, h = (int(data[k][i]) for k in ("left", "top", "width", "height"))
+        words.append((float(x), float(y), float(x + w), float(y + h), text, block, line, int(data["word_num"][i])))
+    return words
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """OCR용 프로세스 풀 (지연 생성, 워커 수가 바뀌면 재생성)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    """깨진 풀을 버린다. 그 사이 다른 요청이 이미 새 풀을 만들었으면 그 풀은 건드리지 않는다."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not broken:
+            return
+        _pool, _pool_workers = None, 0
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _to_pdf(words: Sequence[Word], page: fitz.Page, zoom: float) -> List[Word]:
+    """렌더링 픽셀 좌표 → 페이지(회전 전) PDF 좌표."""
+    inv = ~(page.rotation_matrix * fitz.Matrix(zoom, zoom))
+    out: List[Word] = []
+    for x0, y0, x1, y1, text, block, line, wno in words:
+        r = fitz.Rect(x0, y0, x1, y1) * inv
+        out.append((r.x0, r.y0, r.x1, r.y1, text, block, line, wno))
+    return out
+
+
+def ocr_page_words(
+    doc: fitz.Document,
+    pnos: Sequence[int],
+    check: Optional[Callable[[int], None]] = None,
+    dpi: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[int, List[Word]]:
+    """
+    지정 페이지들을 렌더링해 OCR → {page: PDF 좌표 단어 목록}.
+    캐시에 없는 페이지만 워커로 보낸다. 렌더링한 PNG는 워커 수의 2배까지만 동시에 들고 있는다.
+    check(pno): 페이지 렌더링 전에 호출 (시간 한도 확인 등, 예외를 던지면 중단).
+    """
+    if not ocr_available():
+        raise OcrUnavailable()
+    dpi = dpi or config.OCR_DPI
+    workers = config.OCR_WORKERS if workers is None else workers
+    zoom = dpi / 72.0
+    lang, min_conf = config.OCR_LANG, config.OCR_MIN_CONFIDENCE
+    out: Dict[int, List[Word]] = {}
+    batch = max(1, workers) * 2
+    hits = 0
+
+    for i in range(0, len(pnos), batch):
+        pending = []
+        for pno in pnos[i:i + batch]:
+            if check:
+                check(pno)
+            page = doc.load_page(pno)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+            key = (hashlib.sha256(pix.samples).hexdigest(), pix.width, pix.height, lang, min_conf)
+            cached = ocr_cache.get(key)
+            if cached is not None:
+                hits += 1
+                out[pno] = _to_pdf(cached, page, zoom)
+                continue
+            pending.append((pno, key, pix.tobytes("png")))
+
+        if workers >= 2 and len(pending) > 1:
+            pool = _get_pool(workers)
+            futures = [pool.submit(_ocr_image, png, lang, min_conf) for _, _, png in pending]
+            try:
+                results = [f.result() for f in futures]
+            except BrokenProcessPool as e:
+                # 워커가 죽으면 그 풀만 버리고 이번 묶음은 프로세스 안에서 처리
+                log.warning("OCR pool broken, falling back to in-process OCR: %s", e)
+                _reset_pool(pool)
+                results = [_ocr_image(png, lang, min_conf) for _, _, png in pending]
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+        else:
+            results = [_ocr_image(png, lang, min_conf) for _, _, png in pending]
+
+        for (pno, key, _), words in zip(pending, results):
+            ocr_cache.put(key, tuple(words))
+            out[pno] = _to_pdf(words, doc.load_page(pno), zoom)
+
+    log.debug("OCR pages=%d cache_hits=%d dpi=%d lang=%s", len(pnos), hits, dpi, lang)
+    return out
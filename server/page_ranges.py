@@ -0,0 +1,59 @@
+# page_ranges.py
+"""
+페이지 범위 파라미터: "1-10,37", "5-" (5쪽부터 끝까지) 형식, 1부터 센다.
+
+parse_pages는 요청 시점에 형식만 검사해 해시 가능한 범위 튜플로 바꾸고 (캐시 키에 씀),
+resolve_pages는 문서를 연 뒤 페이지 수에 맞춰 0부터 세는 정렬된 페이지 번호로 푼다.
+"""
+from typing import List, Optional, Tuple
+
+# (시작, 끝) 1부터, 끝 포함. 끝이 None이면 마지막 페이지까지
+PageRanges = Tuple[Tuple[int, Optional[int]], ...]
+
+
+class PageRangeError(ValueError):
+    """페이지 범위 형식 오류 또는 문서 페이지 수를 벗어남."""
+
+
+def parse_pages(spec: Optional[str]) -> Optional[PageRanges]:
+    """ "1-10,37" → ((1, 10), (37, 37)). 비어 있으면 None (전체 페이지)."""
+    if spec is None or not spec.strip():
+        return None
+    out = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        try:
+            start = int(lo)
+            end = (int(hi) if hi.strip() else None) if sep else start
+        except ValueError:
+            raise PageRangeError(f"페이지 범위 형식이 잘못되었습니다: '{part}' (예: 1-10,37)")
+        if start < 1 or (end is not None and end < start):
+            raise PageRangeError(f"페이지 범위가 잘못되었습니다: '{part}' (1부터, 시작 <= 끝)")
+        out.append((start, end))
+    if not out:
+        return None
+    return tuple(out)
+
+
+def resolve_pages(ranges: Optional[PageRanges], n_pages: int) -> List[int]:
+    """범위 → 0부터 세는 정렬·중복 제거된 페이지 번호. None이면 전체."""
+    if ranges is None:
+        return list(range(n_pages))
+    pnos = set()
+    for start, end in ranges:
+        if start > n_pages:
+            raise PageRangeError(f"페이지 {start}가 문서 페이지 수({n_pages})를 벗어납니다.")
+        stop = n_pages if end is None else min(end, n_pages)
+        pnos.update(range(start - 1, stop))
+    return sorted(pnos)
+
+
+def page_in(ranges: Optional[PageRanges], pno: int) -> bool:
+    """0부터 센 페이지 pno가 범위에 드는지 (None이면 항상 True)."""
+    if ranges is None:
+        return True
+    n = pno + 1
+    return any(start <= n and (end is None or n <= end) for start, end in ranges)
@@ -1,11 +1,29 @@
 # pdf_redaction.py
 import re
 import io
+import os
+import json
+import hashlib
 import fitz
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+import time
 import logging
-from typing import List, Tuple, Optional
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Callable, Iterator, List, Tuple, Optional, Union
+from . import config
+from .cache import TTLCache
 from .schemas import Box, PatternItem
-from .redac_rules import RULES  # validator 사용
+from .redac_rules import PRESET_PATTERNS, RULES  # validator 사용
+from .scanner import get_scanner
+from .regex_sandbox import SandboxedPattern, SandboxedScanner
+from .batch_validators import validate_many
+from .ocr import needs_ocr, ocr_page_words
+from .page_ranges import PageRanges, resolve_pages
+from . import metrics, tracing
 
 # ==========================
 # 로깅 설정
@@ -23,18 +41,75 @@ if not logger.handlers:
     logger.addHandler(ch)
 
 
+# --------------------------
+# PDF 입력 (바이트 또는 경로)
+# --------------------------
+# 문서 세션은 메모리 바이트, 업로드는 디스크 spool 경로(uploads.spool_to_path).
+# 경로면 PyMuPDF가 파일에서 필요한 부분만 읽으므로 문서 전체 사본이 메모리에 생기지 않는다.
+PdfInput = Union[bytes, str]
+
+
+def open_pdf(src: PdfInput) -> fitz.Document:
+    with metrics.STAGE_SECONDS.time("open"), tracing.span("open"):
+        if isinstance(src, (bytes, bytearray, memoryview)):
+            return fitz.open(stream=src, filetype="pdf")
+        return fitz.open(src, filetype="pdf")
+
+
+def pdf_page_count(src: PdfInput) -> int:
+    with open_pdf(src) as doc:
+        return len(doc)
+
+
+def pdf_size(src: PdfInput) -> int:
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return len(src)
+    return os.path.getsize(src)
+
+
 # --------------------------
 # 내부 유틸
 # --------------------------
-def _compile_pattern(p: PatternItem) -> re.Pattern:
-    flags = 0 if p.case_sensitive else re.IGNORECASE
-    pattern = p.regex
-    if p.whole_word:
+def _build_source(regex: str, case_sensitive: bool, whole_word: bool) -> Tuple[str, int]:
+    flags = 0 if case_sensitive else re.IGNORECASE
+    pattern = regex
+    if whole_word:
         pattern = rf"\b(?:{pattern})\b"
-    logger.debug("Compiling pattern: %s -> %s", p.name, pattern)
+    return pattern, flags
+
+
+def _pattern_source(p: PatternItem) -> Tuple[str, int]:
+    return _build_source(p.regex, p.case_sensitive, p.whole_word)
+
+
+@lru_cache(maxsize=config.PATTERN_CACHE_SIZE)
+def _compile_cached(regex: str, case_sensitive: bool, whole_word: bool) -> re.Pattern:
+    pattern, flags = _build_source(regex, case_sensitive, whole_word)
+    logger.debug("Compiling pattern: %s", pattern)
     return re.compile(pattern, flags)
 
 
+def _compile_pattern(p: PatternItem) -> re.Pattern:
+    """(regex, case_sensitive, whole_word) 기준으로 요청 간 캐시된 컴파일 결과."""
+    return _compile_cached(p.regex, bool(p.case_sensitive), bool(p.whole_word))
+
+
+def pattern_cache_info() -> dict:
+    return _compile_cached.cache_info()._asdict()
+
+
+class ScanBudgetExceeded(Exception):
+    """요청 1건의 탐지 시간 한도 초과."""
+
+    def __init__(self, budget: float, page: int):
+        super().__init__(f"탐지 시간 한도({budget:g}s)를 초과했습니다. (page={page})")
+        self.budget = budget
+        self.page = page
+
+    def __reduce__(self):  # 워커 프로세스 → 부모로 전달
+        return (type(self), (self.budget, self.page))
+
+
 def _word_spans_to_rect(words: List[tuple], spans: List[Tuple[int, int]]) -> List[fitz.Rect]:
     rects: List[fitz.Rect] = []
     for s, e in spans:
@@ -82,19 +157,80 @@ def _search_exact_bbox(page: fitz.Page, text: str, hint_rect: Optional[fitz.Rect
     return best or hits[0]
 
 
-def _find_pattern_rects_on_page(page: fitz.Page, comp: re.Pattern, pattern_name: str):
+class PageLayout:
+    """
+    페이지 단어 레이아웃.
+    get_text("words") 결과와 토큰/조인 문자열을 한 번만 만들어 모든 패턴이 공유한다.
+    탐지 루프에서 페이지마다 생성하고, 페이지 처리가 끝나면 버린다.
+    조인 문자열의 토큰별 시작/끝 오프셋을 미리 계산해 두어
+    매치 → 토큰 범위 변환을 bisect로 O(log n)에 처리한다.
+    """
+    __slots__ = ("words", "tokens", "_joined", "_starts", "_ends")
+
+    def __init__(self, words: List[tuple]):
+        self.words = words or []
+        self.tokens = [w[4] for w in self.words]
+        self._joined: Optional[str] = None
+        self._starts: Optional[List[int]] = None
+        self._ends: Optional[List[int]] = None
+
+    @classmethod
+    def from_page(cls, page: fitz.Page) -> "PageLayout":
+        with metrics.STAGE_SECONDS.time("words"), tracing.span("words"):
+            return cls(page.get_text("words"))
+
+    @property
+    def joined(self) -> str:
+        if self._joined is None:
+            self._joined = " ".join(self.tokens)
+        return self._joined
+
+    def _build_offsets(self) -> None:
+        starts: List[int] = []
+        ends: List[int] = []
+        acc = 0
+        for t in self.tokens:
+            starts.append(acc)
+            acc += len(t)
+            ends.append(acc)
+            acc += 1  # 공백
+        self._starts, self._ends = starts, ends
+
+    def word_range(self, start_char: int, end_char: int) -> Optional[Tuple[int, int]]:
+        """
+        joined 기준 문자 구간 [start_char, end_char)를 덮는 토큰 범위 (start_idx, end_idx) 반환.
+        덮는 토큰이 없으면 None.
+        """
+        if self._starts is None:
+            self._build_offsets()
+        start_idx = bisect_right(self._ends, start_char)   # token_end > start_char 인 첫 토큰
+        end_idx = bisect_left(self._starts, end_char)      # token_start < end_char 인 마지막 토큰 + 1
+        if start_idx >= end_idx:
+            return None
+        return start_idx, end_idx
+
+
+def _find_pattern_rects_on_page(
+    page: fitz.Page,
+    comp: re.Pattern,
+    pattern_name: str,
+    layout: Optional[PageLayout] = None,
+):
     """
     페이지에서 패턴을 찾아 (rect, matched_text, pattern_name) 리스트를 반환.
+    layout이 주어지면 재사용하고, 없으면 페이지에서 새로 만든다.
     특별 처리:
         - card: 숫자/하이픈/공백 토큰 이어붙여 숫자만 추출 후 fullmatch
         - email: page.search_for()로 정확한 서브스트링 bbox 사용 (라벨 보호)
     """
     results = []
-    words = page.get_text("words")
+    if layout is None:
+        layout = PageLayout.from_page(page)
+    words = layout.words
     if not words:
         return []
 
-    tokens = [w[4] for w in words]
+    tokens = layout.tokens
 
     # -----------------------------
     # 카드번호 처리
@@ -137,30 +273,34 @@ def _find_pattern_rects_on_page(page: fitz.Page, comp: re.Pattern, pattern_name:
         return results
 
     # -----------------------------
-    # 일반 규칙 처리 (이메일은 search_for로 정확 bbox)
+    # 일반 규칙 처리
     # -----------------------------
-    joined = " ".join(tokens)
-    acc = 0
-    for m in comp.finditer(joined):
-        matched = m.group(0)
-        logger.debug("[MATCH] page=%d pattern=%s matched='%s' span=%s",
-                    page.number, pattern_name, matched, (m.start(), m.end()))
-        start_char, end_char = m.start(), m.end()
-        start_idx = end_idx = None
+    spans = [m.span() for m in comp.finditer(layout.joined)]
+    return _rects_from_spans(page, layout, pattern_name, spans)
 
-        # 매치를 덮는 token 범위 찾기
-        acc = 0
-        for i, t in enumerate(tokens):
-            if i > 0:
-                acc += 1  # 공백
-            token_start, token_end = acc, acc + len(t)
-            if token_end > start_char and token_start < end_char:
-                if start_idx is None:
-                    start_idx = i
-                end_idx = i + 1
-            acc += len(t)
-        if start_idx is None or end_idx is None:
+
+def _rects_from_spans(
+    page: fitz.Page,
+    layout: PageLayout,
+    pattern_name: str,
+    spans: List[Tuple[int, int]],
+):
+    """
+    layout.joined 기준 매치 구간들을 (rect, matched_text, pattern_name) 리스트로 변환.
+    이메일은 search_for로 정확 bbox를 사용한다.
+    """
+    results = []
+    words = layout.words
+    joined = layout.joined
+    for m_start, m_end in spans:
+        matched = joined[m_start:m_end]
+        logger.debug("[MATCH] page=%d pattern=%s matched='%s' span=%s",
+                    page.number, pattern_name, matched, (m_start, m_end))
+        # 매치를 덮는 token 범위 찾기 (오프셋 인덱스 + bisect)
+        span = layout.word_range(m_start, m_end)
+        if span is None:
             continue
+        start_idx, end_idx = span
 
         if pattern_name == "email":
             # 힌트: 해당 토큰(혹은 토큰 구간) bbox
@@ -186,23 +326,91 @@ def _find_pattern_rects_on_page(page: fitz.Page, comp: re.Pattern, pattern_name:
 
 
 # --------------------------
-# 공개 함수
+# 페이지 스캔 / 병렬 샤딩
 # --------------------------
-def detect_boxes_from_patterns(pdf_bytes: bytes, patterns: List[PatternItem]) -> List[Box]:
+# (page, x0, y0, x1, y1, matched_text, pattern_name) — 워커 간 전달용 압축 형식
+BoxTuple = Tuple[int, float, float, float, float, str, str]
+# 진행률 콜백: (처리한 수, 전체 수)
+Progress = Callable[[int, int], None]
+
+
+# 프로세스 내에서 그대로 실행해도 되는 정규식 (프리셋/내장 규칙)
+_TRUSTED_REGEX = frozenset(p["regex"] for p in PRESET_PATTERNS) | frozenset(r["regex"].pattern for r in RULES.values())
+
+
+class _PatternSet:
     """
-    패턴 탐지 → (validator가 있으면) 유효성 검증 후 Box 생성.
+    탐지 1회 동안 쓰는 컴파일된 패턴 + 결합 스캐너 + 시간 한도.
+    budget(초)이 0보다 크면 started(time.time(), 없으면 생성 시점)부터 재서 페이지/패턴 사이에서 확인한다.
+    워커 샤드는 부모의 started를 받아 요청 전체에서 남은 시간만 쓴다.
+    프리셋이 아닌 패턴이 있으면(sandboxed) 스캔과 card 검사를 regex_sandbox 워커에서 제한 시간을 두고 실행한다.
     """
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    boxes: List[Box] = []
 
-    compiled = [(_compile_pattern(p), p.name) for p in patterns]
+    def __init__(self, patterns: List[PatternItem], budget: Optional[float] = None, started: Optional[float] = None):
+        self.budget = config.DETECT_TIME_BUDGET_SECONDS if budget is None else budget
+        self.started = time.time() if started is None else started
+        elapsed = max(0.0, time.time() - self.started)
+        self.deadline = time.monotonic() + self.budget - elapsed if self.budget and self.budget > 0 else None
+        untrusted = {p.regex for p in patterns if p.regex not in _TRUSTED_REGEX}
+        self.sandboxed = bool(untrusted) and config.USER_REGEX_TIMEOUT_SECONDS > 0
+        self.compiled = [
+            (SandboxedPattern(_pattern_source(p), self.regex_timeout)
+             if self.sandboxed and p.name == "card" and p.regex in untrusted else _compile_pattern(p), p.name)
+            for p in patterns
+        ]
+        # card는 토큰 기반 처리라 별도, 나머지는 결합 스캐너로 페이지당 한 번에 스캔
+        rules = tuple((p.name, *_pattern_source(p)) for p in patterns if p.name != "card")
+        if self.sandboxed and any(p.regex in untrusted for p in patterns if p.name != "card"):
+            self.scanner = SandboxedScanner(rules, self.regex_timeout)
+        else:
+            self.scanner = get_scanner(rules)
+
+    def regex_timeout(self) -> float:
+        """샌드박스 호출 1회의 제한 시간: USER_REGEX_TIMEOUT_SECONDS와 남은 탐지 한도 중 짧은 쪽."""
+        timeout = float(config.USER_REGEX_TIMEOUT_SECONDS)
+        if self.deadline is not None:
+            timeout = min(timeout, max(0.05, self.deadline - time.monotonic()))
+        return timeout
 
-    for pno in range(len(doc)):
-        page = doc.load_page(pno)
-        logger.debug("Scanning page %d...", pno)
+    def check_budget(self, pno: int) -> None:
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise ScanBudgetExceeded(self.budget, pno)
 
-        for comp, pname in compiled:
-            rects = _find_pattern_rects_on_page(page, comp, pname)
+    def pause(self, seconds: float) -> None:
+        """스캔하지 않고 기다린 시간만큼 한도를 미룬다 (스트리밍에서 소비 쪽을 기다린 시간)."""
+        if self.deadline is not None and seconds > 0:
+            self.deadline += seconds
+
+
+def _scan_page(page: fitz.Page, pset: _PatternSet, layout: Optional[PageLayout] = None) -> List[BoxTuple]:
+    """
+    한 페이지 탐지 → validator 통과한 박스 튜플 목록 (패턴 순서 유지).
+    layout이 주어지면(문서 세션 등) 단어 추출을 생략한다.
+    """
+    pno = page.number
+    out: List[BoxTuple] = []
+    logger.debug("Scanning page %d...", pno)
+
+    # 페이지 단어는 한 번만 추출해 모든 패턴이 공유
+    pset.check_budget(pno)
+    if layout is None:
+        layout = PageLayout.from_page(page)
+    if not layout.words:
+        return out
+    with metrics.STAGE_SECONDS.time("scan"), tracing.span("scan"):
+        page_spans = iter(pset.scanner.scan(layout.joined))
+
+    for comp, pname in pset.compiled:
+        pset.check_budget(pno)
+        label = metrics.pattern_label(pname)
+        with tracing.span("pattern", pattern=label) as sp:
+            t0 = time.perf_counter()
+            if pname == "card":
+                rects = _find_pattern_rects_on_page(page, comp, pname, layout)
+            else:
+                rects = _rects_from_spans(page, layout, pname, next(page_spans))
+            t1 = time.perf_counter()
+            metrics.PATTERN_SECONDS.observe(t1 - t0, label)
 
             # validator 적용
             validator = None
@@ -210,58 +418,437 @@ def detect_boxes_from_patterns(pdf_bytes: bytes, patterns: List[PatternItem]) ->
             if rule:
                 validator = rule.get("validator")
 
-            for r, matched, _pname in rects:
-                is_ok = True
-                if callable(validator):
-                    try:
-                        is_ok = bool(validator(matched))
-                    except Exception as e:
-                        logger.exception("[VALIDATOR ERROR] pattern=%s value='%s' err=%s", pname, matched, e)
-                        is_ok = False
+            # 패턴의 페이지 내 후보를 한 번에 검증 (숫자 규칙은 배치/벡터화)
+            with tracing.span("validate"):
+                oks = validate_many(pname, validator, [matched for _, matched, _ in rects])
+            n_before = len(out)
 
+            for (r, matched, _pname), is_ok in zip(rects, oks):
                 if not is_ok:
                     logger.debug("[DROP] pattern=%s value='%s' (validator rejected)", pname, matched)
                     continue
 
-                boxes.append(
-                    Box(
-                        page=pno,
-                        x0=float(r.x0),
-                        y0=float(r.y0),
-                        x1=float(r.x1),
-                        y1=float(r.y1),
-                        matched_text=matched,
-                        pattern_name=pname,
-                    )
-                )
+                out.append((pno, float(r.x0), float(r.y0), float(r.x1), float(r.y1), matched, pname))
                 logger.debug("→ Box added: %s | text='%s'", pname, matched)
 
-    doc.close()
+            # 지표/트레이스: 개수와 시간만 (매치 값은 남기지 않음)
+            if rects:
+                n_ok = len(out) - n_before
+                metrics.VALIDATE_SECONDS.observe(time.perf_counter() - t1, label)
+                metrics.VALIDATE_CANDIDATES.inc(label, amount=len(rects))
+                metrics.VALIDATE_REJECTED.inc(label, amount=len(rects) - n_ok)
+                metrics.BOXES.inc(label, amount=n_ok)
+                if sp is not None:
+                    sp.attrs.update(candidates=len(rects), rejected=len(rects) - n_ok)
+    return out
+
+
+def _detect_shard(
+    pdf: PdfInput,
+    patterns: List[PatternItem],
+    start: int,
+    stop: int,
+    budget: float,
+    started: float,
+    ocr: bool = False,
+) -> Tuple[List[BoxTuple], List[int], dict]:
+    """
+    워커 프로세스 진입점: 문서를 직접 열어 [start, stop) 페이지만 스캔.
+    시간 한도는 부모가 탐지를 시작한 시각(started)부터 재므로 샤드 수와 상관없이 요청 전체에 budget초.
+    pdf가 경로면 워커마다 파일에서 열어 PDF 바이트를 프로세스 간에 복사하지 않는다.
+    반환: (박스 튜플, ocr이면 OCR이 필요한 페이지 번호, 워커에서 모은 지표 — 부모가 merge)
+    """
+    pset = _PatternSet(patterns, budget, started)
+    out: List[BoxTuple] = []
+    ocr_pages: List[int] = []
+    with open_pdf(pdf) as doc:
+        for pno in range(start, stop):
+            page = doc.load_page(pno)
+            layout = PageLayout.from_page(page)
+            out.extend(_scan_page(page, pset, layout))
+            metrics.PAGES.inc("detect")
+            if ocr and needs_ocr(page, layout.tokens):
+                ocr_pages.append(pno)
+    return out, ocr_pages, metrics.drain()
+
+
+def _scan_ocr_pages(doc: fitz.Document, pnos: List[int], pset: _PatternSet) -> List[BoxTuple]:
+    """텍스트 레이어가 없는 페이지들을 OCR 단어로 스캔 (패턴/검증 과정은 같다)."""
+    with tracing.span("ocr", pages=len(pnos)):
+        words = ocr_page_words(doc, pnos, check=pset.check_budget)
+    out: List[BoxTuple] = []
+    for pno in pnos:
+        with tracing.span("page", page=pno, ocr=True):
+            out.extend(_scan_page(doc.load_page(pno), pset, PageLayout(words.get(pno, []))))
+    metrics.PAGES.inc("ocr", amount=len(pnos))
+    return out
+
+
+def _merge_ocr(tuples: List[BoxTuple], ocr_tuples: List[BoxTuple]) -> List[BoxTuple]:
+    """OCR 결과를 페이지 순서로 끼워 넣는다 (같은 페이지 안에서는 텍스트 레이어 결과가 먼저)."""
+    if not ocr_tuples:
+        return tuples
+    return sorted(tuples + ocr_tuples, key=lambda t: t[0])
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """탐지용 프로세스 풀 (지연 생성, 워커 수가 바뀌면 재생성)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # 서버 스레드 상태를 물려받지 않도록 spawn 사용
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    """깨진 풀을 버린다. 그 사이 다른 요청이 이미 새 풀을 만들었으면 그 풀은 건드리지 않는다."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not broken:
+            return
+        _pool, _pool_workers = None, 0
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _shard_ranges(n_pages: int, workers: int, min_shard: int) -> List[Tuple[int, int]]:
+    """페이지 범위를 연속 샤드로 분할. 병렬로 나눌 가치가 없으면 샤드 1개."""
+    min_shard = max(1, min_shard)
+    n_shards = min(workers, n_pages // min_shard)
+    if n_shards < 2:
+        return [(0, n_pages)]
+    size, rem = divmod(n_pages, n_shards)
+    ranges, start = [], 0
+    for i in range(n_shards):
+        stop = start + size + (1 if i < rem else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _to_boxes(tuples: List[BoxTuple]) -> List[Box]:
+    return [
+        Box(page=pno, x0=x0, y0=y0, x1=x1, y1=y1, matched_text=matched, pattern_name=pname)
+        for pno, x0, y0, x1, y1, matched, pname in tuples
+    ]
+
+
+# --------------------------
+# 공개 함수
+# --------------------------
+# 탐지 결과 캐시: (PDF sha256, 패턴 지문) -> Box 튜플. /detect 후 같은 파일 /apply 재감지를 생략
+detect_cache = TTLCache(
+    config.DETECT_CACHE_ENTRIES,
+    config.DETECT_CACHE_TTL_SECONDS,
+    max_weight=config.DETECT_CACHE_MAX_BOXES,
+    weigher=len,
+)
+
+
+def pdf_digest(pdf: PdfInput) -> str:
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(pdf).hexdigest()
+    h = hashlib.sha256()
+    with open(pdf, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def patterns_fingerprint(patterns: List[PatternItem]) -> str:
+    """패턴 목록의 정규화 지문. 순서는 결과 순서에 영향을 주므로 유지한다."""
+    canon = json.dumps(
+        [[p.name, p.regex, bool(p.case_sensitive), bool(p.whole_word)] for p in patterns],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()
+
+
+def detect_boxes_from_patterns(
+    pdf: PdfInput,
+    patterns: List[PatternItem],
+    workers: Optional[int] = None,
+    min_shard_pages: Optional[int] = None,
+    use_cache: bool = True,
+    layouts: Optional[List[PageLayout]] = None,
+    digest: Optional[str] = None,
+    progress: Optional[Progress] = None,
+    budget: Optional[float] = None,
+    ocr: bool = False,
+    pages: Optional[PageRanges] = None,
+) -> List[Box]:
+    """
+    패턴 탐지 → (validator가 있으면) 유효성 검증 후 Box 생성.
+    workers >= 2이고 페이지가 충분히 많으면 페이지를 샤드로 나눠 워커 프로세스에서 스캔한다.
+    (기본값은 config.DETECT_WORKERS / config.DETECT_MIN_SHARD_PAGES)
+    결과는 순차 처리와 동일한 순서로 병합된다.
+    같은 PDF 내용 + 같은 패턴 목록의 결과는 detect_cache에서 돌려준다.
+    layouts/digest: 문서 세션에서 미리 만든 페이지별 단어와 내용 해시 (있으면 재사용, 프로세스 내 처리)
+    progress(done, total): 페이지(병렬이면 샤드)가 끝날 때마다 호출. 예외를 던지면 탐지를 중단한다.
+    budget: 탐지 시간 한도(초). 없으면 config.DETECT_TIME_BUDGET_SECONDS
+    ocr: 텍스트 레이어가 없는(스캔) 페이지는 렌더링 후 OCR 단어로 스캔한다 (ocr.py)
+    pages: 이 페이지들만 불러와 스캔 (page_ranges.parse_pages 결과, None이면 전체)
+    """
+    key = None
+    if use_cache:
+        key = (digest or pdf_digest(pdf), patterns_fingerprint(patterns), ocr, pages)
+        cached = detect_cache.get(key)
+        if cached is not None:
+            logger.debug("Detect cache hit: boxes=%d", len(cached))
+            return list(cached)
+
+    boxes = _detect(pdf, patterns, workers, min_shard_pages, layouts, progress, budget, ocr, pages)
+    if key is not None:
+        detect_cache.put(key, tuple(boxes))
+    return boxes
+
+
+def _detect(
+    pdf: PdfInput,
+    patterns: List[PatternItem],
+    workers: Optional[int],
+    min_shard_pages: Optional[int],
+    layouts: Optional[List[PageLayout]] = None,
+    progress: Optional[Progress] = None,
+    budget: Optional[float] = None,
+    ocr: bool = False,
+    pages: Optional[PageRanges] = None,
+) -> List[Box]:
+    workers = config.DETECT_WORKERS if workers is None else workers
+    min_shard = config.DETECT_MIN_SHARD_PAGES if min_shard_pages is None else min_shard_pages
+    # 시간 한도는 샤드/OCR/풀 장애 시 순차 대체까지 한 요청으로 잰다
+    pset = _PatternSet(patterns, budget)
+
+    doc = open_pdf(pdf)
+    n_pages = len(doc)
+    try:
+        pnos = resolve_pages(pages, n_pages)
+    except Exception:
+        doc.close()
+        raise
+    # 단어가 이미 있거나 일부 페이지만 보면 샤딩 이득이 적다.
+    # 사용자 패턴은 이미 샌드박스 워커에서 돌므로 샤드 프로세스를 겹쳐 띄우지 않는다
+    parallel = workers >= 2 and layouts is None and pages is None and not pset.sandboxed
+    shards = _shard_ranges(n_pages, workers, min_shard) if parallel else [(0, n_pages)]
+
+    if len(shards) > 1:
+        logger.debug("Parallel detect: pages=%d shards=%s workers=%d", n_pages, shards, workers)
+        futures = []
+        pool = None
+        try:
+            pool = _get_pool(workers)
+            futures = [
+                pool.submit(_detect_shard, pdf, patterns, a, b, pset.budget, pset.started, ocr)
+                for a, b in shards
+            ]
+            tuples: List[BoxTuple] = []
+            ocr_pages: List[int] = []
+            for fut, (_, stop) in zip(futures, shards):  # 제출 순서 = 페이지 순서
+                shard_tuples, shard_ocr, shard_metrics = fut.result()
+                metrics.merge(shard_metrics)
+                tuples.extend(shard_tuples)
+                ocr_pages.extend(shard_ocr)
+                if progress:
+                    progress(stop, n_pages)
+            if ocr_pages:
+                tuples = _merge_ocr(tuples, _scan_ocr_pages(doc, ocr_pages, pset))
+        except BrokenProcessPool as e:
+            # 워커가 죽으면 풀을 버리고 프로세스 내 순차 처리로 대체
+            logger.warning("Process pool broken, falling back to in-process detect: %s", e)
+            if pool is not None:
+                _reset_pool(pool)
+        except BaseException:
+            # 중단(시간 한도/취소 등): 아직 시작 안 한 샤드는 버린다
+            for fut in futures:
+                fut.cancel()
+            doc.close()
+            raise
+        else:
+            doc.close()
+            boxes = _to_boxes(tuples)
+            logger.debug("Total boxes detected: %d", len(boxes))
+            return boxes
+
+    tuples = []
+    ocr_pages = []
+    try:
+        for i, pno in enumerate(pnos):
+            with tracing.span("page", page=pno):
+                page = doc.load_page(pno)
+                layout = layouts[pno] if layouts is not None else PageLayout.from_page(page)
+                tuples.extend(_scan_page(page, pset, layout))
+            metrics.PAGES.inc("detect")
+            if ocr and needs_ocr(page, layout.tokens):
+                ocr_pages.append(pno)
+            if progress:
+                progress(i + 1, len(pnos))
+        if ocr_pages:
+            tuples = _merge_ocr(tuples, _scan_ocr_pages(doc, ocr_pages, pset))
+    finally:
+        doc.close()
+    boxes = _to_boxes(tuples)
     logger.debug("Total boxes detected: %d", len(boxes))
     return boxes
 
 
-def apply_redaction(pdf_bytes: bytes, boxes: List[Box], fill="black") -> bytes:
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+def iter_detect_pages(
+    pdf: PdfInput,
+    patterns: List[PatternItem],
+    layouts: Optional[List[PageLayout]] = None,
+    ocr: bool = False,
+    pages: Optional[PageRanges] = None,
+) -> Iterator[Tuple[int, List[Box], float]]:
+    """
+    페이지 단위 탐지 제너레이터: 페이지마다 (page, boxes, elapsed_ms)를 바로 내보낸다.
+    스트리밍 응답용. 결과를 모두 이어붙이면 detect_boxes_from_patterns(순차)와 같다.
+    ocr이면 스캔 페이지는 그 자리에서 OCR한다 (페이지 단위라 병렬 OCR은 쓰지 않음).
+    탐지 시간 한도에는 스캔 시간만 센다: yield에서 멈춰 있는 동안(소비 쪽이 느려 버퍼가 찬 경우)은 빼 준다.
+    """
+    pset = _PatternSet(patterns)
+    with open_pdf(pdf) as doc:
+        for pno in resolve_pages(pages, len(doc)):
+            t0 = time.perf_counter()
+            page = doc.load_page(pno)
+            layout = layouts[pno] if layouts is not None else PageLayout.from_page(page)
+            tuples = _scan_page(page, pset, layout)
+            metrics.PAGES.inc("detect")
+            if ocr and needs_ocr(page, layout.tokens):
+                tuples += _scan_ocr_pages(doc, [pno], pset)
+            paused = time.monotonic()
+            yield pno, _to_boxes(tuples), (time.perf_counter() - t0) * 1000
+            pset.pause(time.monotonic() - paused)
+
+
+# 저장 프로파일: 레닥션 시 박스 아래 이미지/벡터 그래픽 처리 + 저장 옵션
+#   standard: 기존 동작(apply_redactions 기본값 + 옵션 없는 save). 겹친 이미지 픽셀만 지우고 박스 안에 든
+#             그래픽 제거. 정리/압축 패스가 없어 저장은 가장 가볍지만 파일 전체를 다시 쓰고 출력이 커질 수 있다
+#   compact:  standard와 같은 레닥션 + 고아 객체 정리(garbage) + deflate + 객체 스트림으로 크기 축소
+#   strip:    박스에 닿은 이미지/그래픽을 통째로 제거(픽셀 편집 없음) + compact 저장
+# 증분 저장(incremental)은 두지 않는다: 원본 바이트를 그대로 두고 뒤에 덧붙이므로 가린 텍스트가 파일에 남는다.
+_COMPACT_SAVE = {"garbage": 3, "deflate": True, "deflate_images": True, "deflate_fonts": True, "use_objstms": 1}
+SAVE_PROFILES = {
+    "standard": {
+        "images": fitz.PDF_REDACT_IMAGE_PIXELS,
+        "graphics": fitz.PDF_REDACT_LINE_ART_REMOVE_IF_COVERED,
+        "save": {},
+    },
+    "compact": {
+        "images": fitz.PDF_REDACT_IMAGE_PIXELS,
+        "graphics": fitz.PDF_REDACT_LINE_ART_REMOVE_IF_COVERED,
+        "save": _COMPACT_SAVE,
+    },
+    "strip": {
+        "images": fitz.PDF_REDACT_IMAGE_REMOVE,
+        "graphics": fitz.PDF_REDACT_LINE_ART_REMOVE_IF_TOUCHED,
+        "save": _COMPACT_SAVE,
+    },
+}
+
+
+def _redact(
+    pdf: PdfInput,
+    boxes: List[Box],
+    dest: Union[str, BinaryIO],
+    fill="black",
+    progress: Optional[Progress] = None,
+    profile: Optional[str] = None,
+) -> dict:
+    """레닥션 후 dest(경로 또는 파일 객체)에 저장. 반환: 저장 통계 (bytes_out 제외)."""
+    profile = profile or config.SAVE_PROFILE
+    opts = SAVE_PROFILES.get(profile)
+    if opts is None:
+        raise ValueError(f"알 수 없는 저장 프로파일입니다: {profile} (가능: {', '.join(SAVE_PROFILES)})")
+    t0 = time.perf_counter()
+    doc = open_pdf(pdf)
     color = (0, 0, 0) if fill == "black" else (1, 1, 1)
     by_page = {}
     for b in boxes:
         by_page.setdefault(b.page, []).append(b)
 
-    logger.debug("APPLY REQUEST: total_boxes=%d, patterns=%s, fill=%s",
-                len(boxes), [b.pattern_name for b in boxes], fill)
-
-    for pno, page_boxes in by_page.items():
-        page = doc.load_page(pno)
-        logger.debug("Applying redactions on page %d (count=%d)", pno, len(page_boxes))
-        for b in page_boxes:
-            rect = fitz.Rect(b.x0, b.y0, b.x1, b.y1)
-            area = (b.x1 - b.x0) * (b.y1 - b.y0)
-            logger.debug("  → Redact box: %s | area=%.2f | text='%s'", rect, area, b.matched_text)
-            page.add_redact_annot(rect, fill=color)
-        page.apply_redactions()
+    logger.debug("APPLY REQUEST: total_boxes=%d, patterns=%s, fill=%s, profile=%s",
+                len(boxes), [b.pattern_name for b in boxes], fill, profile)
 
+    try:
+        for i, (pno, page_boxes) in enumerate(by_page.items()):
+            with tracing.span("redact_page", page=pno, boxes=len(page_boxes)):
+                page = doc.load_page(pno)
+                logger.debug("Applying redactions on page %d (count=%d)", pno, len(page_boxes))
+                for b in page_boxes:
+                    rect = fitz.Rect(b.x0, b.y0, b.x1, b.y1)
+                    area = (b.x1 - b.x0) * (b.y1 - b.y0)
+                    logger.debug("  → Redact box: %s | area=%.2f | text='%s'", rect, area, b.matched_text)
+                    page.add_redact_annot(rect, fill=color)
+                with metrics.STAGE_SECONDS.time("apply"):
+                    page.apply_redactions(images=opts["images"], graphics=opts["graphics"])
+            metrics.PAGES.inc("redact")
+            if progress:
+                progress(i + 1, len(by_page))
+        t1 = time.perf_counter()
+        with tracing.span("save", profile=profile):
+            doc.save(dest, **opts["save"])
+        metrics.STAGE_SECONDS.observe(time.perf_counter() - t1, "save")
+    finally:
+        doc.close()
+    return {
+        "profile": profile,
+        "pages": len(by_page),
+        "redact_ms": round((t1 - t0) * 1000, 2),
+        "save_ms": round((time.perf_counter() - t1) * 1000, 2),
+        "bytes_in": pdf_size(pdf),
+    }
+
+
+def redact_and_save(
+    pdf: PdfInput,
+    boxes: List[Box],
+    fill="black",
+    progress: Optional[Progress] = None,
+    profile: Optional[str] = None,
+) -> Tuple[bytes, dict]:
+    """
+    박스 영역을 레닥션한 PDF 바이트 + 단계별 시간/크기.
+    progress(done, total)는 박스가 있는 페이지마다 호출.
+    profile: SAVE_PROFILES 키 (없으면 config.SAVE_PROFILE)
+    반환 stats: {profile, pages, redact_ms, save_ms, bytes_in, bytes_out}
+    """
     out = io.BytesIO()
-    doc.save(out)
-    doc.close()
-    return out.getvalue()
+    stats = _redact(pdf, boxes, out, fill, progress, profile)
+    data = out.getvalue()
+    stats["bytes_out"] = len(data)
+    logger.debug("APPLY saved: %s", stats)
+    return data, stats
+
+
+def redact_to_file(
+    pdf: PdfInput,
+    boxes: List[Box],
+    out_path: str,
+    fill="black",
+    progress: Optional[Progress] = None,
+    profile: Optional[str] = None,
+) -> dict:
+    """redact_and_save와 같지만 결과를 out_path 파일로 쓴다 (응답은 파일에서 스트리밍). 반환: stats"""
+    stats = _redact(pdf, boxes, out_path, fill, progress, profile)
+    stats["bytes_out"] = os.path.getsize(out_path)
+    logger.debug("APPLY saved: %s -> %s", stats, out_path)
+    return stats
+
+
+def apply_redaction(
+    pdf: PdfInput,
+    boxes: List[Box],
+    fill="black",
+    progress: Optional[Progress] = None,
+    profile: Optional[str] = None,
+) -> bytes:
+    """박스 영역을 레닥션한 PDF 바이트 (시간/크기가 필요하면 redact_and_save)."""
+    return redact_and_save(pdf, boxes, fill, progress, profile)[0]
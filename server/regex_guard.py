@@ -0,0 +1,370 @@
+# regex_guard.py
+"""
+사용자 정규식의 파국적 백트래킹 위험 정적 검사.
+
+표준 re는 실행 중 중단할 수 없으므로, 컴파일 시점에 대표적인 위험 구조를 찾아낸다.
+- 반복(상한 2 이상) 안의 무한 반복 (예: (a+)+, (\\w+\\s?)*, (.*a){10})
+  단, 안쪽 반복 뒤에 그 문자 집합에 속하지 않는 필수 구분 문자가 오면 안전으로 본다.
+  본문 끝의 반복은 다음 회차의 첫 필수 항목과 반복 뒤의 첫 필수 항목을 모두 구분자로 본다.
+  (예: (?:[A-Za-z0-9-]+\\.)+ 는 '.', \\w+(?:-\\w+)* 는 다음 회차의 '-'가 구분자라 안전)
+- 반복(상한 2 이상) 안의 선택(|)에서 두 갈래가 같은 문자열에 매치될 수 있는 경우 (예: (a|aa)+$, (a|a)*b)
+  두 갈래를 뒤따르는 부분(다음 회차 포함)과 함께 한 글자씩 진행해 보고, 판단이 어려우면 위험으로 본다.
+정적 검사가 놓치는 패턴은 regex_sandbox의 실행 제한 시간이 막는다.
+
+can_match_char: 패턴이 특정 문자를 소비할 수 있는지 (마스킹 문자 영향 판단용).
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+try:
+    from re import _constants as C, _parser as P  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_constants as C  # type: ignore
+    import sre_parse as P  # type: ignore
+
+_REPEATS = {C.MAX_REPEAT, C.MIN_REPEAT}
+if hasattr(C, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(C.POSSESSIVE_REPEAT)
+
+
+def _category_has(cat, ch: str) -> bool:
+    if cat in (C.CATEGORY_DIGIT, C.CATEGORY_UNI_DIGIT):
+        return ch.isdecimal()
+    if cat in (C.CATEGORY_NOT_DIGIT, C.CATEGORY_UNI_NOT_DIGIT):
+        return not ch.isdecimal()
+    if cat in (C.CATEGORY_SPACE, C.CATEGORY_UNI_SPACE):
+        return ch.isspace()
+    if cat in (C.CATEGORY_NOT_SPACE, C.CATEGORY_UNI_NOT_SPACE):
+        return not ch.isspace()
+    if cat in (C.CATEGORY_WORD, C.CATEGORY_UNI_WORD):
+        return ch.isalnum() or ch == "_"
+    if cat in (C.CATEGORY_NOT_WORD, C.CATEGORY_UNI_NOT_WORD):
+        return not (ch.isalnum() or ch == "_")
+    return True  # 모르는 범주는 보수적으로 포함
+
+
+def _item_has(item, ch: str, ignorecase: bool) -> Optional[bool]:
+    """단일 문자 항목(LITERAL/IN/ANY/CATEGORY)이 ch를 포함하는지. 판단 불가면 None."""
+    op, av = item
+    chars = {ch, ch.lower(), ch.upper()} if ignorecase else {ch}
+    if op is C.LITERAL:
+        return chr(av) in chars
+    if op is C.NOT_LITERAL:
+        return chr(av) not in chars
+    if op is C.ANY:
+        return True
+    if op is C.IN:
+        negate = False
+        hit = False
+        for sop, sav in av:
+            if sop is C.NEGATE:
+                negate = True
+            elif sop is C.LITERAL:
+                hit |= chr(sav) in chars
+            elif sop is C.RANGE:
+                hit |= any(sav[0] <= ord(c) <= sav[1] for c in chars)
+            elif sop is C.CATEGORY:
+                hit |= any(_category_has(sav, c) for c in chars)
+            else:
+                return None
+        return hit != negate
+    return None
+
+
+_SINGLE = (C.LITERAL, C.NOT_LITERAL, C.IN, C.ANY, C.CATEGORY)
+_END = (None, None)      # 패턴 끝 (더 소비할 문자 없음)
+
+
+def _first_required(items):
+    """
+    items가 처음 반드시 소비하는 단일 문자 항목.
+    끝까지 모두 생략 가능하면 _END, 선택(|)/역참조처럼 판단할 수 없으면 None.
+    """
+    for op, av in items:
+        if op is C.AT or (op in _REPEATS and av[0] == 0):
+            continue  # 위치 검사/선택 항목은 구분자가 될 수 없음
+        if op in _SINGLE:
+            return (op, av)
+        if op in _REPEATS or op is C.SUBPATTERN:
+            first = _first_required(av[2] if op in _REPEATS else av[-1])
+            if first is _END:
+                continue
+            return first
+        return None
+    return _END
+
+
+def _separated(inner, conts, ignorecase: bool) -> bool:
+    """
+    안쪽 반복(inner 본문) 뒤에 올 수 있는 모든 이어짐(conts)에서 첫 필수 항목이
+    inner 문자 집합과 겹치지 않는 단일 문자인지. 이어짐에는 바깥 반복의 다음 회차(본문 처음으로
+    돌아감)와 반복을 빠져나간 뒤가 모두 들어 있다. 패턴 끝까지 필수 항목이 없으면 그 이어짐은 안전.
+    """
+    body = list(inner)
+    if len(body) != 1 or body[0][0] not in _SINGLE:
+        return False
+    for cont in conts:
+        sep = _first_required(cont)
+        if sep is None or (sep is not _END and _items_overlap(body[0], sep, ignorecase)):
+            return False
+    return True
+
+
+def _has_unbounded(sub) -> bool:
+    for op, av in sub:
+        if op in _REPEATS and av[1] == C.MAXREPEAT:
+            return True
+        if op in _REPEATS and _has_unbounded(av[2]):
+            return True
+        if op is C.SUBPATTERN and _has_unbounded(av[-1]):
+            return True
+        if op is C.BRANCH and any(_has_unbounded(b) for b in av[1]):
+            return True
+    return False
+
+
+def _nested_risk(body, ignorecase: bool, conts) -> bool:
+    """무한 반복 본문(body, 뒤에 conts 중 하나가 이어짐) 안에 구분자 없이 무한 반복이 있는지."""
+    items = list(body)
+    for i, (op, av) in enumerate(items):
+        after = [items[i + 1:] + c for c in conts]
+        if op in _REPEATS:
+            if av[1] == C.MAXREPEAT and not _separated(av[2], after, ignorecase):
+                return True
+            if av[1] != C.MAXREPEAT and _has_unbounded(av[2]):
+                return True
+        elif op is C.SUBPATTERN:
+            if _nested_risk(av[-1], ignorecase, after):
+                return True
+        elif op is C.BRANCH:
+            if any(_nested_risk(b, ignorecase, after) for b in av[1]):
+                return True
+    return False
+
+
+# 두 문자 항목이 겹치는지 볼 때 쓰는 표본 문자 (ASCII 출력 문자 + 공백류 + 한글/전각 예시)
+_SAMPLE = "".join(chr(c) for c in range(32, 127)) + "\t\n\r\x0b\x0c\xa0\u3000가힣ㄱ０９Ａé"
+_AMBIG_DEPTH = 32        # 두 갈래를 함께 따라가 볼 최대 글자 수 (넘으면 위험으로 본다)
+_AMBIG_STATES = 256      # 한 단계에서 따라갈 최대 상태 쌍 수
+
+
+def _freeze(sub) -> tuple:
+    """파싱 결과를 해시 가능한 튜플로 (선택 갈래 비교용). 판단하지 않는 구조는 av=None."""
+    out = []
+    for op, av in sub:
+        if op in _REPEATS:
+            av = (av[0], av[1], _freeze(av[2]))
+        elif op is C.SUBPATTERN:
+            av = (_freeze(av[-1]),)
+        elif op is C.BRANCH:
+            av = (None, tuple(_freeze(b) for b in av[1]))
+        elif op is C.IN:
+            av = tuple(av)
+        elif op not in _SINGLE and op is not C.AT:
+            av = None
+        out.append((op, av))
+    return tuple(out)
+
+
+def _expand(seq: tuple):
+    """
+    seq가 처음 소비하는 단일 문자 항목과 그 뒤에 남는 seq의 목록 [(item, rest)].
+    끝까지 아무것도 소비하지 않을 수 있으면 (_END, ()) 포함. 판단할 수 없는 구조가 있으면 None.
+    """
+    out = []
+    stack = [seq]
+    seen = set()
+    while stack:
+        cur = stack.pop()
+        if cur in seen:
+            continue
+        seen.add(cur)
+        if not cur:
+            out.append((_END, ()))
+            continue
+        (op, av), rest = cur[0], cur[1:]
+        if op in _SINGLE:
+            out.append((cur[0], rest))
+        elif op is C.AT:
+            stack.append(rest)
+        elif op is C.SUBPATTERN:
+            stack.append(av[0] + rest)
+        elif op is C.BRANCH:
+            stack.extend(b + rest for b in av[1])
+        elif op in _REPEATS:
+            lo, hi, body = av
+            if hi == 0:
+                stack.append(rest)
+                continue
+            again = (op, (max(0, lo - 1), hi if hi == C.MAXREPEAT else hi - 1, body))
+            stack.append(body + (again,) + rest)
+            if lo == 0:
+                stack.append(rest)
+        else:
+            return None
+        if len(seen) > _AMBIG_STATES:
+            return None
+    return out
+
+
+def _item_samples(item) -> str:
+    """항목에 직접 적힌 문자(리터럴, 범위 양 끝) — 표본 밖 문자 집합끼리도 겹침을 볼 수 있게."""
+    op, av = item
+    if op in (C.LITERAL, C.NOT_LITERAL):
+        return chr(av)
+    if op is C.IN:
+        out = []
+        for sop, sav in av:
+            if sop is C.LITERAL:
+                out.append(chr(sav))
+            elif sop is C.RANGE:
+                out.append(chr(sav[0]) + chr(sav[1]))
+        return "".join(out)
+    return ""
+
+
+def _items_overlap(x, y, ignorecase: bool) -> bool:
+    samples = _SAMPLE + _item_samples(x) + _item_samples(y)
+    return any(
+        _item_has(x, ch, ignorecase) is not False and _item_has(y, ch, ignorecase) is not False
+        for ch in samples
+    )
+
+
+def _same_text(a: tuple, b: tuple, ignorecase: bool) -> bool:
+    """
+    두 갈래(뒤에 이어지는 부분 포함)가 같은 문자열을 서로 다른 경로로 소비할 수 있는지.
+    두 경로를 한 글자씩 함께 진행해 같은 상태에 모이거나 함께 끝나면 True,
+    어느 글자에서든 갈라지면 False. 깊이/상태 한도를 넘거나 판단할 수 없으면 보수적으로 True.
+    """
+    frontier = {(a, b)}
+    seen = set()
+    for _ in range(_AMBIG_DEPTH):
+        nxt = set()
+        for x, y in frontier:
+            if x == y:
+                return True
+            if (x, y) in seen:
+                continue
+            seen.add((x, y))
+            ex, ey = _expand(x), _expand(y)
+            if ex is None or ey is None:
+                return True
+            for ix, rx in ex:
+                for iy, ry in ey:
+                    if ix is _END or iy is _END:
+                        if ix is _END and iy is _END:
+                            return True
+                        continue
+                    if _items_overlap(ix, iy, ignorecase):
+                        nxt.add((rx, ry))
+        if not nxt:
+            return False
+        if len(nxt) > _AMBIG_STATES:
+            return True
+        frontier = nxt
+    return True
+
+
+def _ambiguous_branch(seq: tuple, tail: tuple, ignorecase: bool, fresh: bool = True) -> bool:
+    """
+    반복 본문 seq(뒤에 tail이 이어짐) 안의 선택(|)에서 두 갈래가 같은 문자열에 매치될 수 있는지.
+    fresh: 이번 회차에서 아직 아무것도 소비하지 않음 — 이때 빈 갈래는 빈 회차라 re가 멈추므로 제외한다.
+    안쪽 반복은 _walk가 따로 본다.
+    """
+    for i, (op, av) in enumerate(seq):
+        rest = seq[i + 1:] + tail
+        if op is C.SUBPATTERN:
+            if _ambiguous_branch(av[0], rest, ignorecase, fresh):
+                return True
+        elif op is C.BRANCH:
+            alts = [b + rest for b in av[1] if b or not fresh]
+            for j in range(len(alts)):
+                for k in range(j + 1, len(alts)):
+                    if _same_text(alts[j], alts[k], ignorecase):
+                        return True
+            if any(_ambiguous_branch(b, rest, ignorecase, fresh) for b in av[1]):
+                return True
+        if op is not C.AT:
+            fresh = False
+    return False
+
+
+def _walk(sub, ignorecase: bool, conts=([],)) -> Optional[str]:
+    """conts: sub 뒤에 이어질 수 있는 나머지 패턴들 (바깥 반복의 다음 회차 / 반복 밖)."""
+    items = list(sub)
+    for i, (op, av) in enumerate(items):
+        after = [items[i + 1:] + c for c in conts]
+        if op in _REPEATS:
+            # 본문 뒤에는 다음 회차(본문 처음) 또는 반복 뒤가 이어진다
+            inner = [list(av[2]) + c for c in after] + after if av[1] > 1 else after
+            if av[1] > 1 and _nested_risk(av[2], ignorecase, inner):
+                return "중첩된 무한 반복(파국적 백트래킹 위험)"
+            if av[1] > 1:
+                # 갈래 뒤에는 본문 나머지와 다음 회차(또는 반복 끝)가 이어진다
+                body = _freeze(av[2])
+                loop = ((op, (0, av[1] if av[1] == C.MAXREPEAT else av[1] - 1, body)),)
+                if _ambiguous_branch(body, loop, ignorecase):
+                    return "반복 안의 선택(|) 갈래가 같은 문자열에 매치될 수 있음(파국적 백트래킹 위험)"
+            reason = _walk(av[2], ignorecase, inner)
+            if reason:
+                return reason
+        elif op is C.SUBPATTERN:
+            reason = _walk(av[-1], ignorecase, after)
+            if reason:
+                return reason
+        elif op is C.BRANCH:
+            for b in av[1]:
+                reason = _walk(b, ignorecase, after)
+                if reason:
+                    return reason
+        elif op in (C.ASSERT, C.ASSERT_NOT):
+            reason = _walk(av[1], ignorecase)
+            if reason:
+                return reason
+    return None
+
+
+@lru_cache(maxsize=1024)
+def regex_risk(pattern: str, flags: int = 0) -> Optional[str]:
+    """위험 사유 문자열 또는 None. 컴파일 불가한 패턴은 사유로 오류 메시지를 돌려준다."""
+    try:
+        parsed = P.parse(pattern, flags)
+    except re.error as e:
+        return f"정규식 오류: {e}"
+    return _walk(parsed, bool(flags & re.IGNORECASE))
+
+
+def _walk_can_match(sub, ch: str, ignorecase: bool) -> bool:
+    for op, av in sub:
+        if op in (C.LITERAL, C.NOT_LITERAL, C.IN, C.ANY, C.CATEGORY):
+            if _item_has((op, av), ch, ignorecase) is not False:
+                return True
+        elif op in _REPEATS:
+            if av[1] > 0 and _walk_can_match(av[2], ch, ignorecase):
+                return True
+        elif op is C.SUBPATTERN:
+            if _walk_can_match(av[-1], ch, ignorecase):
+                return True
+        elif op is C.BRANCH:
+            if any(_walk_can_match(b, ch, ignorecase) for b in av[1]):
+                return True
+        elif op is C.AT:
+            if av in (C.AT_BOUNDARY, C.AT_NON_BOUNDARY, C.AT_UNI_BOUNDARY, C.AT_UNI_NON_BOUNDARY):
+                return True  # 이웃 문자를 읽음 → 보수적으로 가능
+        elif op in (C.ASSERT, C.ASSERT_NOT):
+            return True  # 전후방탐색은 치환 전후로 결과가 달라질 수 있음 → 보수적으로 가능
+        else:
+            return True  # 역참조 등 판단 불가 → 보수적으로 가능
+    return False
+
+
+@lru_cache(maxsize=256)
+def can_match_char(pattern: str, flags: int, ch: str) -> bool:
+    """패턴이 문자 ch를 소비할 수 있는지. 전후방탐색/경계처럼 이웃 문자를 읽거나 판단 불가면 True."""
+    try:
+        parsed = P.parse(pattern, flags)
+    except re.error:
+        return True
+    return _walk_can_match(parsed, ch, bool(flags & re.IGNORECASE))
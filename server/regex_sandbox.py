@@ -0,0 +1,122 @@
+# regex_sandbox.py
+"""
+사용자 정규식을 제한 시간이 있는 별도 프로세스에서 실행.
+
+표준 re의 finditer/fullmatch는 실행 중에 중단할 수 없다. 그래서 프리셋이 아닌 패턴은
+spawn 워커 프로세스로 텍스트를 보내 실행하고, 제한 시간 안에 답이 없으면 워커를 종료(kill)한다.
+regex_guard의 정적 검사가 놓친 패턴이 있어도 요청 하나가 스레드와 CPU를 무한히 잡지 못한다.
+
+- 워커는 유휴 목록(최대 config.USER_REGEX_WORKERS개)에 두고 재사용한다. 종료된 워커는 다음 호출 때 새로 띄운다.
+- SandboxedScanner / SandboxedPattern은 RuleScanner.scan / re.Pattern.fullmatch 자리에 그대로 쓴다.
+"""
+import multiprocessing
+import re
+import threading
+from typing import Any, Callable, List, Tuple
+
+from . import config
+from .scanner import RuleSpec, Span, get_scanner
+
+
+class RegexTimeout(Exception):
+    """사용자 정규식이 제한 시간 안에 끝나지 않음 (워커 프로세스는 종료됨)."""
+
+    def __init__(self, timeout: float):
+        super().__init__(f"사용자 패턴 실행이 제한 시간({timeout:g}s)을 넘어 중단했습니다.")
+        self.timeout = timeout
+
+
+def _serve(conn) -> None:
+    """워커 프로세스 본체: (op, payload)를 받아 실행하고 ("ok", 결과) 또는 ("error", 메시지)를 돌려준다."""
+    while True:
+        try:
+            op, payload = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            if op == "scan":
+                rules, text = payload
+                result: Any = get_scanner(rules).scan(text)
+            elif op == "fullmatch":
+                (regex, flags), values = payload
+                comp = re.compile(regex, flags)
+                result = [comp.fullmatch(v) is not None for v in values]
+            else:
+                raise ValueError(f"unknown op: {op}")
+            conn.send(("ok", result))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self):
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_serve, args=(child,), name="regex-sandbox", daemon=True)
+        self.proc.start()
+        child.close()
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.join(timeout=1)
+        self.conn.close()
+
+
+_idle: List[_Worker] = []
+_lock = threading.Lock()
+
+
+def _call(op: str, payload: Any, timeout: float) -> Any:
+    with _lock:
+        worker = _idle.pop() if _idle else None
+    if worker is None or not worker.proc.is_alive():
+        worker = _Worker()
+    try:
+        worker.conn.send((op, payload))
+        if not worker.conn.poll(timeout):
+            raise RegexTimeout(timeout)
+        status, result = worker.conn.recv()
+    except BaseException:
+        worker.kill()
+        raise
+    with _lock:
+        if len(_idle) < config.USER_REGEX_WORKERS:
+            _idle.append(worker)
+            worker = None
+    if worker is not None:
+        worker.kill()
+    if status == "error":
+        raise ValueError(result)
+    return result
+
+
+def shutdown() -> None:
+    """유휴 워커 종료 (테스트/서버 종료용)."""
+    with _lock:
+        workers = list(_idle)
+        _idle.clear()
+    for w in workers:
+        w.kill()
+
+
+class SandboxedScanner:
+    """RuleScanner와 같은 scan() 결과를 워커 프로세스에서 얻는다. timeout()은 호출마다 남은 시간(초)."""
+
+    def __init__(self, rules: Tuple[RuleSpec, ...], timeout: Callable[[], float]):
+        self.rules = rules
+        self.names = [name for name, _, _ in rules]
+        self._timeout = timeout
+
+    def scan(self, text: str) -> List[List[Span]]:
+        return _call("scan", (self.rules, text), self._timeout())
+
+
+class SandboxedPattern:
+    """re.Pattern.fullmatch 대용 (card 토큰 검사). 결과는 매치 여부(bool)만 돌려준다."""
+
+    def __init__(self, source: Tuple[str, int], timeout: Callable[[], float]):
+        self.source = source
+        self._timeout = timeout
+
+    def fullmatch(self, value: str) -> bool:
+        return _call("fullmatch", (self.source, [value]), self._timeout())[0]
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from ..executor import doc_executor
+from ..sessions import build_session, get_session, session_store
+from ..uploads import read_limited
+
+router = APIRouter(tags=["documents"])
+
+
+@router.post("/documents")
+async def upload_document(file: UploadFile = File(..., description="PDF 파일")):
+    """
+    PDF를 한 번 업로드해 세션 생성.
+    반환된 doc_id를 /text/extract, /text/match, /redactions/* 에 file 대신 넘긴다.
+    UPLOAD_MAX_BYTES를 넘으면 끝까지 읽지 않고 413.
+    """
+    if file.content_type not in ("application/pdf", "application/octet-stream"):
+        raise HTTPException(status_code=400, detail="PDF 파일을 업로드하세요.")
+    data = await run_in_threadpool(read_limited, file.file)
+    if not data:
+        raise HTTPException(status_code=400, detail="빈 파일입니다.")
+    try:
+        sess = await doc_executor.run(build_session, data, file.filename or "")
+    except RuntimeError as e:  # fitz 열기 실패
+        raise HTTPException(status_code=400, detail=f"PDF를 열 수 없습니다: {e}")
+    # 한도보다 큰 문서는 put이 다른 세션을 밀어내기 전에 거절한다
+    if not session_store.put(sess.doc_id, sess):
+        raise HTTPException(status_code=413, detail="문서가 세션 메모리 한도보다 큽니다.")
+    return sess.info()
+
+
+@router.get("/documents/{doc_id}")
+async def document_info(doc_id: str):
+    sess = get_session(doc_id)
+    if sess is None:
+        raise HTTPException(status_code=404, detail="문서 세션이 없거나 만료되었습니다.")
+    return sess.info()
+
+
+@router.delete("/documents/{doc_id}")
+async def delete_document(doc_id: str):
+    if session_store.pop(doc_id) is None:
+        raise HTTPException(status_code=404, detail="문서 세션이 없거나 만료되었습니다.")
+    return {"ok": True}
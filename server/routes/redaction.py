@@ -1,16 +1,36 @@
 # server/routes_redaction.py
 from __future__ import annotations
 
+import re
+import hmac
 import json
+import asyncio
 import logging
 import time
-from typing import List, Optional, Literal, Tuple, Set
+import zipfile
+from functools import partial
+from typing import Callable, List, Optional, Literal, Tuple, Set, Union
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Response, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Response, Form
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
 from ..schemas import DetectResponse, PatternItem, Box
-from ..pdf_redaction import detect_boxes_from_patterns, apply_redaction
+from ..pdf_redaction import (
+    SAVE_PROFILES, PdfInput, detect_boxes_from_patterns, iter_detect_pages, pdf_page_count, pdf_size, redact_and_save,
+    redact_to_file,
+)
 from ..redac_rules import PRESET_PATTERNS
+from ..regex_guard import regex_risk
+from .. import config, tracing
+from ..executor import ExecutorBusy, doc_executor
+from ..jobs import Job, job_store
+from ..sessions import get_session
+from ..box_index import dedup_boxes, merge_boxes
+from ..uploads import remove_quietly, spool_file, spool_to_path, temp_path
+from ..ocr import ocr_available
+from ..page_ranges import page_in, parse_pages, resolve_pages
 
 router = APIRouter(tags=["redaction"])
 log = logging.getLogger("redaction.router")
@@ -25,14 +45,88 @@ def _ensure_pdf(file: UploadFile) -> None:
     if file.content_type not in ("application/pdf", "application/octet-stream"):
         raise HTTPException(status_code=400, detail="PDF 파일을 업로드하세요.")
 
-def _read_pdf(file: UploadFile) -> bytes:
-    data = file.file.read()
-    if not data:
+def _spool_pdf(file: UploadFile) -> str:
+    """업로드 PDF를 임시 파일로 받아 경로 반환 (동기, 스레드에서 호출). 비어 있으면 400."""
+    path = spool_to_path(file.file)
+    if pdf_size(path) == 0:
+        remove_quietly(path)
         raise HTTPException(status_code=400, detail="빈 파일입니다.")
-    return data
+    return path
+
+async def _pdf_source(file: Optional[UploadFile], doc_id: Optional[str]) -> Tuple[PdfInput, dict, Optional[str]]:
+    """
+    업로드 파일 또는 문서 세션(doc_id)에서 PDF를 얻는다.
+    업로드는 메모리에 읽지 않고 임시 파일로 받아 경로를 넘긴다 (UPLOAD_MAX_BYTES 초과면 413).
+    반환: (pdf, detect 추가 인자, 다 쓴 뒤 지울 임시 파일) — 세션이면 바이트와 미리 파싱된 layouts/digest.
+    """
+    if doc_id:
+        sess = get_session(doc_id)
+        if sess is None:
+            raise HTTPException(status_code=404, detail="문서 세션이 없거나 만료되었습니다.")
+        return sess.data, {"layouts": sess.layouts, "digest": sess.digest}, None
+    _ensure_pdf(file)
+    path = await run_in_threadpool(_spool_pdf, file)
+    return path, {}, path
+
+def _with_ocr(src_kw: dict, ocr: bool) -> dict:
+    """ocr=true면 탐지 인자에 추가. OCR 엔진이 없으면 503 (스캔 페이지를 조용히 통과시키지 않도록)."""
+    if ocr:
+        if not ocr_available():
+            raise HTTPException(status_code=503, detail="OCR 엔진(tesseract)을 사용할 수 없습니다.")
+        src_kw["ocr"] = True
+    return src_kw
+
+def _trace_requested(request: Request) -> bool:
+    """
+    X-Redaction-Trace 헤더 또는 ?trace= 값이 있으면 프로파일링 요청.
+    값은 관리자 토큰(TRACE_TOKEN)이어야 하며, 토큰이 설정되지 않았거나 다르면 403.
+    """
+    token = request.headers.get("x-redaction-trace") or request.query_params.get("trace")
+    if not token:
+        return False
+    if not config.TRACE_TOKEN or not hmac.compare_digest(token.encode(), config.TRACE_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="프로파일링 권한이 없습니다.")
+    return True
+
+def _traced_kw(src_kw: dict) -> dict:
+    """프로파일링 요청은 캐시를 건너뛰고 한 프로세스에서 순차 탐지 (모든 구간이 트레이스에 잡히도록)."""
+    return {**src_kw, "use_cache": False, "workers": 1}
+
+def _save_profile(name: Optional[str]) -> Optional[str]:
+    """저장 프로파일 이름 확인 (없으면 None → 서버 기본값)."""
+    name = (name or "").strip().lower()
+    if not name:
+        return None
+    if name not in SAVE_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"save_profile은 {', '.join(SAVE_PROFILES)} 중 하나여야 합니다.",
+        )
+    return name
+
+_PRESET_ITEMS = tuple(PatternItem(**p) for p in PRESET_PATTERNS)
+_PRESET_KEYS = {(p.name, p.regex) for p in _PRESET_ITEMS}
 
 def _default_patterns() -> List[PatternItem]:
-    return [PatternItem(**p) for p in PRESET_PATTERNS]
+    return list(_PRESET_ITEMS)
+
+def _guard_patterns(patterns: List[PatternItem]) -> None:
+    """
+    사용자 패턴 비용 검사 (프리셋과 같은 패턴은 건너뜀).
+    config.PATTERN_GUARD: reject → 400, flag → 경고 로그, off → 검사 안 함.
+    """
+    mode = config.PATTERN_GUARD
+    if mode == "off":
+        return
+    for p in patterns:
+        if (p.name, p.regex) in _PRESET_KEYS:
+            continue
+        reason = regex_risk(p.regex, 0 if p.case_sensitive else re.IGNORECASE)
+        if reason is None:
+            continue
+        if mode == "reject" or reason.startswith("정규식 오류"):
+            raise HTTPException(status_code=400, detail=f"패턴 '{p.name}' 거부: {reason}")
+        log.warning("위험 패턴 허용(flag): name=%s regex=%s reason=%s", p.name, p.regex, reason)
 
 def _parse_patterns_json(patterns_json: Optional[str]) -> List[PatternItem]:
     if not patterns_json:
@@ -41,10 +135,12 @@ def _parse_patterns_json(patterns_json: Optional[str]) -> List[PatternItem]:
         obj = json.loads(patterns_json)
         if isinstance(obj, dict) and "patterns" in obj:
             obj = obj["patterns"]
-        return [PatternItem(**p) for p in obj]
+        patterns = [PatternItem(**p) for p in obj]
     except Exception as e:
         log.exception("patterns_json 파싱 실패: %s", e)
         raise HTTPException(status_code=400, detail=f"잘못된 patterns_json: {e}")
+    _guard_patterns(patterns)
+    return patterns
 
 def _parse_boxes_json(boxes_json: Optional[str]) -> List[Box]:
     if not boxes_json:
@@ -131,20 +227,212 @@ def _filter_boxes(
     return out, stats
 
 def _dedup_boxes(boxes: List[Box], tol: float = 0.25) -> List[Box]:
-    """간단 좌표 중복 제거."""
-    out: List[Box] = []
-    def same(a: Box, b: Box) -> bool:
-        return (
-            a.page == b.page and
-            abs(a.x0 - b.x0) <= tol and
-            abs(a.y0 - b.y0) <= tol and
-            abs(a.x1 - b.x1) <= tol and
-            abs(a.y1 - b.y1) <= tol
+    """좌표 중복 제거 (격자 버킷 기반, box_index.dedup_boxes)."""
+    return dedup_boxes(boxes, tol)
+
+def _redact_pdf(
+    pdf: PdfInput,
+    boxes_req: List[Box],
+    patterns: List[PatternItem],
+    *,
+    mode: str,
+    incl: Set[str],
+    excl: Set[str],
+    ensure: Set[str],
+    merge_overlaps: bool,
+    fill: Optional[str],
+    src_kw: Optional[dict] = None,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+    save_profile: Optional[str] = None,
+    out_path: Optional[str] = None,
+    allow_empty: bool = False,
+) -> Tuple[Union[bytes, str], int, dict]:
+    """
+    /redactions/apply 본체 (동기, 문서 처리 풀에서 호출).
+    mode에 따라 감지/병합 → include/exclude 필터 → (선택) 병합 → 레닥션.
+    progress(stage, done, total): stage는 "detect"(페이지) / "redact"(박스 있는 페이지)
+    src_kw["pages"]가 있으면 그 페이지만 감지/레닥션하고 나머지 페이지는 건드리지 않는다.
+    out_path가 있으면 결과를 그 파일에 쓰고 바이트 대신 경로를 돌려준다.
+    allow_empty가 아니면 strict에서 적용할 박스가 없을 때 400 (배치는 박스 0개로 그대로 저장).
+    반환: (레닥션된 PDF 또는 out_path, 적용한 박스 수, 레닥션/저장 시간과 크기)
+    """
+    src_kw = dict(src_kw or {})
+    pages = src_kw.get("pages")
+    if pages is not None:
+        boxes_req = [b for b in boxes_req or [] if page_in(pages, b.page)]
+    if progress:
+        src_kw["progress"] = partial(progress, "detect")
+    if mode == "auto_all":
+        detected = detect_boxes_from_patterns(pdf, patterns, **src_kw)
+        base_boxes = detected
+    elif mode == "auto_merge":
+        detected = detect_boxes_from_patterns(pdf, patterns, **src_kw)
+        base_boxes = (boxes_req or []) + detected
+    else:  # strict
+        base_boxes = boxes_req or []
+        # ensure에 지정된 패턴만 골라 스캔 (해당 패턴이 없으면 스캔 생략)
+        ensure_pats = [p for p in patterns if p.name in ensure]
+        if ensure_pats:
+            ensured = detect_boxes_from_patterns(pdf, ensure_pats, **src_kw)
+            log.debug(
+                "APPLY strict: ensure_patterns=%s scanned_patterns=%d/%d -> merge=%d",
+                sorted(list(ensure)), len(ensure_pats), len(patterns), len(ensured)
+            )
+            if ensured:
+                base_boxes = _dedup_boxes(base_boxes + ensured)
+        elif ensure:
+            log.debug("APPLY strict: ensure_patterns=%s scanned_patterns=0 (패턴 목록에 없음)",
+                    sorted(list(ensure)))
+
+        if not base_boxes and not allow_empty:
+            raise HTTPException(status_code=400, detail="boxes가 비어있습니다. (mode=strict)")
+
+    final_boxes, stats = _filter_boxes(base_boxes, include_patterns=incl, exclude_patterns=excl)
+
+    log.debug(
+        "APPLY build: before_total=%d after_total=%d include_mode=%s include=%s exclude=%s "
+        "by_pattern_before=%s by_pattern_after=%s excluded_reasons=%s",
+        stats["total"],
+        len(final_boxes),
+        stats["include_mode"],
+        stats["include_set"],
+        stats["exclude_set"],
+        stats["by_pattern_before"],
+        stats["by_pattern_after"],
+        stats["excluded_reasons"],
+    )
+
+    if merge_overlaps:
+        n_before = len(final_boxes)
+        final_boxes = merge_boxes(dedup_boxes(final_boxes))
+        log.debug("APPLY merge: boxes %d -> %d", n_before, len(final_boxes))
+
+    redact_progress = partial(progress, "redact") if progress else None
+    if out_path is not None:
+        save_stats = redact_to_file(
+            pdf, final_boxes, out_path, fill=fill or "black", progress=redact_progress, profile=save_profile,
         )
-    for b in boxes:
-        if not any(same(b, x) for x in out):
-            out.append(b)
-    return out
+        return out_path, len(final_boxes), save_stats
+    out, save_stats = redact_and_save(
+        pdf, final_boxes, fill=fill or "black", progress=redact_progress, profile=save_profile,
+    )
+    return out, len(final_boxes), save_stats
+
+def _apply_options(
+    pdf: PdfInput,
+    req: Optional[str],
+    boxes_json: Optional[str],
+    fill: Optional[str],
+    patterns_json: Optional[str],
+    mode: str,
+    exclude_patterns: Optional[str],
+    include_patterns: Optional[str],
+    ensure_patterns: Optional[str],
+    merge_overlaps: bool,
+    save_profile: Optional[str] = None,
+) -> Tuple[List[Box], List[PatternItem], dict]:
+    """apply 계열 폼 파라미터 해석 → (요청 boxes, 패턴, _redact_pdf 키워드 인자)."""
+    boxes_req, fill_override = _boxes_from_req(req)
+    if fill_override:
+        fill = fill_override or fill
+    if boxes_json is not None:
+        boxes_req = _parse_boxes_json(boxes_json)
+
+    patterns = _parse_patterns_json(patterns_json)
+    excl = _split_csv_set(exclude_patterns)
+    incl = _split_csv_set(include_patterns)
+    ensure = _split_csv_set(ensure_patterns) or set()
+
+    log.debug(
+        "APPLY request: mode=%s, file_size=%dB, boxes_req=%d, fill=%s, patterns=%s, "
+        "exclude=%s, include=%s, ensure=%s",
+        mode, pdf_size(pdf), len(boxes_req), fill,
+        [p.name for p in patterns], sorted(list(excl)), sorted(list(incl)), sorted(list(ensure))
+    )
+    opts = dict(
+        mode=mode, incl=incl, excl=excl, ensure=ensure, merge_overlaps=merge_overlaps, fill=fill,
+        save_profile=_save_profile(save_profile),
+    )
+    return boxes_req, patterns, opts
+
+# ---------------------------
+# 배치 (zip 스트림)
+# ---------------------------
+class _ZipSink:
+    """쓰기 전용 비탐색 스트림. zipfile이 쓴 바이트를 모아 두었다가 drain()으로 넘긴다."""
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def write(self, b) -> int:
+        self._parts.append(bytes(b))
+        return len(b)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+BATCH_REPORT_NAME = "report.json"
+
+def _unique_name(name: str, used: Set[str]) -> str:
+    """zip 안에서 겹치지 않는 이름 ('a.pdf' → 'a (2).pdf')."""
+    stem, dot, ext = name.rpartition(".")
+    if not dot:
+        stem, ext = name, ""
+    cand, n = name, 1
+    while cand in used or cand == BATCH_REPORT_NAME:
+        n += 1
+        cand = f"{stem} ({n}).{ext}" if dot else f"{stem} ({n})"
+    used.add(cand)
+    return cand
+
+def _batch_inputs(files: Optional[List[UploadFile]], archive: Optional[UploadFile]) -> Tuple[List[Tuple[str, object]], list]:
+    """
+    배치 입력 목록 [(이름, 읽기 함수)]와 다 쓴 뒤 닫을 임시 파일들 (동기, 스레드에서 호출).
+    업로드는 요청과 분리된 임시 파일로 복사해 두고, 내용은 작업이 시작될 때 워커에서 읽는다.
+    archive(zip)면 .pdf 항목만 사용.
+    """
+    items: List[Tuple[str, object]] = []
+    spools: list = []
+    try:
+        for f in files or []:
+            sp = spool_file(f.file, config.BATCH_SPOOL_BYTES)
+            spools.append(sp)
+            items.append((f.filename or "document.pdf", sp.read))
+        if archive is not None:
+            sp = spool_file(archive.file, config.BATCH_SPOOL_BYTES)
+            spools.append(sp)
+            try:
+                zf = zipfile.ZipFile(sp)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail="zip 파일을 읽을 수 없습니다.")
+            spools.append(zf)
+            for info in zf.infolist():
+                base = info.filename.rsplit("/", 1)[-1]
+                if info.is_dir() or info.filename.startswith("__MACOSX/") or not base.lower().endswith(".pdf"):
+                    continue
+                if info.file_size > config.BATCH_MAX_FILE_BYTES:
+                    items.append((base, None))   # 보고서에 크기 초과로 남김
+                    continue
+                items.append((base, lambda info=info: zf.read(info)))
+        if not items:
+            raise HTTPException(status_code=400, detail="PDF 파일을 업로드하세요. (files 또는 archive)")
+        if len(items) > config.BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"파일이 너무 많습니다. (최대 {config.BATCH_MAX_FILES}개)")
+    except BaseException:
+        _close_all(spools)
+        raise
+    return items, spools
+
+def _close_all(objs) -> None:
+    for o in reversed(objs):
+        try:
+            o.close()
+        except Exception:
+            pass
 
 # ---------------------------
 # 엔드포인트
@@ -155,25 +443,121 @@ def list_patterns():
 
 @router.post("/redactions/detect", response_model=DetectResponse)
 async def detect(
-    file: UploadFile = File(..., description="PDF 파일"),
+    request: Request,
+    response: Response,
+    file: Optional[UploadFile] = File(None, description="PDF 파일 (doc_id를 쓰면 생략)"),
+    doc_id: Optional[str] = Form(None, description="문서 세션 ID (/documents 업로드 결과)"),
     patterns_json: Optional[str] = Form(None, description="옵션: List[PatternItem] 또는 {'patterns':[...]} JSON"),
+    ocr: bool = Form(False, description="true면 텍스트 레이어가 없는(스캔) 페이지를 OCR로 탐지"),
+    pages: Optional[str] = Form(None, description="처리할 페이지(1부터). 예: '1-10,37', '5-' (없으면 전체)"),
 ):
-    _ensure_pdf(file)
     t0 = time.perf_counter()
-    pdf = await file.read()
+    src_kw = _with_ocr({}, ocr)
+    src_kw["pages"] = parse_pages(pages)
     patterns = _parse_patterns_json(patterns_json)
-
-    log.debug("DETECT request: size=%dB patterns=%s",
-            len(pdf), [p.name for p in patterns])
-
-    boxes = detect_boxes_from_patterns(pdf, patterns)
+    traced = _trace_requested(request)
+    pdf, doc_kw, tmp = await _pdf_source(file, doc_id)
+    try:
+        log.debug("DETECT request: size=%dB patterns=%s doc_id=%s",
+                pdf_size(pdf), [p.name for p in patterns], doc_id)
+        src_kw.update(doc_kw)
+        if traced:
+            boxes, trace = await doc_executor.run(
+                tracing.run_traced, detect_boxes_from_patterns, pdf, patterns, **_traced_kw(src_kw),
+            )
+            response.headers["X-Redaction-Trace-Id"] = tracing.save_trace(
+                trace, endpoint="detect", bytes_in=pdf_size(pdf), boxes=len(boxes),
+            )
+        else:
+            boxes = await doc_executor.run(detect_boxes_from_patterns, pdf, patterns, **src_kw)
+    finally:
+        remove_quietly(tmp)
     elapsed = (time.perf_counter() - t0) * 1000
     log.debug("DETECT done: total_matches=%d elapsed=%.2fms", len(boxes), elapsed)
     return DetectResponse(total_matches=len(boxes), boxes=boxes)
 
+@router.post("/redactions/detect/stream")
+async def detect_stream(
+    file: Optional[UploadFile] = File(None, description="PDF 파일 (doc_id를 쓰면 생략)"),
+    doc_id: Optional[str] = Form(None, description="문서 세션 ID (/documents 업로드 결과)"),
+    patterns_json: Optional[str] = Form(None, description="옵션: List[PatternItem] 또는 {'patterns':[...]} JSON"),
+    ocr: bool = Form(False, description="true면 텍스트 레이어가 없는(스캔) 페이지를 OCR로 탐지"),
+    pages: Optional[str] = Form(None, description="처리할 페이지(1부터). 예: '1-10,37', '5-' (없으면 전체)"),
+):
+    """
+    페이지 단위 NDJSON 스트리밍 탐지.
+    페이지마다 {"type":"page", page, boxes, counts, elapsed_ms} 한 줄,
+    마지막에 {"type":"summary", pages, total_matches, counts, elapsed_ms} 한 줄.
+    중간 오류는 {"type":"error", detail} 한 줄로 끝난다.
+    """
+    t0 = time.perf_counter()
+    _with_ocr({}, ocr)  # OCR 엔진이 없으면 503
+    page_ranges = parse_pages(pages)
+    patterns = _parse_patterns_json(patterns_json)
+    pdf, src_kw, tmp = await _pdf_source(file, doc_id)
+
+    log.debug("DETECT(stream) request: size=%dB patterns=%s doc_id=%s",
+            pdf_size(pdf), [p.name for p in patterns], doc_id)
+
+    try:
+        if page_ranges is not None:
+            # 범위가 문서를 벗어나면 /redactions/detect처럼 응답을 시작하기 전에 400
+            layouts = src_kw.get("layouts")
+            n_pages = len(layouts) if layouts is not None else await doc_executor.run(pdf_page_count, pdf)
+            resolve_pages(page_ranges, n_pages)
+        page_iter = doc_executor.stream(
+            iter_detect_pages, pdf, patterns, layouts=src_kw.get("layouts"), ocr=ocr, pages=page_ranges,
+        )
+    except BaseException:
+        remove_quietly(tmp)
+        raise
+
+    async def _ndjson():
+        n_pages = 0
+        total = 0
+        counts: dict = {}
+        try:
+            async for pno, boxes, page_ms in page_iter:
+                page_counts: dict = {}
+                for b in boxes:
+                    page_counts[b.pattern_name] = page_counts.get(b.pattern_name, 0) + 1
+                    counts[b.pattern_name] = counts.get(b.pattern_name, 0) + 1
+                n_pages += 1
+                total += len(boxes)
+                yield json.dumps({
+                    "type": "page",
+                    "page": pno,
+                    "boxes": [b.model_dump() for b in boxes],
+                    "counts": page_counts,
+                    "elapsed_ms": round(page_ms, 2),
+                }, ensure_ascii=False) + "\n"
+        except Exception as e:
+            log.exception("DETECT(stream) 실패: %s", e)
+            yield json.dumps({"type": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+            return
+        finally:
+            remove_quietly(tmp)
+
+        elapsed = (time.perf_counter() - t0) * 1000
+        log.debug("DETECT(stream) done: pages=%d total_matches=%d elapsed=%.2fms", n_pages, total, elapsed)
+        yield json.dumps({
+            "type": "summary",
+            "pages": n_pages,
+            "total_matches": total,
+            "counts": counts,
+            "elapsed_ms": round(elapsed, 2),
+        }, ensure_ascii=False) + "\n"
+
+    # 스트림이 시작되기 전에 연결이 끊겨도 spool 파일이 남지 않도록 background에서도 지운다
+    return StreamingResponse(
+        _ndjson(), media_type="application/x-ndjson", background=BackgroundTask(remove_quietly, tmp),
+    )
+
 @router.post("/redactions/apply", response_class=Response)
 async def apply(
-    file: UploadFile = File(..., description="PDF 파일"),
+    request: Request,
+    file: Optional[UploadFile] = File(None, description="PDF 파일 (doc_id를 쓰면 생략)"),
+    doc_id: Optional[str] = Form(None, description="문서 세션 ID (/documents 업로드 결과)"),
     req: Optional[str] = Form(None, description='기존 형식: {"boxes":[...], "fill":"black|white"}'),
     boxes_json: Optional[str] = Form(None, description="List[Box] 또는 {'boxes':[...]}"),
     fill: Optional[str] = Form("black", description="'black' 또는 'white'"),
@@ -198,71 +582,293 @@ async def apply(
         "card",
         description="서버가 추가 감지해 반드시 포함시킬 패턴(콤마구분). 기본: 'card'",
     ),
+    merge_overlaps: bool = Form(
+        False,
+        description="true면 중복 제거 후 같은 줄에서 겹치거나 붙은 박스를 하나로 합쳐 적용",
+    ),
+    ocr: bool = Form(False, description="true면 텍스트 레이어가 없는(스캔) 페이지를 OCR로 탐지"),
+    save_profile: Optional[str] = Form(None, description="저장 프로파일: standard | compact | strip (없으면 서버 기본값, 보통 standard)"),
+    pages: Optional[str] = Form(
+        None, description="처리할 페이지(1부터). 예: '1-10,37'. 나머지 페이지는 그대로 둔다 (없으면 전체)",
+    ),
 ):
-    _ensure_pdf(file)
-    pdf = _read_pdf(file)
+    """
+    레닥션된 PDF. 저장 프로파일과 단계별 시간/크기는 X-Redaction-* 응답 헤더로 알려준다.
+    업로드와 결과 모두 임시 파일에 두고 결과는 파일에서 스트리밍한다 (응답 후 삭제).
+    """
+    src_kw = _with_ocr({}, ocr)
+    src_kw["pages"] = parse_pages(pages)
+    traced = _trace_requested(request)
     t0 = time.perf_counter()
+    pdf, doc_kw, tmp = await _pdf_source(file, doc_id)
+    src_kw.update(doc_kw)
+    if traced:
+        src_kw = _traced_kw(src_kw)
+    out_path = None
+    trace_headers = {}
+    try:
+        boxes_req, patterns, opts = _apply_options(
+            pdf, req, boxes_json, fill, patterns_json, mode,
+            exclude_patterns, include_patterns, ensure_patterns, merge_overlaps, save_profile,
+        )
+        out_path = temp_path()
 
-    boxes_req, fill_override = _boxes_from_req(req)
-    if fill_override:
-        fill = fill_override or fill
-    if boxes_json is not None:
-        boxes_req = _parse_boxes_json(boxes_json)
+        # 감지 + 레닥션은 문서 처리 풀에서 실행 (이벤트 루프 블로킹 방지)
+        def _work() -> dict:
+            _, _, save_stats = _redact_pdf(pdf, boxes_req, patterns, src_kw=src_kw, out_path=out_path, **opts)
+            return save_stats
 
-    patterns = _parse_patterns_json(patterns_json)
-    excl = _split_csv_set(exclude_patterns)
-    incl = _split_csv_set(include_patterns)
-    ensure = _split_csv_set(ensure_patterns) or set()
+        if traced:
+            save_stats, trace = await doc_executor.run(tracing.run_traced, _work)
+            trace_headers["X-Redaction-Trace-Id"] = tracing.save_trace(
+                trace, endpoint="apply", bytes_in=save_stats["bytes_in"], bytes_out=save_stats["bytes_out"],
+            )
+        else:
+            save_stats = await doc_executor.run(_work)
+    except BaseException:
+        remove_quietly(tmp, out_path)
+        raise
+    elapsed = (time.perf_counter() - t0) * 1000
+    log.debug("APPLY done: bytes_out=%d elapsed=%.2fms", save_stats["bytes_out"], elapsed)
 
-    log.debug(
-        "APPLY request: mode=%s, file_size=%dB, boxes_req=%d, fill=%s, patterns=%s, "
-        "exclude=%s, include=%s, ensure=%s",
-        mode, len(pdf), len(boxes_req), fill,
-        [p.name for p in patterns], sorted(list(excl)), sorted(list(incl)), sorted(list(ensure))
+    return FileResponse(
+        out_path,
+        media_type="application/pdf",
+        background=BackgroundTask(remove_quietly, tmp, out_path),
+        headers={
+            "Content-Disposition": 'attachment; filename=\"redacted.pdf\"',
+            "X-Redaction-Profile": save_stats["profile"],
+            "X-Redaction-Redact-Ms": str(save_stats["redact_ms"]),
+            "X-Redaction-Save-Ms": str(save_stats["save_ms"]),
+            "X-Redaction-Bytes-In": str(save_stats["bytes_in"]),
+            "X-Redaction-Bytes-Out": str(save_stats["bytes_out"]),
+            **trace_headers,
+        },
     )
 
-    if mode == "auto_all":
-        detected = detect_boxes_from_patterns(pdf, patterns)
-        base_boxes = detected
-    elif mode == "auto_merge":
-        detected = detect_boxes_from_patterns(pdf, patterns)
-        base_boxes = (boxes_req or []) + detected
-    else:  # strict
-        base_boxes = boxes_req or []
-        if ensure:
-            ensure_detected = detect_boxes_from_patterns(pdf, patterns)
-            ensured = [b for b in ensure_detected if (b.pattern_name or "") in ensure]
-            log.debug(
-                "APPLY strict: ensure_patterns=%s detected=%d -> merge=%d",
-                sorted(list(ensure)), len(ensure_detected), len(ensured)
+@router.get("/redactions/traces/{trace_id}")
+async def get_trace(trace_id: str, request: Request):
+    """프로파일링 결과 (span 트리 + 상위 함수). 요청할 때와 같은 관리자 토큰이 필요하다."""
+    if not _trace_requested(request):
+        raise HTTPException(status_code=403, detail="프로파일링 권한이 없습니다.")
+    trace = tracing.trace_store.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="트레이스가 없거나 만료되었습니다.")
+    return trace
+
+@router.post("/redactions/batch")
+async def apply_batch(
+    files: Optional[List[UploadFile]] = File(None, description="PDF 파일 여러 개"),
+    archive: Optional[UploadFile] = File(None, description="PDF들을 담은 zip 하나 (files 대신/함께)"),
+    fill: Optional[str] = Form("black", description="'black' 또는 'white'"),
+    patterns_json: Optional[str] = Form(None, description="자동 감지 시 사용할 패턴 JSON(없으면 PRESET)"),
+    mode: Literal["strict", "auto_all", "auto_merge"] = Form(
+        "auto_all",
+        description=(
+            "auto_all/auto_merge: 서버 감지 전체 적용 (배치에는 파일별 boxes가 없으므로 같음) | "
+            "strict: ensure_patterns로 감지한 박스만 적용 (감지가 없는 파일은 박스 0개로 성공 처리)"
+        ),
+    ),
+    exclude_patterns: Optional[str] = Form(None, description="콤마구분. 지정된 패턴은 레닥션에서 제외"),
+    include_patterns: Optional[str] = Form(None, description="콤마구분 allowlist"),
+    ensure_patterns: Optional[str] = Form("card", description="strict에서 감지할 패턴(콤마구분)"),
+    merge_overlaps: bool = Form(False, description="true면 같은 줄에서 겹치거나 붙은 박스를 합쳐 적용"),
+    ocr: bool = Form(False, description="true면 텍스트 레이어가 없는(스캔) 페이지를 OCR로 탐지"),
+    save_profile: Optional[str] = Form(None, description="저장 프로파일: standard | compact | strip (없으면 서버 기본값, 보통 standard)"),
+):
+    """
+    여러 PDF를 공통 설정으로 한 번에 레닥션.
+    파일들은 문서 처리 풀에서 동시에(최대 BATCH_CONCURRENCY개) 처리되고, 끝나는 순서대로
+    zip 스트림에 담긴다. 마지막 항목 report.json에 파일별 박스 수/시간/오류와 요약이 들어간다.
+    실패한 파일은 zip에서 빠지고 보고서에만 남는다.
+    """
+    t0 = time.perf_counter()
+    patterns = _parse_patterns_json(patterns_json)
+    src_kw = _with_ocr({}, ocr)
+    save_profile = _save_profile(save_profile)
+    inputs, spools = await run_in_threadpool(_batch_inputs, files, archive)
+    incl = _split_csv_set(include_patterns)
+    excl = _split_csv_set(exclude_patterns)
+    ensure = _split_csv_set(ensure_patterns) or set()
+    concurrency = max(1, config.BATCH_CONCURRENCY or doc_executor.workers)
+
+    log.debug("BATCH request: files=%d mode=%s patterns=%s concurrency=%d",
+            len(inputs), mode, [p.name for p in patterns], concurrency)
+
+    def _one(read) -> dict:
+        """워커에서 실행: 읽기 → 감지/레닥션. 오류는 보고서 항목으로 돌려준다."""
+        t = time.perf_counter()
+        rec = {"ok": False, "boxes": 0, "bytes_in": 0, "bytes_out": 0, "redact_ms": 0.0, "save_ms": 0.0, "error": None}
+        try:
+            if read is None:
+                raise ValueError(f"파일이 너무 큽니다. (최대 {config.BATCH_MAX_FILE_BYTES}B)")
+            pdf = read()
+            rec["bytes_in"] = len(pdf)
+            if not pdf:
+                raise ValueError("빈 파일입니다.")
+            out, n_boxes, save_stats = _redact_pdf(
+                pdf, [], patterns, mode=mode, incl=incl, excl=excl, ensure=ensure,
+                merge_overlaps=merge_overlaps, fill=fill, src_kw=src_kw, save_profile=save_profile,
+                allow_empty=True,   # strict에서 ensure 감지가 없는 파일도 실패가 아니라 박스 0개
             )
-            if ensured:
-                base_boxes = _dedup_boxes(base_boxes + ensured)
-
-        if not base_boxes:
-            raise HTTPException(status_code=400, detail="boxes가 비어있습니다. (mode=strict)")
-
-    final_boxes, stats = _filter_boxes(base_boxes, include_patterns=incl, exclude_patterns=excl)
-
-    log.debug(
-        "APPLY build: before_total=%d after_total=%d include_mode=%s include=%s exclude=%s "
-        "by_pattern_before=%s by_pattern_after=%s excluded_reasons=%s",
-        stats["total"],
-        len(final_boxes),
-        stats["include_mode"],
-        stats["include_set"],
-        stats["exclude_set"],
-        stats["by_pattern_before"],
-        stats["by_pattern_after"],
-        stats["excluded_reasons"],
+            rec.update(
+                ok=True, boxes=n_boxes, bytes_out=len(out), data=out,
+                redact_ms=save_stats["redact_ms"], save_ms=save_stats["save_ms"],
+            )
+        except HTTPException as e:
+            rec["error"] = str(e.detail)
+        except Exception as e:
+            rec["error"] = f"{type(e).__name__}: {e}"
+        rec["elapsed_ms"] = round((time.perf_counter() - t) * 1000, 2)
+        return rec
+
+    async def _run(idx: int, read) -> Tuple[int, dict]:
+        # 풀이 다른 요청으로 가득 차 있으면 잠시 기다렸다 다시 제출 (배치 전체를 429로 버리지 않음)
+        while True:
+            try:
+                return idx, await doc_executor.run(_one, read)
+            except ExecutorBusy as e:
+                await asyncio.sleep(e.retry_after)
+
+    async def _zip_stream():
+        sink = _ZipSink()
+        zf = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+        used: Set[str] = set()
+        report: List[Optional[dict]] = [None] * len(inputs)
+        pending = iter(enumerate(inputs))
+        running: Set[asyncio.Task] = set()
+
+        def _fill() -> None:
+            while len(running) < concurrency:
+                nxt = next(pending, None)
+                if nxt is None:
+                    return
+                idx, (_, read) = nxt
+                running.add(asyncio.ensure_future(_run(idx, read)))
+
+        try:
+            _fill()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    running.discard(task)
+                    idx, rec = task.result()
+                    name = inputs[idx][0]
+                    data = rec.pop("data", None)
+                    rec = {"name": name, "output": None, **rec}
+                    if data is not None:
+                        rec["output"] = _unique_name(name, used)
+                        zf.writestr(rec["output"], data)
+                    report[idx] = rec
+                    log.debug("BATCH file: %s ok=%s boxes=%d elapsed=%.2fms",
+                            name, rec["ok"], rec["boxes"], rec["elapsed_ms"])
+                _fill()
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+
+            n_ok = sum(1 for r in report if r and r["ok"])
+            summary = {
+                "files": len(report),
+                "ok": n_ok,
+                "failed": len(report) - n_ok,
+                "boxes": sum(r["boxes"] for r in report if r),
+                "save_profile": save_profile or config.SAVE_PROFILE,
+                "bytes_in": sum(r["bytes_in"] for r in report if r),
+                "bytes_out": sum(r["bytes_out"] for r in report if r),
+                "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2),
+            }
+            zf.writestr(BATCH_REPORT_NAME, json.dumps(
+                {"summary": summary, "files": report}, ensure_ascii=False, indent=2))
+            zf.close()
+            log.debug("BATCH done: %s", summary)
+            yield sink.drain()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.wait(running)
+            _close_all(spools)
+
+    return StreamingResponse(
+        _zip_stream(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="redacted.zip"'},
     )
 
-    out = apply_redaction(pdf, final_boxes, fill=fill or "black")
-    elapsed = (time.perf_counter() - t0) * 1000
-    log.debug("APPLY done: bytes_out=%d elapsed=%.2fms", len(out), elapsed)
-
+# ---------------------------
+# 비동기 작업 (제출 → 상태 조회 → 결과 받기)
+# ---------------------------
+def _job_or_404(job_id: str) -> Job:
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업이 없거나 결과 보관 기간이 지났습니다.")
+    return job
+
+@router.post("/redactions/jobs", status_code=202)
+async def submit_job(
+    file: Optional[UploadFile] = File(None, description="PDF 파일 (doc_id를 쓰면 생략)"),
+    doc_id: Optional[str] = Form(None, description="문서 세션 ID (/documents 업로드 결과)"),
+    req: Optional[str] = Form(None, description='기존 형식: {"boxes":[...], "fill":"black|white"}'),
+    boxes_json: Optional[str] = Form(None, description="List[Box] 또는 {'boxes':[...]}"),
+    fill: Optional[str] = Form("black", description="'black' 또는 'white'"),
+    patterns_json: Optional[str] = Form(None, description="자동 감지 시 사용할 패턴 JSON(없으면 PRESET)"),
+    mode: Literal["strict", "auto_all", "auto_merge"] = Form("strict", description="/redactions/apply와 같음"),
+    exclude_patterns: Optional[str] = Form(None, description="콤마구분. 레닥션에서 제외할 패턴"),
+    include_patterns: Optional[str] = Form(None, description="콤마구분 allowlist"),
+    ensure_patterns: Optional[str] = Form("card", description="서버가 추가 감지해 반드시 포함시킬 패턴"),
+    merge_overlaps: bool = Form(False, description="true면 겹치거나 붙은 박스를 합쳐 적용"),
+    ocr: bool = Form(False, description="true면 텍스트 레이어가 없는(스캔) 페이지를 OCR로 탐지"),
+    save_profile: Optional[str] = Form(None, description="저장 프로파일: standard | compact | strip (없으면 서버 기본값, 보통 standard)"),
+    pages: Optional[str] = Form(None, description="처리할 페이지(1부터). 예: '1-10,37' (없으면 전체)"),
+):
+    """
+    /redactions/apply와 같은 입력으로 작업을 제출하고 바로 202 + 작업 정보를 돌려준다.
+    진행률은 GET /redactions/jobs/{job_id}, 결과 PDF는 .../result 로 받는다.
+    작업 대기열이 가득 차면 429.
+    """
+    src_kw = _with_ocr({}, ocr)
+    src_kw["pages"] = parse_pages(pages)
+    pdf, doc_kw, tmp = await _pdf_source(file, doc_id)
+    src_kw.update(doc_kw)
+    try:
+        boxes_req, patterns, opts = _apply_options(
+            pdf, req, boxes_json, fill, patterns_json, mode,
+            exclude_patterns, include_patterns, ensure_patterns, merge_overlaps, save_profile,
+        )
+        # 작업은 요청 1건보다 오래 걸릴 수 있으므로 탐지 시간 한도도 작업 한도를 따른다
+        src_kw["budget"] = config.JOB_TIMEOUT_SECONDS
+        filename = (file.filename if file is not None else None) or "document.pdf"
+        # 업로드 spool 파일은 작업이 끝나거나(취소 포함) 제출이 실패하면 지운다
+        job = job_store.submit(
+            _redact_pdf, pdf, boxes_req, patterns, src_kw=src_kw, filename=filename,
+            cleanup=partial(remove_quietly, tmp), **opts,
+        )
+    except BaseException:
+        remove_quietly(tmp)
+        raise
+    log.debug("JOB submitted: id=%s file_size=%dB mode=%s", job.job_id, pdf_size(pdf), mode)
+    return job.info()
+
+@router.get("/redactions/jobs/{job_id}")
+async def job_status(job_id: str):
+    return _job_or_404(job_id).info()
+
+@router.get("/redactions/jobs/{job_id}/result", response_class=Response)
+async def job_result(job_id: str):
+    job = _job_or_404(job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"결과가 없습니다. (status={job.status})")
     return Response(
-        content=out,
+        content=job.result,
         media_type="application/pdf",
-        headers={"Content-Disposition": 'attachment; filename=\"redacted.pdf\"'},
+        headers={"Content-Disposition": 'attachment; filename="redacted.pdf"'},
     )
+
+@router.delete("/redactions/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """대기/실행 중이면 취소(실행 중이면 다음 페이지 경계에서 멈춤), 끝난 작업이면 결과를 지운다."""
+    job = job_store.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업이 없거나 결과 보관 기간이 지났습니다.")
+    return job.info()
@@ -1,19 +1,30 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import json
+import time
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 
 from ..redac_rules import RULES
-from ..normalize import normalize_text
+from ..normalize import LineOffsetMap, normalize_text
 from ..extract_text import extract_text_from_file
+from ..executor import ExecutorBusy, doc_executor
+from ..page_ranges import PageRangeError, parse_pages
+from ..uploads import UploadTooLarge, spool_file, spool_stream
+from ..sessions import get_session
+from ..text_match import match_hits, make_context, iter_match_windows
 
 router = APIRouter(tags=["text"])
 
 # ---------- 데이터 모델 ----------
 class MatchRequest(BaseModel):
-    text: str
+    text: str = ""
+    doc_id: Optional[str] = None              # text 대신 문서 세션의 추출 텍스트 사용
     rules: Optional[List[str]] = None
     options: Optional[Dict[str, Any]] = None  # 예: {"rrn_checksum": true, "luhn": true }
     normalize: bool = True                    # 서버 측 정규화 사용 여부(기본 사용)
+    include_context: bool = True              # false면 context를 만들지 않음("")
 
 class MatchItem(BaseModel):
     rule: str
@@ -22,6 +33,8 @@ class MatchItem(BaseModel):
     index: int
     end: int
     context: str
+    orig_index: int                           # 정규화 전 원문 기준 위치
+    orig_end: int
 
 class MatchResponse(BaseModel):
     counts: Dict[str, int]
@@ -39,78 +52,131 @@ async def list_rules():
     # 존재하는 RULES 중 DEFAULT_ORDER 순서대로 반환
     return [r for r in DEFAULT_ORDER if r in RULES]
 
+def _ordered_rules(rules: Optional[List[str]]) -> List[str]:
+    selected = rules or list(RULES.keys())
+    selected = [r for r in selected if r in RULES]
+    return [r for r in DEFAULT_ORDER if r in selected]
+
+def _session_or_404(doc_id: str):
+    sess = get_session(doc_id)
+    if sess is None:
+        raise HTTPException(status_code=404, detail="문서 세션이 없거나 만료되었습니다.")
+    return sess
+
 @router.post("/text/extract")
-async def extract(file: UploadFile = File(...)):
+async def extract(
+    file: Optional[UploadFile] = File(None),
+    doc_id: Optional[str] = Form(None),
+    pages: Optional[str] = Form(None, description="추출할 PDF 페이지(1부터). 예: '1-10,37' (없으면 전체)"),
+):
+    page_ranges = parse_pages(pages)
+    if doc_id:
+        return _session_or_404(doc_id).extract_result(page_ranges)
+    if file is None:
+        raise HTTPException(status_code=400, detail="file 또는 doc_id가 필요합니다.")
     try:
-        return await extract_text_from_file(file)
+        return await extract_text_from_file(file, page_ranges)
+    except (ExecutorBusy, PageRangeError, UploadTooLarge):
+        raise
     except Exception as e:
         raise HTTPException(status_code=415, detail=str(e))
 
-def _ctx(text: str, start: int, end: int, window: int = 25) -> str:
-    return text[max(0, start - window): start] + "【" + text[start:end] + "】" + text[end: end + window]
-
-def _mask_ranges_same_length(s: str, spans, mask_char: str = "R") -> str:
-    if not spans: return s
-    arr = list(s)
-    L = len(arr)
-    for st, ed in spans:
-        st = max(0, min(st, L)); ed = max(0, min(ed, L))
-        for i in range(st, ed):
-            if arr[i].isdigit() or arr[i] in "- /":
-                arr[i] = mask_char
-    return "".join(arr)
-
 @router.post("/text/match", response_model=MatchResponse)
 async def match(req: MatchRequest):
     text_in = req.text or ""
+    if req.doc_id and not text_in:
+        text_in = _session_or_404(req.doc_id).extract_result()["full_text"]
     original_text = normalize_text(text_in) if req.normalize else text_in
-    working_text = original_text
 
-    selected = req.rules or list(RULES.keys())
-    selected = [r for r in selected if r in RULES]
-    ordered_rules = [r for r in DEFAULT_ORDER if r in selected]
-
-    results: List[Dict[str, Any]] = []
-
-    # 주민번호 먼저 탐지 후 마스킹
-    rrn_spans = []
-    if "rrn" in ordered_rules:
-        regex = RULES["rrn"]["regex"]
-        validator = RULES["rrn"]["validator"]
-        for m in regex.finditer(working_text):
-            value = m.group(); start, end = m.start(), m.end()
-            valid = False
-            try:
-                valid = bool(validator(value, req.options))
-            except Exception:
-                valid = False
-            results.append({
-                "rule": "rrn", "value": value, "valid": valid,
-                "index": start, "end": end, "context": _ctx(original_text, start, end)
-            })
-            rrn_spans.append((start, end))
-        working_text = _mask_ranges_same_length(working_text, rrn_spans, "R")
-
-    # 나머지 규칙 탐지
-    for rid in ordered_rules:
-        if rid == "rrn": continue
-        regex = RULES[rid]["regex"]
-        validator = RULES[rid]["validator"]
-        for m in regex.finditer(working_text):
-            value = m.group(); start, end = m.start(), m.end()
-            valid = False
-            try:
-                valid = bool(validator(value, req.options))
-            except Exception:
-                valid = False
-            results.append({
-                "rule": rid, "value": value, "valid": valid,
-                "index": start, "end": end, "context": _ctx(original_text, start, end)
-            }) 
+    ordered_rules = _ordered_rules(req.rules)
+    hits = match_hits(original_text, ordered_rules, req.options)
+    # 원문 위치 변환표는 매치가 있을 때만, 매치가 든 줄만 만든다
+    omap = LineOffsetMap(text_in, original_text) if req.normalize and hits else None
 
     # 카운트 집계
     counts = {rid: 0 for rid in ordered_rules}
-    for r in results:
-        counts[r["rule"]] = counts.get(r["rule"], 0) + 1
+    for rid, *_ in hits:
+        counts[rid] = counts.get(rid, 0) + 1
+
+    with_ctx = req.include_context
+    items = [
+        {
+            "rule": rid, "value": value, "valid": valid, "index": start, "end": end,
+            "context": make_context(original_text, start, end) if with_ctx else "",
+            "orig_index": omap.start(start) if omap else start,
+            "orig_end": omap.end(end) if omap else end,
+        }
+        for rid, value, valid, start, end in hits
+    ]
+    return {"counts": counts, "items": items}
+
+@router.post("/text/match/stream")
+async def match_stream(
+    request: Request,
+    file: Optional[UploadFile] = File(None, description="텍스트 파일 (없으면 요청 본문 자체를 UTF-8 텍스트로 읽음)"),
+    rules: Optional[str] = Query(None, description="쉼표로 구분한 규칙 목록 (기본: 전체)"),
+    options: Optional[str] = Query(None, description='JSON 옵션. 예: {"luhn": true}'),
+    normalize: bool = Query(True),
+    include_context: bool = Query(True),
+):
+    """
+    대용량 텍스트용 창 단위 NDJSON 스트리밍 탐지.
+    매치마다 {"type":"match", ...MatchItem} 한 줄(위치는 입력 전체 기준, 창 순서로 나옴),
+    마지막에 {"type":"summary", counts, total_matches, chars, windows, hard_cuts, elapsed_ms} 한 줄.
+    중간 오류는 {"type":"error", detail} 한 줄로 끝난다.
+    본문(chunked 포함)은 메모리 한도를 넘으면 디스크로 받아 두고, 탐지는 창 크기만큼의 메모리로 돈다.
+    """
+    t0 = time.perf_counter()
+    try:
+        opts = json.loads(options) if options else None
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"options JSON 파싱 실패: {e}")
+    if opts is not None and not isinstance(opts, dict):
+        raise HTTPException(status_code=400, detail="options는 JSON 객체여야 합니다.")
+    ordered_rules = _ordered_rules([r.strip() for r in rules.split(",")] if rules else None)
+
+    # 응답 스트림이 끝날 때까지 읽을 수 있도록 요청과 분리된 임시 파일로 받아 둔다
+    if file is not None:
+        src = await run_in_threadpool(spool_file, file.file)
+    elif request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=400, detail="file 필드가 필요합니다.")
+    else:
+        src = await spool_stream(request.stream())
 
-    return {"counts": counts, "items": results}
+    try:
+        windows = doc_executor.stream(
+            iter_match_windows, src.read, ordered_rules, opts,
+            normalize=normalize, include_context=include_context,
+        )
+    except ExecutorBusy:
+        src.close()
+        raise
+
+    async def _ndjson():
+        counts = {rid: 0 for rid in ordered_rules}
+        n_windows = n_chars = hard_cuts = 0
+        try:
+            async for items, chars, hard in windows:
+                n_windows += 1
+                n_chars += chars
+                hard_cuts += hard
+                for it in items:
+                    counts[it["rule"]] += 1
+                    yield json.dumps({"type": "match", **it}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+            return
+        finally:
+            src.close()
+
+        yield json.dumps({
+            "type": "summary",
+            "counts": counts,
+            "total_matches": sum(counts.values()),
+            "chars": n_chars,
+            "windows": n_windows,
+            "hard_cuts": hard_cuts,
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2),
+        }, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
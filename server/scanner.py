@@ -0,0 +1,95 @@
+# scanner.py
+"""
+여러 규칙을 한 번의 정규식 패스로 스캔하는 멀티 패턴 매처.
+
+각 규칙을 lookahead 캡처 그룹으로 감싼 결합 패턴을 만들어
+규칙 중 하나라도 매치되는 위치에서만 멈추고, 그 위치에서 각 규칙의 매치 구간을 한 번에 얻는다.
+규칙별로 마지막 매치 끝 위치를 따로 관리하므로 결과는 규칙마다 finditer를 돌린 것과 같다
+(규칙 간 겹침 허용, 같은 규칙 안에서는 겹치지 않음). 길이 0 매치는 버린다.
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Tuple
+
+from .redac_rules import RULES
+
+# (name, regex, flags)
+RuleSpec = Tuple[str, str, int]
+Span = Tuple[int, int]
+
+_INLINE_FLAGS = (
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+# 결합하면 의미가 바뀌는 문법 (번호 역참조, 전역 인라인 플래그)
+_UNSAFE_TO_COMBINE = re.compile(r"\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)")
+
+
+def _scoped(regex: str, flags: int) -> str:
+    letters = "".join(ch for flag, ch in _INLINE_FLAGS if flags & flag)
+    if letters:
+        return f"(?{letters}:{regex})"
+    return f"(?:{regex})"
+
+
+class RuleScanner:
+    """
+    규칙 목록을 받아 텍스트를 한 번에 스캔한다.
+    scan() 결과는 규칙 순서대로 (start, end) 목록이며, 각 목록은 위치순이다.
+    """
+
+    def __init__(self, rules: Sequence[RuleSpec]):
+        self.names: List[str] = [name for name, _, _ in rules]
+        self.compiled: List[re.Pattern] = [re.compile(regex, flags) for _, regex, flags in rules]
+        self._combined = None
+        self._group_idx: List[int] = []
+
+        if len(rules) > 1 and not any(_UNSAFE_TO_COMBINE.search(regex) for _, regex, _ in rules):
+            parts = [_scoped(regex, flags) for _, regex, flags in rules]
+            probes = "".join(f"(?:(?=(?P<_r{i}>{p}))|)" for i, p in enumerate(parts))
+            try:
+                self._combined = re.compile(f"(?={'|'.join(parts)}){probes}")
+                self._group_idx = [self._combined.groupindex[f"_r{i}"] for i in range(len(parts))]
+            except re.error:
+                self._combined = None
+
+    @property
+    def single_pass(self) -> bool:
+        return self._combined is not None
+
+    def scan(self, text: str) -> List[List[Span]]:
+        if self._combined is None:
+            return [
+                [m.span() for m in comp.finditer(text) if m.end() > m.start()]
+                for comp in self.compiled
+            ]
+
+        hits: List[List[Span]] = [[] for _ in self.names]
+        last_end = [0] * len(self.names)
+        group_idx = self._group_idx
+        for m in self._combined.finditer(text):
+            for i, gi in enumerate(group_idx):
+                s, e = m.span(gi)
+                if s < 0 or e == s or s < last_end[i]:
+                    continue
+                hits[i].append((s, e))
+                last_end[i] = e
+        return hits
+
+
+@lru_cache(maxsize=64)
+def get_scanner(rules: Tuple[RuleSpec, ...]) -> RuleScanner:
+    """규칙 집합별로 결합 스캐너를 캐시한다."""
+    return RuleScanner(rules)
+
+
+def scanner_for_rules(rule_ids: Iterable[str]) -> RuleScanner:
+    """redac_rules.RULES 이름 목록으로 스캐너 생성 (캐시 사용)."""
+    specs = tuple(
+        (rid, RULES[rid]["regex"].pattern, RULES[rid]["regex"].flags)
+        for rid in rule_ids
+        if rid in RULES
+    )
+    return get_scanner(specs)
@@ -0,0 +1,80 @@
+# sessions.py
+"""
+문서 세션: PDF를 한 번 업로드해 두고 doc_id로 extract/match/detect/apply를 호출한다.
+업로드 시 바이트, 내용 해시, 페이지별 단어(PageLayout)와 텍스트를 한 번만 만들어 보관한다.
+TTL과 전체 메모리 한도(TTLCache weight)로 제한한다.
+"""
+import time
+import uuid
+from typing import List, Optional
+
+import fitz
+
+from . import config
+from .cache import TTLCache
+from .extract_text import build_extract_result
+from .page_ranges import PageRanges, resolve_pages
+from .pdf_redaction import PageLayout, pdf_digest
+
+# 단어 튜플 1개당 대략적인 메모리 (튜플 + float 4개 + int 3개)
+_WORD_OVERHEAD = 200
+
+
+class DocumentSession:
+    __slots__ = ("doc_id", "data", "filename", "digest", "layouts", "texts", "created_at", "nbytes")
+
+    def __init__(self, doc_id: str, data: bytes, filename: str, layouts: List[PageLayout], texts: List[str]):
+        self.doc_id = doc_id
+        self.data = data
+        self.filename = filename
+        self.digest = pdf_digest(data)
+        self.layouts = layouts
+        self.texts = texts
+        self.created_at = time.time()
+        n_words = sum(len(l.words) for l in layouts)
+        n_chars = sum(len(t) for t in texts) + sum(len(t) for l in layouts for t in l.tokens)
+        self.nbytes = len(data) + n_chars * 2 + n_words * _WORD_OVERHEAD
+
+    @property
+    def page_count(self) -> int:
+        return len(self.layouts)
+
+    def extract_result(self, pages: Optional[PageRanges] = None) -> dict:
+        if pages is None:
+            return build_extract_result(self.texts)
+        pnos = resolve_pages(pages, len(self.texts))
+        return build_extract_result([self.texts[p] for p in pnos], [p + 1 for p in pnos])
+
+    def info(self) -> dict:
+        return {
+            "doc_id": self.doc_id,
+            "filename": self.filename,
+            "pages": self.page_count,
+            "size": len(self.data),
+            "sha256": self.digest,
+            "memory_bytes": self.nbytes,
+            "expires_in": max(0, int(self.created_at + config.SESSION_TTL_SECONDS - time.time())),
+        }
+
+
+def build_session(data: bytes, filename: str = "") -> DocumentSession:
+    """PDF를 한 번 열어 페이지별 단어/텍스트를 추출해 세션 생성 (문서 처리 풀에서 호출)."""
+    layouts: List[PageLayout] = []
+    texts: List[str] = []
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for page in doc:
+            layouts.append(PageLayout.from_page(page))
+            texts.append(page.get_text("text") or "")
+    return DocumentSession(uuid.uuid4().hex, data, filename, layouts, texts)
+
+
+session_store = TTLCache(
+    config.SESSION_MAX_DOCS,
+    config.SESSION_TTL_SECONDS,
+    max_weight=config.SESSION_MAX_BYTES,
+    weigher=lambda s: s.nbytes,
+)
+
+
+def get_session(doc_id: str) -> Optional[DocumentSession]:
+    return session_store.get(doc_id)
@@ -0,0 +1,266 @@
+# text_match.py
+"""
+텍스트 개인정보 탐지 (/text/match 본체).
+
+- match_hits: 한 덩어리 텍스트에서 규칙별 매치를 찾는다. 주민번호를 먼저 찾고, 나머지 규칙은
+  주민번호 구간을 가린 텍스트에서 찾은 것과 같은 결과를 낸다.
+- iter_match_windows: 아주 큰 입력을 창 단위로 잘라 탐지한다(메모리 상한 고정).
+"""
+from bisect import bisect_left
+from codecs import getincrementaldecoder
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import config
+from .redac_rules import RULES
+from .normalize import normalize_text, normalize_with_map, _starts_cluster
+from .scanner import scanner_for_rules
+from .batch_validators import validate_many
+from .regex_guard import can_match_char
+
+# (rule, value, valid, start, end)
+Hit = Tuple[str, str, bool, int, int]
+
+CONTEXT_WINDOW = 25
+
+def make_context(text: str, start: int, end: int, window: int = CONTEXT_WINDOW) -> str:
+    return text[max(0, start - window): start] + "【" + text[start:end] + "】" + text[end: end + window]
+
+def _mask_ranges_same_length(s: str, spans, mask_char: str = "R") -> str:
+    """spans 안의 숫자/구분자를 mask_char로 바꾼 같은 길이 문자열 (구간 사이는 슬라이스로 이어붙임)."""
+    if not spans: return s
+    L = len(s)
+    parts = []
+    prev = 0
+    for st, ed in spans:
+        st = max(prev, min(st, L)); ed = max(st, min(ed, L))
+        parts.append(s[prev:st])
+        parts.append("".join(mask_char if (c.isdigit() or c in "- /") else c for c in s[st:ed]))
+        prev = ed
+    parts.append(s[prev:])
+    return "".join(parts)
+
+class _SpanSet:
+    """정렬·비중첩 구간 집합. overlaps()는 bisect로 O(log n)."""
+    def __init__(self, spans):
+        self.spans = spans
+        self._starts = [st for st, _ in spans]
+
+    def __bool__(self):
+        return bool(self.spans)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        i = bisect_left(self._starts, end) - 1   # start < end 인 마지막 구간
+        return i >= 0 and self.spans[i][1] > start
+
+def _scan_excluding(text: str, rules: List[str], excl: _SpanSet, mask_char: str = "R"):
+    """
+    excl 구간을 mask_char로 가린 텍스트에서 rules를 스캔한 것과 같은 결과를,
+    가린 텍스트를 가능한 한 만들지 않고 얻는다. 반환: {rule: [(start, end), ...]}
+    - mask_char를 소비할 수 없는 규칙: 원문에서 결합 스캔. 매치가 excl과 겹치면
+      그 지점부터만 가린 텍스트로 다시 스캔한다(드묾).
+    - mask_char를 소비할 수 있는 규칙(email/passport 등): excl이 있으면 가린 텍스트에서 스캔.
+    가린 텍스트는 필요할 때 한 번만 만든다.
+    """
+    masked = None
+    def _masked():
+        nonlocal masked
+        if masked is None:
+            masked = _mask_ranges_same_length(text, excl.spans, mask_char)
+        return masked
+
+    out = {}
+    safe, unsafe = [], []
+    for rid in rules:
+        rx = RULES[rid]["regex"]
+        (unsafe if excl and can_match_char(rx.pattern, rx.flags, mask_char) else safe).append(rid)
+
+    scanner = scanner_for_rules(safe)
+    for rid, spans in zip(scanner.names, scanner.scan(text)):
+        for k, (st, ed) in enumerate(spans):
+            if excl.overlaps(st, ed):
+                pos = spans[k - 1][1] if k else 0
+                rx = RULES[rid]["regex"]
+                spans = spans[:k] + [m.span() for m in rx.finditer(_masked(), pos) if m.end() > m.start()]
+                break
+        out[rid] = spans
+
+    if unsafe:
+        scanner = scanner_for_rules(unsafe)
+        for rid, spans in zip(scanner.names, scanner.scan(_masked())):
+            out[rid] = spans
+    return out, masked
+
+def match_hits(text: str, ordered_rules: List[str], options: Optional[Dict[str, Any]] = None) -> List[Hit]:
+    """ordered_rules 순서대로 매치 목록. 'rrn'이 있으면 먼저 찾고 나머지 규칙에서 그 구간을 가린다."""
+    hits: List[Hit] = []
+
+    rrn_spans = []
+    if "rrn" in ordered_rules:
+        validator = RULES["rrn"]["validator"]
+        rrn_spans = scanner_for_rules(["rrn"]).scan(text)[0]
+        values = [text[start:end] for start, end in rrn_spans]
+        valids = validate_many("rrn", validator, values, options)
+        for (start, end), value, valid in zip(rrn_spans, values, valids):
+            hits.append(("rrn", value, valid, start, end))
+
+    rest = [rid for rid in ordered_rules if rid != "rrn"]
+    by_rule, masked = _scan_excluding(text, rest, _SpanSet(rrn_spans))
+    # 가린 문자를 포함한 매치는 가린 값 그대로 보고 (기존 동작). 그 밖의 구간은 두 텍스트가 같다.
+    src = masked if masked is not None else text
+    for rid in rest:
+        spans = by_rule[rid]
+        validator = RULES[rid]["validator"]
+        values = [src[start:end] for start, end in spans]
+        valids = validate_many(rid, validator, values, options)
+        for (start, end), value, valid in zip(spans, values, valids):
+            hits.append((rid, value, valid, start, end))
+    return hits
+
+# ---------- 창 단위 스트리밍 탐지 ----------
+_INVISIBLE = frozenset("\u200B\u200C\u200D\u2060\ufeff")
+
+def _splits_cleanly(a: str, b: str) -> bool:
+    """a|b 사이에서 나눠 정규화해도 이어 붙인 결과가 같은가 (공백/폭 없는 문자/결합·조합 문자 경계가 아님)."""
+    if a.isascii() and b.isascii():
+        return not a.isspace() and not b.isspace()
+    if a.isspace() or b.isspace() or a in _INVISIBLE or b in _INVISIBLE or not _starts_cluster(b):
+        return False
+    return normalize_text(a + b) == normalize_text(a) + normalize_text(b)
+
+def _safe_cut(buf: str, pos: int, lo: int) -> Optional[int]:
+    """pos 이하 lo 초과에서 정규화를 나눠 해도 결과가 같은 가장 뒤 자리. 없으면 None."""
+    for i in range(min(pos, len(buf) - 1), lo, -1):
+        if _splits_cleanly(buf[i - 1], buf[i]):
+            return i
+    return None
+
+def _hard_cut(buf: str, look: int, norm: str, omap, hits: List[Hit], pos: int, lo: int,
+              normalize: bool) -> Optional[Tuple[int, int]]:
+    """
+    개행 없는 긴 줄을 자를 자리 (원문 위치, 정규화 위치).
+    어떤 매치도 가로지르지 않는 안전한 자리를 pos에서 앞으로 lo까지 찾아간다. 그 자리에서 새로 스캔하면
+    전체를 한 번에 스캔한 것과 같은 상태에서 이어진다. 못 찾으면 None (호출 쪽이 창을 늘려 다시 스캔).
+    """
+    spans = sorted((start, end) for *_, start, end in hits)
+    starts = [st for st, _ in spans]
+    reach, m = [], 0          # reach[i] = spans[:i+1] 중 가장 먼 끝
+    for _, end in spans:
+        m = max(m, end)
+        reach.append(m)
+    while True:
+        cut = _safe_cut(buf, pos, lo)
+        if cut is None:
+            return None
+        ncut = len(norm) - len(normalize_text(buf[cut:look])) if normalize else cut
+        i = bisect_left(starts, ncut) - 1
+        if i < 0 or reach[i] <= ncut:
+            return cut, ncut
+        j = bisect_left(reach, ncut + 1)           # ncut을 넘어가는 첫 매치
+        back = omap.start(starts[j]) if omap else starts[j]
+        if back <= lo:
+            return None
+        pos = min(back, cut - 1)
+
+def iter_match_windows(
+    read: Callable[[int], bytes],
+    ordered_rules: List[str],
+    options: Optional[Dict[str, Any]] = None,
+    normalize: bool = True,
+    include_context: bool = True,
+    window: int = config.TEXT_STREAM_WINDOW_CHARS,
+    overlap: int = config.TEXT_STREAM_OVERLAP_CHARS,
+    chunk_bytes: int = 64 * 1024,
+) -> Iterator[Tuple[List[Dict[str, Any]], int, bool]]:
+    """
+    read(n) → bytes 로 들어오는 UTF-8 텍스트를 약 window 글자씩 잘라 탐지하고
+    창마다 (items, 원문 글자 수, 강제 절단 여부)를 yield 한다. items는 MatchItem 형식(위치는 전체 기준).
+
+    - 어떤 규칙도 개행을 소비할 수 없으면 창을 개행 바로 뒤에서 자른다. 매치도 정규화도 개행을
+      넘지 않으므로 전체를 한 번에 처리한 결과와 같다(항목 순서만 창 단위).
+    - 개행 없이 긴 줄은 window + overlap 까지 스캔한 뒤, 끝에서 overlap 이상 앞쪽의
+      매치를 가로지르지 않고 정규화를 나눠 해도 되는 자리에서 자른다. window/2 까지 그런 자리가 없으면
+      (매치가 이어져 있거나 공백·결합 문자만 있는 구간) 창을 window씩 늘려 다시 스캔한다. 매치 도중에서는
+      자르지 않으므로, 창 끝에서 잘려 스캔된 매치(overlap보다 긴 매치)가 아니면 결과는 전체 처리와 같다.
+    메모리는 보통 (window + overlap) 글자 수준이고, 자를 자리가 없는 구간 길이만큼만 늘어난다.
+    """
+    decoder = getincrementaldecoder("utf-8")(errors="replace")
+    newline_safe = not any(
+        can_match_char(RULES[r]["regex"].pattern, RULES[r]["regex"].flags, "\n") for r in ordered_rules
+    )
+    want = window + overlap
+
+    buf = ""
+    eof = False
+    base_orig = 0            # buf[0]의 원문 위치
+    base_norm = 0            # buf[0]의 정규화 텍스트 위치
+    prev_tail = ""           # 앞 창의 끝부분(context용, 정규화 텍스트)
+
+    while True:
+        grow = 0                 # 자를 자리가 없으면 창을 window씩 늘려 다시 스캔
+        while True:
+            limit = want + grow
+            parts = [buf]
+            size = len(buf)
+            while size < limit + 4 * CONTEXT_WINDOW and not eof:  # 뒤쪽 context용 여유분까지
+                data = read(chunk_bytes)
+                eof = not data
+                piece = decoder.decode(data, final=eof)
+                parts.append(piece)
+                size += len(piece)
+            buf = "".join(parts)
+            if not buf:
+                return
+
+            hard = False
+            if eof and len(buf) <= limit:
+                cut = look = len(buf)
+            else:
+                nl = buf.rfind("\n", 0, limit) if newline_safe else -1
+                if nl >= 0:
+                    cut = look = nl + 1
+                else:
+                    hard = True
+                    look = _safe_cut(buf, limit, limit - overlap) or limit
+
+            if normalize:
+                norm, omap = normalize_with_map(buf[:look])
+            else:
+                norm, omap = buf[:look], None
+            hits = match_hits(norm, ordered_rules, options)
+            if not hard:
+                ncut = len(norm)
+                break
+            lo = max(1, window // 2)
+            found = _hard_cut(buf, look, norm, omap, hits, max(look - overlap, lo + 1), lo, normalize)
+            if found is not None:
+                cut, ncut = found
+                break
+            grow += window
+
+        after = ""
+        if include_context and look == cut and cut < len(buf):
+            nxt = buf[cut: cut + 4 * CONTEXT_WINDOW]
+            after = normalize_text(nxt)[:CONTEXT_WINDOW] if normalize else nxt[:CONTEXT_WINDOW]
+        ctx_text = prev_tail + norm + after if include_context else ""
+        shift = len(prev_tail)
+
+        items: List[Dict[str, Any]] = []
+        for rid, value, valid, start, end in hits:
+            if start >= ncut:
+                continue
+            items.append({
+                "rule": rid, "value": value, "valid": valid,
+                "index": base_norm + start, "end": base_norm + end,
+                "context": make_context(ctx_text, start + shift, end + shift) if include_context else "",
+                "orig_index": base_orig + (omap.start(start) if omap else start),
+                "orig_end": base_orig + (omap.end(end) if omap else end),
+            })
+        yield items, cut, hard
+
+        if include_context:
+            prev_tail = (prev_tail + norm[:ncut])[-CONTEXT_WINDOW:]
+        base_orig += cut
+        base_norm += ncut
+        buf = buf[cut:]
+        if eof and not buf:
+            return
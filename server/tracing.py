@@ -0,0 +1,152 @@
+# tracing.py
+"""
+요청 1건 프로파일링 (관리자 전용, 옵트인).
+
+run_traced(fn, ...)가 호출 스레드에 Tracer를 걸고 cProfile과 함께 fn을 실행한다.
+탐지/레닥션 코드는 span("page", page=3)처럼 구간을 표시하는데, 트레이서가 없으면
+span()은 공유 no-op 컨텍스트를 돌려주므로 일반 요청 비용은 스레드 로컬 조회 한 번이다.
+
+트레이스: span 트리 (request → open / page → words, scan, pattern → validate / redact_page / save)
++ 자체 시간 기준 상위 함수. span 속성에는 페이지 번호, 개수, 내장 규칙 이름(pattern_label)만 넣고
+매치된 값이나 문서 텍스트는 넣지 않는다. 결과는 trace_store(TTL)에 두고 ID로 조회한다.
+"""
+import cProfile
+import os
+import pstats
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import config
+from .cache import TTLCache
+
+_local = threading.local()
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start", "ms", "children")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.ms = 0.0
+        self.children: List["Span"] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"name": self.name, "ms": round(self.ms, 3)}
+        if self.attrs:
+            out["attrs"] = self.attrs
+        if self.children:
+            out["children"] = [c.to_dict() for c in self.children]
+        return out
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "span")
+
+    def __init__(self, tracer: "Tracer", span: Optional[Span]):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Optional[Span]:
+        if self.span is not None:
+            self.tracer._stack.append(self.span)
+        return self.span
+
+    def __exit__(self, *exc) -> None:
+        if self.span is not None:
+            self.span.ms = (time.perf_counter() - self.span.start) * 1000
+            self.tracer._stack.pop()
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL = _NullContext()
+
+
+class Tracer:
+    """span 트리 수집기. max_spans를 넘으면 새 span은 버리고 개수만 센다 (큰 문서 보호)."""
+
+    def __init__(self, max_spans: int):
+        self.root = Span("request", {})
+        self._stack: List[Span] = [self.root]
+        self.max_spans = max_spans
+        self.n_spans = 0
+        self.dropped = 0
+
+    def span(self, name: str, attrs: Dict[str, Any]) -> _SpanContext:
+        if self.n_spans >= self.max_spans:
+            self.dropped += 1
+            return _SpanContext(self, None)
+        sp = Span(name, attrs)
+        self._stack[-1].children.append(sp)
+        self.n_spans += 1
+        return _SpanContext(self, sp)
+
+
+def span(name: str, **attrs: Any):
+    """현재 스레드에 트레이서가 있으면 구간 기록, 없으면 no-op. `with span(...) as sp`의 sp는 Span 또는 None."""
+    tracer = getattr(_local, "tracer", None)
+    if tracer is None:
+        return _NULL
+    return tracer.span(name, attrs)
+
+
+def active() -> bool:
+    return getattr(_local, "tracer", None) is not None
+
+
+def _hot_functions(prof: cProfile.Profile, top: int) -> List[Dict[str, Any]]:
+    """자체 시간(tottime) 상위 함수. 파일은 마지막 두 경로 요소만."""
+    st = pstats.Stats(prof)
+    rows = sorted(st.stats.items(), key=lambda kv: kv[1][2], reverse=True)[:top]
+    out = []
+    for (filename, line, func), (_cc, ncalls, tottime, cumtime, _callers) in rows:
+        where = "/".join(filename.replace(os.sep, "/").split("/")[-2:]) if filename != "~" else "<builtin>"
+        out.append({
+            "function": f"{where}:{line}({func})",
+            "calls": ncalls,
+            "self_ms": round(tottime * 1000, 3),
+            "cum_ms": round(cumtime * 1000, 3),
+        })
+    return out
+
+
+def run_traced(fn: Callable, *args, **kwargs) -> Tuple[Any, Dict[str, Any]]:
+    """fn을 이 스레드에서 트레이서 + cProfile과 함께 실행. 반환: (fn 결과, 트레이스)."""
+    tracer = Tracer(config.TRACE_MAX_SPANS)
+    prof = cProfile.Profile()
+    _local.tracer = tracer
+    prof.enable()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        prof.disable()
+        _local.tracer = None
+        tracer.root.ms = (time.perf_counter() - tracer.root.start) * 1000
+    return result, {
+        "spans": tracer.root.to_dict(),
+        "span_count": tracer.n_spans,
+        "spans_dropped": tracer.dropped,
+        "hot_functions": _hot_functions(prof, config.TRACE_TOP_FUNCTIONS),
+    }
+
+
+# trace_id → 트레이스
+trace_store = TTLCache(config.TRACE_MAX_ENTRIES, config.TRACE_TTL_SECONDS)
+
+
+def save_trace(trace: Dict[str, Any], **meta: Any) -> str:
+    trace_id = uuid.uuid4().hex
+    trace_store.put(trace_id, {"trace_id": trace_id, "created_at": time.time(), **meta, **trace})
+    return trace_id
@@ -0,0 +1,100 @@
+# uploads.py
+"""
+업로드 본문을 요청 수명과 분리해 보관하는 임시 파일(spool).
+
+StreamingResponse 본문이 도는 동안에는 FastAPI가 UploadFile을 이미 닫았을 수 있으므로
+(0.118 미만), 스트리밍 중에 읽을 입력은 여기서 복사해 두고 스트림이 끝날 때 닫는다.
+메모리 한도를 넘으면 디스크로 넘어간다.
+
+PDF 업로드는 spool_to_path로 이름 있는 임시 파일에 받아 PyMuPDF가 경로로 열게 한다.
+입력/출력 모두 파일에 두므로 요청 1건이 메모리에 들고 있는 문서 사본이 없다.
+"""
+import os
+import shutil
+import tempfile
+from typing import AsyncIterator, BinaryIO, Optional
+
+from . import config
+from .metrics import STAGE_SECONDS
+
+_COPY_CHUNK = 1024 * 1024
+
+
+def spool_file(src: BinaryIO, max_memory: int = config.TEXT_STREAM_SPOOL_BYTES) -> BinaryIO:
+    """동기 파일 객체 src의 남은 내용을 새 임시 파일로 복사 (처음으로 되감아 반환)."""
+    dst = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    shutil.copyfileobj(src, dst, _COPY_CHUNK)
+    dst.seek(0)
+    return dst
+
+
+async def spool_stream(chunks: AsyncIterator[bytes], max_memory: int = config.TEXT_STREAM_SPOOL_BYTES) -> BinaryIO:
+    """요청 본문 스트림(chunked 포함)을 임시 파일로 받아 둔다."""
+    dst = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    async for chunk in chunks:
+        dst.write(chunk)
+    dst.seek(0)
+    return dst
+
+
+class UploadTooLarge(Exception):
+    """업로드 파일이 UPLOAD_MAX_BYTES를 넘음."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"업로드 파일이 최대 크기({limit} bytes)를 넘습니다.")
+        self.limit = limit
+
+
+def temp_path(suffix: str = ".pdf") -> str:
+    """UPLOAD_SPOOL_DIR에 빈 임시 파일을 만들고 경로를 반환 (지우는 건 호출자 몫)."""
+    fd, path = tempfile.mkstemp(prefix="redaction-", suffix=suffix, dir=config.UPLOAD_SPOOL_DIR)
+    os.close(fd)
+    return path
+
+
+def spool_to_path(src: BinaryIO, max_bytes: Optional[int] = None, suffix: str = ".pdf") -> str:
+    """
+    동기 파일 객체 src의 남은 내용을 이름 있는 임시 파일로 복사해 경로를 반환.
+    max_bytes(기본 UPLOAD_MAX_BYTES)를 넘으면 파일을 지우고 UploadTooLarge.
+    """
+    limit = config.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    path = temp_path(suffix)
+    size = 0
+    try:
+        with STAGE_SECONDS.time("upload"), open(path, "wb") as dst:
+            for chunk in iter(lambda: src.read(_COPY_CHUNK), b""):
+                size += len(chunk)
+                if limit and size > limit:
+                    raise UploadTooLarge(limit)
+                dst.write(chunk)
+    except BaseException:
+        remove_quietly(path)
+        raise
+    return path
+
+
+def read_limited(src: BinaryIO, max_bytes: Optional[int] = None) -> bytes:
+    """
+    동기 파일 객체 src의 남은 내용을 바이트로 읽는다 (메모리에 둘 입력용, 예: 문서 세션).
+    max_bytes(기본 UPLOAD_MAX_BYTES)를 넘는 순간 더 읽지 않고 UploadTooLarge.
+    """
+    limit = config.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    chunks, size = [], 0
+    with STAGE_SECONDS.time("upload"):
+        for chunk in iter(lambda: src.read(_COPY_CHUNK), b""):
+            size += len(chunk)
+            if limit and size > limit:
+                raise UploadTooLarge(limit)
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def remove_quietly(*paths: Optional[str]) -> None:
+    """임시 파일 삭제 (None/이미 없는 경로는 무시)."""
+    for path in paths:
+        if not path:
+            continue
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -2,8 +2,10 @@ import re
 from datetime import datetime
 
 # 숫자만 추출(공통)
+_NON_DIGIT_RE = re.compile(r"\D")
+
 def _digits(s: str) -> str:
-    return re.sub(r"\D", "", s or "")
+    return _NON_DIGIT_RE.sub("", s or "")
 
 # 날짜 형식 유효성 검증
 def is_valid_date6(digits: str) -> bool:
@@ -139,15 +141,18 @@ def is_valid_phone_mobile(number: str, options: dict | None = None) -> bool:
     return d.startswith("010") and len(d) == 11
 
 #지역번호
+_CITY_PREFIXES = frozenset(f"0{x}" for x in range(31, 65))
+
 def is_valid_phone_city(number: str, options: dict | None = None) -> bool:
     d = _digits(number)
     if d.startswith("02") and 9 <= len(d) <= 10:
         return True
-    if d[:3] in {f"0{x}" for x in range(31 ,65)} and 10 <= len(d) <= 11:
+    if d[:3] in _CITY_PREFIXES and 10 <= len(d) <= 11:
         return True
     return False
 
 # 이메일
+_EMAIL_FULL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}$")
+
 def is_valid_email(addr: str, options: dict | None = None) -> bool:
-    pat = re.compile(r"^[A-Za-z0-9._%+-]+@(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}$")
-    return bool(pat.match(addr or ""))
+    return bool(_EMAIL_FULL_RE.match(addr or ""))
@@ -0,0 +1,22 @@
+"""
+공통 fixture: bench.synth 합성 문서 (seed 고정이라 실행마다 같은 문서).
+실행: python -m pytest -q (저장소 루트에서)
+"""
+import logging
+
+import pytest
+
+from bench.synth import make_pages, make_pdf, parse_density
+
+logging.getLogger("redaction").setLevel(logging.WARNING)
+
+
+@pytest.fixture(scope="session")
+def synth_texts():
+    texts, _ = make_pages(12, 300, parse_density("all=0.01"), invalid_ratio=0.4, seed=7)
+    return texts
+
+
+@pytest.fixture(scope="session")
+def synth_pdf(synth_texts):
+    return make_pdf(synth_texts)
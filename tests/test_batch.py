@@ -0,0 +1,35 @@
+"""/redactions/batch: strict에서 ensure 패턴 감지가 없는 파일은 실패가 아니라 박스 0개."""
+import io
+import json
+import zipfile
+
+import fitz
+from fastapi.testclient import TestClient
+
+from server.main import app
+
+
+def _pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_strict_without_detections_is_ok():
+    files = [
+        ("files", ("plain.pdf", _pdf("no personal data here"), "application/pdf")),
+        ("files", ("card.pdf", _pdf("card 4111 1111 1111 1111"), "application/pdf")),
+    ]
+    with TestClient(app) as client:
+        res = client.post("/redactions/batch", files=files, data={"mode": "strict", "ensure_patterns": "card"})
+    assert res.status_code == 200
+    zf = zipfile.ZipFile(io.BytesIO(res.content))
+    report = json.loads(zf.read("report.json"))
+    by_name = {f["name"]: f for f in report["files"]}
+    assert by_name["plain.pdf"]["ok"] and by_name["plain.pdf"]["boxes"] == 0
+    assert by_name["plain.pdf"]["error"] is None
+    assert by_name["card.pdf"]["ok"] and by_name["card.pdf"]["boxes"] >= 1
+    assert report["summary"]["failed"] == 0
+    assert by_name["plain.pdf"]["output"] in zf.namelist()
@@ -0,0 +1,55 @@
+"""validate_batch(NumPy) == 규칙별 스칼라 validator."""
+import random
+
+import pytest
+
+from bench.synth import CANDIDATES
+from server.batch_validators import BATCH_MIN, supports, validate_batch, validate_many
+from server.redac_rules import RULES
+
+NUMERIC = [r for r in RULES if supports(r)]
+
+OPTIONS = [None, {"rrn_checksum": False}, {"luhn": False}, {"iin": False}, {"luhn": False, "iin": False}]
+
+# 길이/문자 경계 사례: 빈 값, 자리수 부족/초과, 전각 숫자, 구분자만 있는 값
+EDGE = [
+    "", "-", "0", "000000-0000000", "991231-1234567", "000229-3000000", "0000000000000000",
+    "１２３４５６-１２３４５６７", "4111 1111 1111 1111", "4111-1111-1111-1112", "3782 822463 10005",
+    "12-34-567890-12", "99-99-999999-99", "123456-123456", "123456-12345678", "a41111111111111111",
+]
+
+
+def _values(rule, n, seed):
+    rnd = random.Random(seed)
+    gen = CANDIDATES[rule]
+    out = [gen(rnd) for _ in range(n)]
+    # 한 자리 바꾼 변형 (체크섬/날짜 경계 통과 여부가 섞이도록)
+    for v in list(out[: n // 2]):
+        i = rnd.randrange(len(v))
+        if v[i].isdigit():
+            out.append(v[:i] + rnd.choice("0123456789") + v[i + 1:])
+    return out + EDGE
+
+
+@pytest.mark.parametrize("rule", NUMERIC)
+@pytest.mark.parametrize("opts", OPTIONS, ids=str)
+def test_batch_matches_scalar(rule, opts):
+    values = _values(rule, 2000, seed=sum(map(ord, rule)))
+    fn = RULES[rule]["validator"]
+    expected = [bool(fn(v, opts)) for v in values]
+    assert validate_batch(rule, values, opts).tolist() == expected
+    assert any(expected) and not all(expected)
+
+
+@pytest.mark.parametrize("rule", list(RULES))
+def test_validate_many_matches_scalar(rule):
+    values = _values(rule, BATCH_MIN * 4, seed=1) if rule in CANDIDATES else EDGE
+    fn = RULES[rule]["validator"]
+    expected = []
+    for v in values:
+        try:
+            expected.append(bool(fn(v, None)))
+        except Exception:
+            expected.append(False)
+    assert validate_many(rule, fn, values) == expected
+    assert validate_many(rule, fn, values[: BATCH_MIN - 1]) == expected[: BATCH_MIN - 1]
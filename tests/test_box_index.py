@@ -0,0 +1,106 @@
+"""dedup_boxes / merge_boxes == 단순 O(n²) 구현."""
+import random
+from typing import List
+
+import pytest
+
+from server.box_index import _same_line, _union, dedup_boxes, merge_boxes
+from server.schemas import Box
+
+
+def _make_boxes(n: int, pages: int, seed: int) -> List[Box]:
+    """줄 단위로 놓인 박스 + 거의 같은 좌표의 중복 + 서로 겹치거나 붙은 박스."""
+    rnd = random.Random(seed)
+    out: List[Box] = []
+    while len(out) < n:
+        page = rnd.randrange(pages)
+        y0 = 30 + rnd.randrange(20) * 12.0 + rnd.choice([0.0, 0.0, 3.0, 6.0])
+        x0 = rnd.uniform(20, 300)
+        b = Box(page=page, x0=x0, y0=y0, x1=x0 + rnd.uniform(5, 60), y1=y0 + rnd.choice([10.0, 8.0, 14.0]),
+                matched_text=rnd.choice(["a", "b", None]), pattern_name=rnd.choice(["rrn", "email", "card", None]))
+        out.append(b)
+        r = rnd.random()
+        if r < 0.3:
+            j = rnd.uniform(-0.3, 0.3)
+            out.append(Box(page=page, x0=b.x0 + j, y0=b.y0 - j, x1=b.x1 + j, y1=b.y1, pattern_name=b.pattern_name))
+        elif r < 0.5:
+            x = b.x1 + rnd.uniform(-5, 2)
+            out.append(Box(page=page, x0=x, y0=b.y0, x1=x + 20, y1=b.y1, matched_text="c", pattern_name="email"))
+    return out[:n]
+
+
+def naive_dedup(boxes: List[Box], tol: float = 0.25) -> List[Box]:
+    out: List[Box] = []
+
+    def same(a: Box, b: Box) -> bool:
+        return (
+            a.page == b.page and
+            abs(a.x0 - b.x0) <= tol and
+            abs(a.y0 - b.y0) <= tol and
+            abs(a.x1 - b.x1) <= tol and
+            abs(a.y1 - b.y1) <= tol
+        )
+    for b in boxes:
+        if not any(same(b, x) for x in out):
+            out.append(b)
+    return out
+
+
+def naive_merge(boxes: List[Box], gap: float = 1.0, min_line_overlap: float = 0.5) -> List[Box]:
+    """줄 묶기는 같은 규칙, 줄 안에서는 모든 쌍을 비교해 연결 요소(union-find)로 병합."""
+    out: List[Box] = []
+    for pno in sorted({b.page for b in boxes}):
+        lines: List[List[Box]] = []
+        band = (0.0, 0.0)
+        for b in sorted((b for b in boxes if b.page == pno), key=lambda r: ((r.y0 + r.y1) / 2, r.x0)):
+            if lines and _same_line(b, band, min_line_overlap):
+                lines[-1].append(b)
+                band = (min(band[0], b.y0), max(band[1], b.y1))
+            else:
+                lines.append([b])
+                band = (b.y0, b.y1)
+        for line in lines:
+            line = sorted(line, key=lambda r: r.x0)
+            parent = list(range(len(line)))
+
+            def find(i):
+                while parent[i] != i:
+                    i = parent[i]
+                return i
+            for i, a in enumerate(line):
+                for j in range(i + 1, len(line)):
+                    b = line[j]
+                    # 두 구간이 겹치거나 간격이 gap 이하
+                    if max(a.x0, b.x0) <= min(a.x1, b.x1) + gap:
+                        parent[find(j)] = find(i)
+            groups = {}
+            for i in range(len(line)):
+                groups.setdefault(find(i), []).append(line[i])
+            out.extend(_union(g) for g in sorted(groups.values(), key=lambda g: g[0].x0))
+    return out
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_dedup_matches_naive(seed):
+    boxes = _make_boxes(600, 3, seed)
+    assert dedup_boxes(boxes) == naive_dedup(boxes)
+
+
+@pytest.mark.parametrize("tol", [0.0, 0.1, 1.0, 5.0])
+def test_dedup_tolerances(tol):
+    boxes = _make_boxes(400, 2, 99)
+    assert dedup_boxes(boxes, tol) == naive_dedup(boxes, tol)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_merge_matches_naive(seed):
+    boxes = dedup_boxes(_make_boxes(400, 3, seed))
+    merged = merge_boxes(boxes)
+    assert merged == naive_merge(boxes)
+    assert len(merged) < len(boxes)
+
+
+@pytest.mark.parametrize("gap", [0.0, 3.0, 20.0])
+def test_merge_gaps(gap):
+    boxes = _make_boxes(300, 2, 5)
+    assert merge_boxes(boxes, gap=gap) == naive_merge(boxes, gap=gap)
@@ -0,0 +1,110 @@
+"""TTLCache: 적중/미스 집계, TTL 만료, LRU/무게 축출, 한도보다 큰 단일 항목. detect_cache 키 구성."""
+import time
+
+import pytest
+
+from server import pdf_redaction
+from server.cache import TTLCache
+from server.page_ranges import parse_pages
+from server.pdf_redaction import detect_boxes_from_patterns, detect_cache
+from server.redac_rules import PRESET_PATTERNS
+from server.schemas import PatternItem
+
+PATTERNS = [PatternItem(**p) for p in PRESET_PATTERNS]
+
+
+def test_hit_miss_counters():
+    c = TTLCache(4, 60)
+    assert c.get("a") is None
+    assert c.put("a", 1)
+    assert c.get("a") == 1 and c.get("a") == 1
+    assert c.get("b", "x") == "x"
+    s = c.stats()
+    assert (s["hits"], s["misses"], s["hit_ratio"]) == (2, 2, 0.5)
+
+
+def test_ttl_expiry():
+    c = TTLCache(4, 0.05)
+    c.put("a", 1)
+    time.sleep(0.1)
+    assert c.get("a") is None
+    assert c.stats()["expirations"] == 1 and len(c) == 0
+
+    c.put("b", 2)
+    c.put("c", 3)
+    time.sleep(0.1)
+    assert c.purge_expired() == 2 and len(c) == 0
+
+
+def test_lru_eviction_by_count():
+    c = TTLCache(2, 60)
+    c.put("a", 1)
+    c.put("b", 2)
+    c.get("a")  # a가 최근 사용 → b가 밀려난다
+    c.put("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+    assert c.stats()["evictions"] == 1
+
+
+def test_eviction_by_weight():
+    c = TTLCache(10, 60, max_weight=10, weigher=len)
+    c.put("a", "xxxx")
+    c.put("b", "xxxx")
+    c.put("c", "xxxx")  # 12 > 10 → 가장 오래된 a 축출
+    assert c.get("a") is None
+    assert c.stats()["weight"] == 8 and c.stats()["evictions"] == 1
+    c.put("b", "x")  # 같은 키를 다시 넣으면 무게도 바뀐다
+    assert c.stats()["weight"] == 5
+
+
+def test_single_item_above_max_weight():
+    c = TTLCache(10, 60, max_weight=10, weigher=len)
+    c.put("a", "xxxx")
+    assert not c.put("big", "x" * 11)
+    assert c.get("big") is None
+    assert c.get("a") == "xxxx"  # 거절된 항목 때문에 다른 항목이 밀려나지 않는다
+    assert c.stats()["evictions"] == 0 and c.stats()["weight"] == 4
+
+
+def test_disabled_cache_stores_nothing():
+    c = TTLCache(0, 60)
+    assert not c.put("a", 1)
+    assert c.get("a") is None
+
+
+@pytest.fixture
+def detect_calls(monkeypatch):
+    calls = []
+    detect = pdf_redaction._detect
+
+    def _spy(*args, **kwargs):
+        calls.append(args)
+        return detect(*args, **kwargs)
+
+    monkeypatch.setattr(pdf_redaction, "_detect", _spy)
+    detect_cache.clear()
+    yield calls
+    detect_cache.clear()
+
+
+def test_detect_cache_hit(synth_pdf, detect_calls):
+    first = detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=1)
+    hits = detect_cache.hits
+    second = detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=1)
+    assert len(detect_calls) == 1
+    assert detect_cache.hits == hits + 1
+    assert second == first
+
+
+@pytest.mark.parametrize("change", [
+    {"pages": parse_pages("1-3")},
+    {"ocr": True},
+    {"patterns": PATTERNS[::-1]},
+])
+def test_detect_cache_key_misses(synth_pdf, detect_calls, change):
+    detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=1)
+    kw = {"workers": 1, **change}
+    patterns = kw.pop("patterns", PATTERNS)
+    detect_boxes_from_patterns(synth_pdf, patterns, **kw)
+    assert len(detect_calls) == 2
@@ -0,0 +1,98 @@
+"""탐지: 병렬 샤드 == 순차, 샤드 시간 한도는 요청 전체 기준, 깨진 풀은 그 풀만 교체, 스트림 한도는 스캔 시간만."""
+import asyncio
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from server import config, pdf_redaction
+from server.executor import DocumentExecutor
+from server.pdf_redaction import ScanBudgetExceeded, _detect_shard, detect_boxes_from_patterns, iter_detect_pages
+from server.redac_rules import PRESET_PATTERNS
+from server.schemas import PatternItem
+
+PATTERNS = [PatternItem(**p) for p in PRESET_PATTERNS]
+
+
+def test_parallel_matches_sequential(synth_pdf):
+    seq = detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=1, use_cache=False)
+    par = detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=3, min_shard_pages=2, use_cache=False)
+    assert seq
+    assert par == seq
+
+
+def test_parallel_matches_sequential_from_path(synth_pdf, tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(synth_pdf)
+    seq = detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=1, use_cache=False)
+    assert detect_boxes_from_patterns(str(path), PATTERNS, workers=2, min_shard_pages=2, use_cache=False) == seq
+
+
+def test_shard_uses_remaining_budget(synth_pdf):
+    # 부모가 5초 전에 시작했고 한도가 1초면 샤드는 새 1초를 받지 않고 바로 중단돼야 한다
+    with pytest.raises(ScanBudgetExceeded):
+        _detect_shard(synth_pdf, PATTERNS, 0, 2, 1.0, time.time() - 5)
+    out, _, _ = _detect_shard(synth_pdf, PATTERNS, 0, 2, 60.0, time.time())
+    assert out
+
+
+def test_pool_shared_across_threads():
+    pools = []
+    threads = [threading.Thread(target=lambda: pools.append(pdf_redaction._get_pool(2))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(p) for p in pools}) == 1
+
+
+def test_stale_reset_keeps_new_pool():
+    old = pdf_redaction._get_pool(2)
+    pdf_redaction._reset_pool(old)
+    new = pdf_redaction._get_pool(2)
+    assert new is not old
+    pdf_redaction._reset_pool(old)  # 늦게 도착한 두 번째 실패 보고
+    assert pdf_redaction._get_pool(2) is new
+
+
+def test_broken_pool_falls_back_and_is_replaced(synth_pdf):
+    seq = detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=1, use_cache=False)
+    pool = pdf_redaction._get_pool(2)
+    pool.submit(os.getpid).result(timeout=60)
+    for proc in list(pool._processes.values()):
+        os.kill(proc.pid, signal.SIGKILL)
+    par = detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=2, min_shard_pages=2, use_cache=False)
+    assert par == seq
+    assert pdf_redaction._get_pool(2) is not pool
+
+
+def test_stream_budget_excludes_consumer_wait(synth_pdf, monkeypatch):
+    # 소비 쪽이 한도보다 오래 멈춰 있어도(버퍼가 차 생산이 막힘) 스캔 시간만 한도에 센다
+    monkeypatch.setattr(config, "DETECT_TIME_BUDGET_SECONDS", 0.5)
+    ex = DocumentExecutor(1, 0)
+
+    async def _main():
+        it = ex.stream(iter_detect_pages, synth_pdf, PATTERNS, buffer=1)
+        first = await it.__anext__()
+        await asyncio.sleep(0.8)
+        return [first] + [x async for x in it]
+
+    pages = asyncio.run(_main())
+    assert [p for p, _, _ in pages] == list(range(12))
+    seq = detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=1, use_cache=False)
+    assert [b for _, boxes, _ in pages for b in boxes] == seq
+
+
+def test_stream_budget_still_limits_scan(synth_pdf, monkeypatch):
+    monkeypatch.setattr(config, "DETECT_TIME_BUDGET_SECONDS", 0.3)
+    scan = pdf_redaction._scan_page
+
+    def _slow(page, pset, layout=None):
+        time.sleep(0.1)
+        return scan(page, pset, layout)
+
+    monkeypatch.setattr(pdf_redaction, "_scan_page", _slow)
+    with pytest.raises(ScanBudgetExceeded):
+        list(iter_detect_pages(synth_pdf, PATTERNS))
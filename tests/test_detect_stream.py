@@ -0,0 +1,35 @@
+"""/redactions/detect/stream: 페이지 범위 오류는 /redactions/detect처럼 응답 시작 전에 400."""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from server.main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.mark.parametrize("pages", ["99", "0", "3-1", "x"])
+def test_invalid_pages_rejected_like_detect(client, synth_pdf, pages):
+    f = {"file": ("a.pdf", synth_pdf, "application/pdf")}
+    plain = client.post("/redactions/detect", files=f, data={"pages": pages})
+    stream = client.post("/redactions/detect/stream", files=f, data={"pages": pages})
+    assert plain.status_code == 400
+    assert stream.status_code == 400
+    assert stream.json()["detail"] == plain.json()["detail"]
+
+
+def test_invalid_pages_with_session(client, synth_pdf):
+    doc_id = client.post("/documents", files={"file": ("a.pdf", synth_pdf, "application/pdf")}).json()["doc_id"]
+    assert client.post("/redactions/detect/stream", data={"doc_id": doc_id, "pages": "99"}).status_code == 400
+
+
+def test_valid_pages_stream(client, synth_pdf):
+    f = {"file": ("a.pdf", synth_pdf, "application/pdf")}
+    lines = [json.loads(x) for x in client.post("/redactions/detect/stream", files=f, data={"pages": "2"}).text.splitlines()]
+    assert [x["page"] for x in lines if x["type"] == "page"] == [1]
+    assert lines[-1]["type"] == "summary"
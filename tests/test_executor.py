@@ -0,0 +1,87 @@
+"""DocumentExecutor.stream: 버려진 스트림이 풀 자리를 잡고 있지 않아야 한다."""
+import asyncio
+import gc
+import time
+
+import pytest
+
+from server.executor import DocumentExecutor, ExecutorBusy
+
+
+def _numbers(n):
+    for i in range(n):
+        yield i
+
+
+def _wait_idle(ex, timeout=3.0):
+    t0 = time.monotonic()
+    while ex.stats()["running"] or ex.stats()["queued"]:
+        if time.monotonic() - t0 > timeout:
+            raise AssertionError(f"executor still busy: {ex.stats()}")
+        time.sleep(0.05)
+
+
+def test_stream_yields_all_items():
+    ex = DocumentExecutor(1, 0)
+
+    async def _main():
+        return [x async for x in ex.stream(_numbers, 50, buffer=2)]
+
+    assert asyncio.run(_main()) == list(range(50))
+    _wait_idle(ex)
+
+
+def test_dropped_stream_never_started_releases_slot():
+    ex = DocumentExecutor(1, 0)
+
+    async def _main():
+        it = ex.stream(_numbers, 10_000)
+        del it
+        gc.collect()
+
+    asyncio.run(_main())
+    assert ex.stats()["running"] == 0
+    assert ex.submit(sum, [1, 2]).result(timeout=5) == 3
+
+
+def test_dropped_stream_after_first_item_stops_producer():
+    ex = DocumentExecutor(1, 0)
+
+    async def _main():
+        it = ex.stream(_numbers, 10_000, buffer=2)
+        assert await it.__anext__() == 0
+        del it
+        gc.collect()
+
+    asyncio.run(_main())
+    _wait_idle(ex)
+    assert ex.submit(sum, [1, 2]).result(timeout=5) == 3
+
+
+def test_idle_consumer_times_out():
+    ex = DocumentExecutor(1, 0)
+
+    async def _main():
+        it = ex.stream(_numbers, 10_000, buffer=1, idle_timeout=0.2)
+        assert await it.__anext__() == 0
+        await asyncio.sleep(1.0)
+        await it.__anext__()  # 이미 버퍼에 있던 항목
+        with pytest.raises(TimeoutError):
+            await it.__anext__()
+        return it
+
+    it = asyncio.run(_main())
+    _wait_idle(ex)
+    del it
+
+
+def test_busy_is_raised_before_iteration():
+    ex = DocumentExecutor(1, 0)
+    fut = ex.submit(time.sleep, 0.5)
+
+    async def _main():
+        with pytest.raises(ExecutorBusy):
+            ex.stream(_numbers, 3)
+
+    asyncio.run(_main())
+    fut.result()
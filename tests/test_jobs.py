@@ -0,0 +1,150 @@
+"""/redactions/jobs: 제출 → 진행률 → 결과, 끝나기 전 409, 대기/실행 중 취소, 시간 한도, 대기열 포화 429."""
+import threading
+import time
+
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from server import config
+from server.executor import DocumentExecutor
+from server.jobs import JobStore
+from server.main import app
+from server.routes import redaction as redaction_route
+
+
+@pytest.fixture
+def store(monkeypatch):
+    # 작업 1개 실행 + 1개 대기만 받는 전용 풀로 바꿔 끼운다
+    s = JobStore(DocumentExecutor(1, 1, name="test-job"))
+    monkeypatch.setattr(redaction_route, "job_store", s)
+    yield s
+    s.cancel_all()
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def _wait(client, job_id, until, timeout=30.0):
+    t0 = time.monotonic()
+    while True:
+        info = client.get(f"/redactions/jobs/{job_id}").json()
+        if until(info):
+            return info
+        if time.monotonic() - t0 > timeout:
+            raise AssertionError(f"job stuck: {info}")
+        time.sleep(0.02)
+
+
+def _gated(gate, pages=3):
+    """gate가 열릴 때까지 페이지 경계(progress)를 돌며 기다리는 작업 함수."""
+    def fn(progress):
+        progress("scan", 0, pages)
+        while not gate.wait(0.01):
+            progress("scan", 1, pages)
+        progress("scan", pages, pages)
+        return b"%PDF-gated", 0, None
+    return fn
+
+
+def test_submit_progress_result(client, store, synth_pdf):
+    gate = threading.Event()
+    job = store.submit(_gated(gate), filename="a.pdf")
+    info = _wait(client, job.job_id, lambda i: i["status"] == "running" and i["pages_done"] == 1)
+    assert info["stage"] == "scan" and info["pages_total"] == 3
+    gate.set()
+    info = _wait(client, job.job_id, lambda i: i["status"] == "done")
+    assert info["pages_done"] == 3 and info["result_bytes"] == len(b"%PDF-gated")
+    assert client.get(f"/redactions/jobs/{job.job_id}/result").content == b"%PDF-gated"
+
+    res = client.post("/redactions/jobs", files={"file": ("a.pdf", synth_pdf, "application/pdf")},
+                      data={"mode": "auto_all"})
+    assert res.status_code == 202
+    info = _wait(client, res.json()["job_id"], lambda i: i["status"] in ("done", "failed"))
+    assert info["status"] == "done" and info["boxes"] > 0
+    out = client.get(f"/redactions/jobs/{info['job_id']}/result")
+    assert out.status_code == 200
+    with fitz.open(stream=out.content, filetype="pdf") as doc:
+        assert doc.page_count == fitz.open(stream=synth_pdf, filetype="pdf").page_count
+
+
+def test_result_before_done_is_409(client, store):
+    gate = threading.Event()
+    job = store.submit(_gated(gate))
+    _wait(client, job.job_id, lambda i: i["status"] == "running")
+    res = client.get(f"/redactions/jobs/{job.job_id}/result")
+    assert res.status_code == 409
+    gate.set()
+    _wait(client, job.job_id, lambda i: i["status"] == "done")
+    assert client.get(f"/redactions/jobs/{job.job_id}/result").status_code == 200
+
+
+def test_cancel_queued_and_running(client, store, synth_pdf):
+    gate = threading.Event()
+    running = store.submit(_gated(gate))
+    _wait(client, running.job_id, lambda i: i["status"] == "running")
+    queued = client.post("/redactions/jobs", files={"file": ("a.pdf", synth_pdf, "application/pdf")})
+    assert queued.status_code == 202 and queued.json()["status"] == "queued"
+    queued_id = queued.json()["job_id"]
+
+    assert client.delete(f"/redactions/jobs/{queued_id}").status_code == 200
+    assert _wait(client, queued_id, lambda i: i["status"] != "queued")["status"] == "cancelled"
+
+    assert client.delete(f"/redactions/jobs/{running.job_id}").status_code == 200
+    info = _wait(client, running.job_id, lambda i: i["status"] != "running")
+    assert info["status"] == "cancelled"
+    assert client.get(f"/redactions/jobs/{running.job_id}/result").status_code == 409
+
+    # 끝난 작업을 지우면 이후 조회는 404
+    assert client.delete(f"/redactions/jobs/{running.job_id}").status_code == 200
+    assert client.get(f"/redactions/jobs/{running.job_id}").status_code == 404
+    assert store.stats()["queued"] == store.stats()["running"] == 0
+
+
+def test_timeout_fails_job(client, store, monkeypatch):
+    monkeypatch.setattr(config, "JOB_TIMEOUT_SECONDS", 0.05)
+    job = store.submit(_gated(threading.Event()))
+    info = _wait(client, job.job_id, lambda i: i["status"] not in ("queued", "running"))
+    assert info["status"] == "failed" and "시간 한도" in info["error"]
+
+
+def test_full_queue_is_429(client, store, synth_pdf):
+    gate = threading.Event()
+    store.submit(_gated(gate))
+    store.submit(_gated(gate))
+    res = client.post("/redactions/jobs", files={"file": ("a.pdf", synth_pdf, "application/pdf")})
+    assert res.status_code == 429
+    gate.set()
+
+
+def test_oversized_result_is_failed_not_lost(client, store):
+    store._finished.max_weight = 4
+    gate = threading.Event()
+    gate.set()
+    job = store.submit(_gated(gate))
+    info = _wait(client, job.job_id, lambda i: i["status"] not in ("queued", "running"))
+    assert info["status"] == "failed" and "보관 한도" in info["error"]
+    assert client.get(f"/redactions/jobs/{job.job_id}/result").status_code == 409
+
+
+def test_no_404_while_finishing(store, monkeypatch):
+    # _finished에 들어가는 시점에 아직 _active에 있어야 그 사이 조회가 404를 보지 않는다
+    still_active = []
+    put = store._finished.put
+
+    def _put(key, value):
+        still_active.append(key in store._active)
+        return put(key, value)
+
+    monkeypatch.setattr(store._finished, "put", _put)
+    gate = threading.Event()
+    gate.set()
+    job = store.submit(_gated(gate, pages=1))
+    t0 = time.monotonic()
+    while job.job_id in store._active and time.monotonic() - t0 < 5:
+        time.sleep(0.01)
+    assert still_active == [True]
+    assert store.get(job.job_id).status == "done"
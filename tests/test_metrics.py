@@ -0,0 +1,114 @@
+"""/metrics: 탐지 후 Prometheus 텍스트 형식이 올바르고, 라벨에는 패턴 이름만(매치 값은 절대 없음)."""
+import json
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from server.main import app
+from server.redac_rules import PRESET_PATTERNS, RULES
+
+_NAME = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+_SAMPLE = re.compile(rf"^({_NAME})(?:\{{(.*)\}})? (-?[0-9.e+-]+|[+-]Inf|NaN)$")
+_LABEL = re.compile(rf'({_NAME})="((?:[^"\\]|\\.)*)"(?:,|$)')
+
+EXPECTED = {
+    "redaction_stage_seconds": {"stage", "le"},
+    "redaction_pattern_locate_seconds": {"pattern", "le"},
+    "redaction_validate_seconds": {"pattern", "le"},
+    "redaction_validate_candidates_total": {"pattern"},
+    "redaction_validate_rejected_total": {"pattern"},
+    "redaction_pages_total": {"op"},
+    "redaction_boxes_total": {"pattern"},
+    "redaction_http_in_flight_requests": set(),
+    "redaction_http_request_seconds": {"method", "path", "le"},
+    "redaction_http_requests_total": {"method", "path", "status"},
+}
+PATTERN_METRICS = {
+    "redaction_pattern_locate_seconds", "redaction_validate_seconds",
+    "redaction_validate_candidates_total", "redaction_validate_rejected_total", "redaction_boxes_total",
+}
+
+
+def _parse(text):
+    """{메트릭 이름: {"type": ..., "samples": [(샘플 이름, {라벨}, 값)]}}. 형식이 틀리면 AssertionError."""
+    families, current = {}, None
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            current = line.split(" ", 3)[2]
+            families[current] = {"type": None, "samples": []}
+        elif line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name == current and kind in ("counter", "gauge", "histogram"), line
+            families[name]["type"] = kind
+        else:
+            m = _SAMPLE.match(line)
+            assert m, f"잘못된 샘플 줄: {line!r}"
+            name, body, value = m.groups()
+            float(value)
+            labels = {}
+            if body:
+                pairs = _LABEL.findall(body)
+                assert ",".join(f'{k}="{v}"' for k, v in pairs) == body, line
+                labels = dict(pairs)
+            base = current
+            suffixes = ("_bucket", "_sum", "_count") if families[current]["type"] == "histogram" else ("",)
+            assert any(name == base + s for s in suffixes), line
+            families[current]["samples"].append((name, labels, float(value)))
+    return families
+
+
+@pytest.fixture(scope="module")
+def after_detect(synth_pdf):
+    custom = {"name": "고객번호-CUST", "regex": r"CUST-\d{4}", "case_sensitive": True}
+    patterns = json.dumps(PRESET_PATTERNS + [custom])
+    with TestClient(app) as client:
+        res = client.post("/redactions/detect", files={"file": ("a.pdf", synth_pdf, "application/pdf")},
+                          data={"patterns_json": patterns})
+        assert res.status_code == 200
+        metrics = client.get("/metrics")
+    return res.json()["boxes"], metrics, custom["name"]
+
+
+def test_exposition_format(after_detect):
+    _, res, _ = after_detect
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    families = _parse(res.text)
+    for name, labelnames in EXPECTED.items():
+        fam = families[name]
+        assert fam["samples"], name
+        for sample, labels, _ in fam["samples"]:
+            want = labelnames if sample.endswith("_bucket") else labelnames - {"le"}
+            assert set(labels) == want, (sample, labels)
+
+
+def test_histograms_are_cumulative(after_detect):
+    families = _parse(after_detect[1].text)
+    for name, fam in families.items():
+        if fam["type"] != "histogram":
+            continue
+        series = {}
+        for sample, labels, value in fam["samples"]:
+            key = tuple(sorted((k, v) for k, v in labels.items() if k != "le"))
+            series.setdefault(key, {})[sample[len(name):] + labels.get("le", "")] = value
+        for key, vals in series.items():
+            buckets = [v for k, v in vals.items() if k.startswith("_bucket")]
+            assert buckets == sorted(buckets) and buckets[-1] == vals["_bucket+Inf"] == vals["_count"], (name, key)
+
+
+def test_labels_carry_only_pattern_names(after_detect):
+    boxes, res, custom_name = after_detect
+    families = _parse(res.text)
+    assert {"redaction_stage_seconds", "redaction_http_requests_total"} <= set(families)
+    paths = {l["path"] for _, l, _ in families["redaction_http_requests_total"]["samples"]}
+    assert "/redactions/detect" in paths
+    for name in PATTERN_METRICS:
+        for _, labels, _ in families[name]["samples"]:
+            assert labels["pattern"] in RULES or labels["pattern"] == "custom"
+    assert {l["pattern"] for _, l, _ in families["redaction_boxes_total"]["samples"]} >= {b["pattern_name"] for b in boxes} & set(RULES)
+    values = {b["matched_text"] for b in boxes}
+    assert values
+    assert not any(v in res.text for v in values)
+    assert custom_name not in res.text
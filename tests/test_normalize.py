@@ -0,0 +1,71 @@
+"""normalize_text / normalize_with_map == 기존 구현(NFKC → 정규식 여러 번 → 줄 단위 rstrip), 위치 변환표가 원문을 가리키는지."""
+import random
+import re
+import unicodedata
+
+import pytest
+
+from server.normalize import LineOffsetMap, normalize_text, normalize_with_map, strip_invisible, _DASHES
+
+# 정규화가 실제로 일을 하는 문자들(전각, 합자, 결합 문자, 조합형 자모, 폭 없는 문자, 각종 공백/대시/개행)
+SPECIAL = [
+    " ", "  ", "\t", "\f", "\v", "\r", "\n", "\r\n", "\u00A0", "\u2007", "\u202F", "\u3000",
+    "\u200B", "\u200C", "\u200D", "\u2060", "\uFEFF", "\u2010", "\u2011", "\u2013", "\u2014",
+    "\u2212", "\uFE63", "\u2043", "\uFF10", "\uFF11", "\uFF0D", "\uFB01", "\u3231", "\u2460",
+    "e\u0301", "\u0301", "\u1100\u1161", "\u11A8", "\u00BD", "\u2126",
+]
+WORDS = ["주민번호", "900101-1234567", "010-1234-5678", "hong@example.com", "카드", "4111 1111 1111 1111",
+         "M12345678", "서울시", "abc", "가나다"]
+POOL = SPECIAL + WORDS + ["a", "1", "-", "가"]
+
+
+def legacy_normalize(s):
+    if not s: return ""
+    s = unicodedata.normalize("NFKC", s)
+    s = re.sub(r"\r\n?", "\n", s)
+    s = strip_invisible(s)
+    s = _DASHES.sub("-", s)
+    s = s.replace("\t", " ")
+    s = re.sub(r"[ \f\v]+", " ", s)
+    s = "\n".join(re.sub(r"[ \t]+$", "", line) for line in s.split("\n"))
+    return s
+
+
+def check_map(src, out, omap):
+    """out의 토큰마다 변환표가 준 원문 구간을 다시 정규화하면 그 토큰이 된다."""
+    for m in re.finditer(r"\S+", out):
+        os_, oe = omap.start(m.start()), omap.end(m.end())
+        assert 0 <= os_ <= oe <= len(src), (m.group(), os_, oe)
+        assert normalize_text(src[os_:oe]).strip() == m.group(), (m.group(), src[os_:oe])
+
+
+def _fuzz_inputs(seed, n=500):
+    rnd = random.Random(seed)
+    return ["".join(rnd.choice(POOL) for _ in range(rnd.randint(0, 30))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_legacy(seed):
+    for s in _fuzz_inputs(seed):
+        ref = legacy_normalize(s)
+        assert normalize_text(s) == ref, repr(s)
+        out, omap = normalize_with_map(s)
+        assert out == ref, repr(s)
+        check_map(s, out, omap)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_line_map_matches_full_map(seed):
+    for s in _fuzz_inputs(seed):
+        out, omap = normalize_with_map(s)
+        lmap = LineOffsetMap(s, out)
+        for n in range(len(out) + 1):
+            assert lmap.start(n) == omap.start(n), (repr(s), n)
+            assert lmap.end(n) == omap.end(n), (repr(s), n)
+
+
+def test_long_text(synth_texts):
+    s = "\r\n".join(synth_texts).replace("-", "–", 50).replace(" ", "  ", 200)
+    out = normalize_text(s)
+    assert out == legacy_normalize(s)
+    check_map(s, out, LineOffsetMap(s, out))
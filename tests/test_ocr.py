@@ -0,0 +1,126 @@
+"""OCR: needs_ocr 판정, 렌더링 픽셀 → PDF 좌표 변환(회전/크롭박스 원점), 가짜 엔진으로 탐지 연결, 실제 tesseract."""
+import fitz
+import numpy as np
+import pytest
+
+from server import config, ocr
+from server.pdf_redaction import detect_boxes_from_patterns
+from server.redac_rules import PRESET_PATTERNS
+from server.schemas import PatternItem
+
+RRN = "060820-3492891"
+RRN_ONLY = [PatternItem(**p) for p in PRESET_PATTERNS if p["name"] == "rrn"]
+CROP = fitz.Rect(60, 40, 540, 760)
+
+
+def _page(doc, rotation=0, crop=None, text=None, image=False):
+    page = doc.new_page(width=595, height=842)
+    if crop is not None:
+        page.set_cropbox(crop)
+    page.set_rotation(rotation)
+    if text:
+        page.insert_text((80, 120), text, fontsize=14)
+    if image:
+        # 잉크 판정(<128)에 걸리지 않는 옅은 회색 이미지
+        pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 8, 8), False)
+        pix.set_rect(pix.irect, (200,))
+        page.insert_image(fitz.Rect(300, 500, 340, 540), pixmap=pix)
+    return page
+
+
+def _ink_box(png):
+    """가짜 OCR 엔진: 렌더링 이미지에서 어두운 픽셀 전체의 bbox를 RRN 단어 하나로 돌려준다."""
+    pix = fitz.Pixmap(png)
+    arr = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)[:, :, 0]
+    ys, xs = np.nonzero(arr < 128)
+    if not len(xs):
+        return []
+    return [(float(xs.min()), float(ys.min()), float(xs.max() + 1), float(ys.max() + 1), RRN, 0, 0, 0)]
+
+
+@pytest.fixture
+def fake_engine(monkeypatch):
+    monkeypatch.setattr(ocr, "ocr_available", lambda: True)
+    monkeypatch.setattr(ocr, "_ocr_image", lambda png, lang, min_conf: _ink_box(png))
+    ocr.ocr_cache.clear()
+    yield
+    ocr.ocr_cache.clear()
+
+
+def _close(ocr_rect, text_rect):
+    # 잉크 bbox는 글꼴 줄 높이보다 작으므로, 텍스트 레이어 bbox 안쪽에 있고 가로 길이가 거의 같으면 같은 위치
+    grown = fitz.Rect(text_rect.x0 - 1.5, text_rect.y0 - 1.5, text_rect.x1 + 1.5, text_rect.y1 + 1.5)
+    return grown.contains(ocr_rect) and abs(ocr_rect.width - text_rect.width) < 0.1 * text_rect.width
+
+
+def test_needs_ocr(monkeypatch):
+    monkeypatch.setattr(config, "OCR_MIN_TEXT_CHARS", 10)
+    doc = fitz.open()
+    assert ocr.needs_ocr(_page(doc, image=True), [])
+    assert ocr.needs_ocr(_page(doc, image=True), ["ab", "  ", "c"])  # 공백 제외 10자 미만
+    assert not ocr.needs_ocr(_page(doc, image=True), ["0123456789"])
+    assert not ocr.needs_ocr(_page(doc), [])  # 이미지가 없으면 OCR할 것이 없다
+    doc.close()
+
+
+@pytest.mark.parametrize("crop", [None, CROP])
+@pytest.mark.parametrize("rotation", [0, 90, 180, 270])
+def test_pixel_to_pdf_mapping(fake_engine, rotation, crop):
+    doc = fitz.open()
+    page = _page(doc, rotation, crop, text=RRN)
+    (text_rect,) = page.search_for(RRN)
+    for dpi in (72, 150):
+        words = ocr.ocr_page_words(doc, [0], dpi=dpi, workers=1)
+        (word,) = words[0]
+        assert word[4] == RRN
+        assert _close(fitz.Rect(word[:4]), text_rect), (dpi, fitz.Rect(word[:4]), text_rect)
+    doc.close()
+
+
+def test_cache_hit_maps_per_page(fake_engine):
+    # 캐시에는 픽셀 좌표만 있으므로 같은 이미지라도 꺼낼 때 페이지마다 변환한다
+    doc = fitz.open()
+    page = _page(doc, 90, CROP, text=RRN)
+    (text_rect,) = page.search_for(RRN)
+    first = ocr.ocr_page_words(doc, [0], dpi=100, workers=1)[0]
+    hits = ocr.ocr_cache.hits
+    again = ocr.ocr_page_words(doc, [0], dpi=100, workers=1)[0]
+    assert ocr.ocr_cache.hits == hits + 1
+    assert again == first and _close(fitz.Rect(first[0][:4]), text_rect)
+    doc.close()
+
+
+@pytest.mark.parametrize("rotation", [0, 90])
+def test_detect_uses_ocr_words(fake_engine, monkeypatch, rotation):
+    # 텍스트 레이어가 있어도 OCR 대상이 되게 문턱을 올려 두고, OCR 박스가 텍스트 박스와 같은 자리인지 본다
+    monkeypatch.setattr(config, "OCR_MIN_TEXT_CHARS", 1000)
+    monkeypatch.setattr(config, "OCR_WORKERS", 1)
+    monkeypatch.setattr(config, "OCR_DPI", 100)
+    doc = fitz.open()
+    _page(doc, rotation, CROP, text=RRN, image=True)
+    pdf = doc.tobytes()
+    doc.close()
+    plain = detect_boxes_from_patterns(pdf, RRN_ONLY, workers=1, use_cache=False)
+    with_ocr = detect_boxes_from_patterns(pdf, RRN_ONLY, workers=1, use_cache=False, ocr=True)
+    assert len(plain) == 1 and len(with_ocr) == 2
+    text_box = plain[0]
+    ocr_box = next(b for b in with_ocr if b != text_box)
+    assert ocr_box.matched_text == RRN
+    assert _close(fitz.Rect(ocr_box.x0, ocr_box.y0, ocr_box.x1, ocr_box.y1),
+                  fitz.Rect(text_box.x0, text_box.y0, text_box.x1, text_box.y1))
+
+
+@pytest.mark.skipif(not ocr.ocr_available(), reason="pytesseract/tesseract가 없음")
+def test_real_ocr_scanned_page(monkeypatch):
+    monkeypatch.setattr(config, "OCR_LANG", "eng")
+    src = fitz.open()
+    src.new_page().insert_text((72, 120), f"RRN {RRN}", fontsize=24)
+    pix = src[0].get_pixmap(dpi=200)
+    src.close()
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_image(page.rect, pixmap=pix)
+    pdf = doc.tobytes()
+    doc.close()
+    boxes = detect_boxes_from_patterns(pdf, RRN_ONLY, workers=1, use_cache=False, ocr=True)
+    assert [b.matched_text for b in boxes] == [RRN]
@@ -0,0 +1,72 @@
+"""사용자 패턴: 정적 위험 검사 + 샌드박스 실행 제한 시간."""
+import fitz
+import pytest
+
+from server import config, regex_sandbox
+from server.pdf_redaction import detect_boxes_from_patterns
+from server.redac_rules import PRESET_PATTERNS, RULES
+from server.regex_guard import regex_risk
+from server.regex_sandbox import RegexTimeout
+from server.schemas import PatternItem
+
+RISKY = [r"(a+)+$", r"(x+x+)+y", r"(\w+\s?)*$", r"(a|aa)+$", r"(a|a)*b", r"(?:a|b|ab)+$", r"(?:\d|\d\d){1,30}$"]
+# 단어 목록/하이픈 ID: 안쪽 반복 뒤의 구분자가 다음 회차 첫 글자(\s, -)로 온다
+SAFE_WRAPAROUND = [r"[a-z]+(?:\s[a-z]+)*", r"\w+(?:-\w+)*", r"(?:[A-Za-z]+ )+"]
+SAFE = [r"(?:[A-Za-z0-9-]+\.)+com", r"(a|ab)+c", r"(?:foo|fo)+", r"(?:\d{3}-|\d{4})+", r"(?:a|b|)*c", r"\d{6}-\d{7}"]
+
+
+@pytest.mark.parametrize("regex", RISKY)
+def test_risky_patterns_flagged(regex):
+    assert regex_risk(regex) is not None
+
+
+@pytest.mark.parametrize("regex", SAFE + SAFE_WRAPAROUND)
+def test_safe_patterns_pass(regex):
+    assert regex_risk(regex) is None
+
+
+def test_builtin_rules_pass():
+    for p in PRESET_PATTERNS:
+        assert regex_risk(p["regex"]) is None, p["name"]
+    for name, rule in RULES.items():
+        assert regex_risk(rule["regex"].pattern, rule["regex"].flags) is None, name
+
+
+def _pdf(lines):
+    doc = fitz.open()
+    page = doc.new_page()
+    for i, line in enumerate(lines):
+        page.insert_text((40, 60 + 14 * i), line, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def sandbox(monkeypatch):
+    monkeypatch.setattr(config, "USER_REGEX_TIMEOUT_SECONDS", 2)
+    yield
+    regex_sandbox.shutdown()
+
+
+def test_custom_pattern_sandboxed_matches_in_process(sandbox, synth_pdf, monkeypatch):
+    patterns = [PatternItem(name="ref", regex=r"No\.|제\d+조"), PatternItem(**PRESET_PATTERNS[0])]
+    sandboxed = detect_boxes_from_patterns(synth_pdf, patterns, use_cache=False)
+    monkeypatch.setattr(config, "USER_REGEX_TIMEOUT_SECONDS", 0)
+    assert sandboxed
+    assert detect_boxes_from_patterns(synth_pdf, patterns, use_cache=False) == sandboxed
+
+
+def test_catastrophic_pattern_times_out(sandbox):
+    pdf = _pdf(["a" * 40 + "!", "hong@example.com"])
+    with pytest.raises(RegexTimeout):
+        detect_boxes_from_patterns(pdf, [PatternItem(name="evil", regex=r"(a|a)*b")], use_cache=False)
+    # 워커를 새로 띄워 다음 요청은 정상 처리
+    boxes = detect_boxes_from_patterns(pdf, [PatternItem(name="mail", regex=r"\w+@\w+")], use_cache=False)
+    assert [b.pattern_name for b in boxes] == ["mail"]
+
+
+def test_catastrophic_card_pattern_times_out(sandbox):
+    pdf = _pdf(["1111 1111 1111 1111 1111 1111 1111 1111 1111 x"])
+    with pytest.raises(RegexTimeout):
+        detect_boxes_from_patterns(pdf, [PatternItem(name="card", regex=r"(1|1)*2")], use_cache=False)
@@ -0,0 +1,58 @@
+"""저장 프로파일: 기본값은 기존 저장(apply_redactions 기본값 + 옵션 없는 save)과 같은 출력, compact/strip은 선택."""
+import io
+
+import fitz
+import pytest
+
+from bench.save_profiles import make_pdf
+from server import config
+from server.pdf_redaction import SAVE_PROFILES, detect_boxes_from_patterns, redact_and_save
+from server.redac_rules import PRESET_PATTERNS
+from server.schemas import PatternItem
+
+
+@pytest.fixture(scope="module")
+def pdf_and_boxes():
+    pdf = make_pdf(3, 2)
+    boxes = detect_boxes_from_patterns(pdf, [PatternItem(**p) for p in PRESET_PATTERNS], use_cache=False)
+    return pdf, boxes
+
+
+def legacy_redact(pdf, boxes):
+    doc = fitz.open(stream=pdf, filetype="pdf")
+    by_page = {}
+    for b in boxes:
+        by_page.setdefault(b.page, []).append(b)
+    for pno, page_boxes in by_page.items():
+        page = doc.load_page(pno)
+        for b in page_boxes:
+            page.add_redact_annot(fitz.Rect(b.x0, b.y0, b.x1, b.y1), fill=(0, 0, 0))
+        page.apply_redactions()
+    out = io.BytesIO()
+    doc.save(out)
+    doc.close()
+    return out.getvalue()
+
+
+def _strip_ids(data):
+    # 저장마다 새로 만드는 문서 /ID 는 비교에서 뺀다
+    i = data.rfind(b"/ID")
+    return data[:i] + data[data.index(b"]", i):] if i >= 0 else data
+
+
+def test_default_is_previous_output(pdf_and_boxes):
+    pdf, boxes = pdf_and_boxes
+    assert config.SAVE_PROFILE == "standard"
+    out, stats = redact_and_save(pdf, boxes)
+    assert stats["profile"] == "standard"
+    assert _strip_ids(out) == _strip_ids(legacy_redact(pdf, boxes))
+
+
+@pytest.mark.parametrize("profile", sorted(SAVE_PROFILES))
+def test_profiles_hide_values(profile, pdf_and_boxes):
+    pdf, boxes = pdf_and_boxes
+    out, stats = redact_and_save(pdf, boxes, profile=profile)
+    assert stats["profile"] == profile and stats["bytes_out"] == len(out)
+    with fitz.open(stream=out, filetype="pdf") as doc:
+        text = "".join(page.get_text() for page in doc)
+    assert not any(b.matched_text in text for b in boxes)
@@ -0,0 +1,55 @@
+"""RuleScanner 결합 스캔 == 규칙마다 finditer."""
+import random
+import re
+
+import pytest
+
+from server.redac_rules import RULES
+from server.scanner import RuleScanner
+
+
+def _per_rule(specs, text):
+    return [
+        [m.span() for m in re.compile(regex, flags).finditer(text) if m.end() > m.start()]
+        for _, regex, flags in specs
+    ]
+
+
+def _rule_specs(names):
+    return [(n, RULES[n]["regex"].pattern, RULES[n]["regex"].flags) for n in names]
+
+
+def test_builtin_rules_single_pass(synth_texts):
+    specs = _rule_specs(RULES)
+    scanner = RuleScanner(specs)
+    assert scanner.single_pass
+    for text in synth_texts:
+        assert scanner.scan(text) == _per_rule(specs, text)
+
+
+# 서로 겹치는 매치, 길이 0 매치, 대소문자 플래그가 섞인 규칙
+OVERLAPPING = [
+    ("digits", r"\d+", 0),
+    ("pairs", r"\d\d", 0),
+    ("word", r"[a-z]+\d*", re.IGNORECASE),
+    ("maybe", r"x*", 0),
+    ("dash", r"\d+-\d+", 0),
+    ("tail", r"(?<=-)\d{2,}", 0),
+]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_overlapping_rules_random_text(seed):
+    rnd = random.Random(seed)
+    text = "".join(rnd.choice("0123456789-abXxY \n") for _ in range(400))
+    scanner = RuleScanner(OVERLAPPING)
+    assert scanner.single_pass
+    assert scanner.scan(text) == _per_rule(OVERLAPPING, text)
+
+
+def test_backreference_falls_back_to_per_rule():
+    specs = [("rep", r"(\d)\1", 0), ("digits", r"\d+", 0)]
+    scanner = RuleScanner(specs)
+    assert not scanner.single_pass
+    text = "1123 4455 12 99"
+    assert scanner.scan(text) == _per_rule(specs, text)
@@ -0,0 +1,75 @@
+"""문서 세션: TTL 만료, 메모리 한도 축출/거절, doc_id와 파일 업로드 결과가 같은지."""
+import time
+
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from server.main import app
+from server.sessions import build_session, session_store
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def store():
+    session_store.clear()
+    yield session_store
+    session_store.clear()
+
+
+def _pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _upload(client, data, name="a.pdf"):
+    return client.post("/documents", files={"file": (name, data, "application/pdf")})
+
+
+def test_ttl_expiry(client, store, monkeypatch, synth_pdf):
+    monkeypatch.setattr(store, "ttl_seconds", 0.05)
+    doc_id = _upload(client, synth_pdf).json()["doc_id"]
+    time.sleep(0.1)
+    assert client.get(f"/documents/{doc_id}").status_code == 404
+    assert client.post("/text/extract", data={"doc_id": doc_id}).status_code == 404
+
+
+def test_memory_cap_evicts_oldest(client, store, monkeypatch):
+    small = _pdf("hello 1"), _pdf("hello 2"), _pdf("hello 3")
+    weight = build_session(small[0]).nbytes
+    monkeypatch.setattr(store, "max_weight", weight * 2 + weight // 2)
+    ids = [_upload(client, data).json()["doc_id"] for data in small]
+    assert client.get(f"/documents/{ids[0]}").status_code == 404
+    assert all(client.get(f"/documents/{i}").status_code == 200 for i in ids[1:])
+
+
+def test_oversized_rejected_without_evicting(client, store, monkeypatch, synth_pdf):
+    small = _upload(client, _pdf("keep me")).json()
+    monkeypatch.setattr(store, "max_weight", build_session(synth_pdf).nbytes - 1)
+    evictions = store.evictions
+    assert _upload(client, synth_pdf).status_code == 413
+    assert store.evictions == evictions
+    assert client.get(f"/documents/{small['doc_id']}").status_code == 200
+
+
+def test_doc_id_matches_upload(client, store, synth_pdf):
+    doc_id = _upload(client, synth_pdf).json()["doc_id"]
+    f = {"file": ("a.pdf", synth_pdf, "application/pdf")}
+    for path, data in [
+        ("/text/extract", {}),
+        ("/text/extract", {"pages": "2-4"}),
+        ("/redactions/detect", {}),
+        ("/redactions/detect", {"pages": "1,5-6"}),
+    ]:
+        by_file = client.post(path, files=f, data=data)
+        by_doc = client.post(path, data={**data, "doc_id": doc_id})
+        assert by_file.status_code == by_doc.status_code == 200, path
+        assert by_doc.json() == by_file.json(), (path, data)
@@ -0,0 +1,66 @@
+"""strict 모드 ensure: ensure 패턴만 스캔하고(없으면 스캔 생략), 결과는 전체 스캔 후 거른 것과 같다."""
+import fitz
+import pytest
+
+from server import pdf_redaction
+from server.redac_rules import PRESET_PATTERNS
+from server.routes import redaction as redaction_route
+from server.schemas import Box, PatternItem
+
+PATTERNS = [PatternItem(**p) for p in PRESET_PATTERNS]
+
+
+@pytest.fixture
+def spy(monkeypatch):
+    """_scan_page가 받은 패턴 이름, progress 보고, 레닥션에 넘어간 박스를 모은다."""
+    seen = {"scanned": [], "progress": [], "boxes": None}
+    scan = pdf_redaction._scan_page
+
+    def _scan(page, pset, layout=None):
+        seen["scanned"].append(tuple(name for _, name in pset.compiled))
+        return scan(page, pset, layout)
+
+    def _save(pdf, boxes, **kw):
+        seen["boxes"] = list(boxes)
+        return b"%PDF", {}
+
+    monkeypatch.setattr(pdf_redaction, "_scan_page", _scan)
+    monkeypatch.setattr(redaction_route, "redact_and_save", _save)
+    pdf_redaction.detect_cache.clear()
+    return seen
+
+
+def _strict(pdf, ensure, boxes_req, seen):
+    return redaction_route._redact_pdf(
+        pdf, boxes_req, PATTERNS, mode="strict", incl=set(), excl=set(), ensure=ensure,
+        merge_overlaps=False, fill="black", src_kw={"workers": 1},
+        progress=lambda stage, done, total: seen["progress"].append(stage),
+    )
+
+
+def _key(b):
+    return b.page, b.x0, b.y0, b.x1, b.y1, b.pattern_name
+
+
+@pytest.mark.parametrize("ensure", [{"card"}, {"card", "email"}])
+def test_scans_only_ensure_patterns(synth_pdf, spy, ensure):
+    _, count, _ = _strict(synth_pdf, ensure, [], spy)
+    with fitz.open(stream=synth_pdf, filetype="pdf") as doc:
+        n_pages = doc.page_count
+    assert len(spy["scanned"]) == n_pages
+    assert all(set(names) == ensure for names in spy["scanned"])
+    assert spy["progress"].count("detect") == n_pages
+
+    full = pdf_redaction.detect_boxes_from_patterns(synth_pdf, PATTERNS, workers=1, use_cache=False)
+    expected = redaction_route._dedup_boxes([b for b in full if b.pattern_name in ensure])
+    assert expected
+    assert count == len(expected)
+    assert sorted(map(_key, spy["boxes"])) == sorted(map(_key, expected))
+
+
+def test_unknown_ensure_skips_scan(synth_pdf, spy):
+    box = Box(page=0, x0=10, y0=10, x1=50, y1=20, pattern_name="manual")
+    _, count, _ = _strict(synth_pdf, {"no_such_pattern"}, [box], spy)
+    assert spy["scanned"] == []
+    assert "detect" not in spy["progress"]
+    assert count == 1 and spy["boxes"] == [box]
@@ -0,0 +1,61 @@
+"""match_hits == 주민번호 구간을 가린 텍스트 전체를 만들어 규칙마다 finditer 하던 기존 방식."""
+import random
+
+import pytest
+
+from server.redac_rules import RULES
+from server.routes.text import DEFAULT_ORDER
+from server.text_match import match_hits
+
+ORDER = [r for r in DEFAULT_ORDER if r in RULES]
+
+
+def legacy_hits(text, ordered_rules, options=None):
+    hits = []
+    working = text
+    if "rrn" in ordered_rules:
+        rx, fn = RULES["rrn"]["regex"], RULES["rrn"]["validator"]
+        spans = [m.span() for m in rx.finditer(text) if m.end() > m.start()]
+        for st, ed in spans:
+            hits.append(("rrn", text[st:ed], bool(fn(text[st:ed], options)), st, ed))
+        arr = list(text)
+        for st, ed in spans:
+            for i in range(st, ed):
+                if arr[i].isdigit() or arr[i] in "- /":
+                    arr[i] = "R"
+        working = "".join(arr)
+    for rid in ordered_rules:
+        if rid == "rrn":
+            continue
+        rx, fn = RULES[rid]["regex"], RULES[rid]["validator"]
+        for m in rx.finditer(working):
+            if m.end() > m.start():
+                hits.append((rid, m.group(), bool(fn(m.group(), options)), m.start(), m.end()))
+    return hits
+
+
+# 주민번호와 겹치거나 붙어 있는 다른 규칙 후보
+TOKENS = [
+    "900101-1234567", "9001011234568", "010-1234-5678", "01012345678", "hong@example.com",
+    "4111 1111 1111 1111", "M12345678", "11-22-333333-44", "02-123-4567", "R", "-", " ", "\n",
+    "a", "가", "12", "900101-12345671111", "hong9001011234567@mail.com",
+]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_adjacent_tokens(seed):
+    rnd = random.Random(seed)
+    text = "".join(rnd.choice(TOKENS) for _ in range(120))
+    assert match_hits(text, ORDER) == legacy_hits(text, ORDER)
+
+
+def test_synth_pages(synth_texts):
+    for text in synth_texts:
+        assert match_hits(text, ORDER) == legacy_hits(text, ORDER)
+
+
+@pytest.mark.parametrize("rules", [["rrn", "email"], ["phone_mobile", "card"], ["rrn", "passport", "driver_license"]])
+def test_rule_subsets(rules, synth_texts):
+    ordered = [r for r in ORDER if r in rules]
+    text = "\n".join(synth_texts[:3])
+    assert match_hits(text, ordered, {"luhn": False}) == legacy_hits(text, ordered, {"luhn": False})
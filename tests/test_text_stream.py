@@ -0,0 +1,71 @@
+"""iter_match_windows(창 단위) == 전체 텍스트를 한 번에 탐지한 /text/match 결과 (개행 없는 긴 줄 포함)."""
+import asyncio
+import io
+import random
+
+import pytest
+
+from server.routes import text as text_route
+from server.text_match import iter_match_windows
+from tests.test_normalize import SPECIAL, WORDS
+
+ORDER = text_route._ordered_rules(None)
+CARDS = ["4111 1111 1111 1111", "4111-1111-1111-1111", "5500 0000 0000 0004", "4111111111111111"]
+POOL = SPECIAL + WORDS * 3 + CARDS * 3 + ["a", "1", "-", "가", "9001011234567", "hong@ex.com", " ", "카드번호 "]
+
+
+def _whole(text, normalize):
+    req = text_route.MatchRequest(text=text, normalize=normalize)
+    return asyncio.run(text_route.match(req))["items"]
+
+
+def _windows(text, normalize, window, overlap):
+    items = []
+    read = io.BytesIO(text.encode()).read
+    for its, _, _ in iter_match_windows(read, ORDER, None, normalize=normalize,
+                                        window=window, overlap=overlap, chunk_bytes=97):
+        items += its
+    return items
+
+
+def _key(item):
+    return item["index"], item["rule"]
+
+
+def _check(text, normalize, window, overlap):
+    whole = _whole(text, normalize)
+    # overlap보다 긴 매치(예: 숫자/대시를 길게 삼킨 이메일)는 창 끝에서 잘려 보일 수 있어 비교에서 뺀다
+    if any(it["orig_end"] - it["orig_index"] > overlap for it in whole):
+        return False
+    assert sorted(_windows(text, normalize, window, overlap), key=_key) == sorted(whole, key=_key), repr(text)
+    return True
+
+
+@pytest.mark.parametrize("normalize", [True, False])
+@pytest.mark.parametrize("seed", range(8))
+def test_long_line_hard_cuts(seed, normalize):
+    rnd = random.Random(seed)
+    checked = 0
+    for _ in range(50):
+        text = "".join(rnd.choice(POOL) for _ in range(rnd.randint(50, 400)))
+        checked += _check(text.replace("\r", "").replace("\n", ""), normalize, 200, 60)
+    assert checked >= 25
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_small_windows(seed):
+    rnd = random.Random(100 + seed)
+    checked = 0
+    for _ in range(50):
+        text = "".join(rnd.choice(POOL) for _ in range(rnd.randint(0, 120)))
+        checked += _check(text, True, rnd.randint(8, 60), 40)
+    assert checked >= 25
+
+
+def test_no_safe_cut_grows_window():
+    # 글자마다 공백이 끼어 있어 나눠 정규화할 자리가 없음 → 창을 늘려 자를 자리가 나올 때까지 스캔
+    text = "가 " * 300 + "4111 1111 1111 1111 " + "가 " * 300 + "abc" + "나 " * 100
+    windows = list(iter_match_windows(io.BytesIO(text.encode()).read, ORDER, window=100, overlap=30))
+    assert sum(chars for _, chars, _ in windows) == len(text)
+    assert len(windows) == 2
+    assert sorted(_windows(text, True, 100, 30), key=_key) == sorted(_whole(text, True), key=_key)
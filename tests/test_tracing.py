@@ -0,0 +1,76 @@
+"""프로파일링 트레이스: 관리자 토큰이 없거나 다르면 403, span 트리에는 문서 텍스트/매치 값이 없다."""
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from server import config
+from server.main import app
+
+TOKEN = "trace-admin-token"
+RRN = "060820-3492891"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def token(monkeypatch):
+    monkeypatch.setattr(config, "TRACE_TOKEN", TOKEN)
+    return TOKEN
+
+
+@pytest.fixture(scope="module")
+def rrn_pdf():
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), f"resident no {RRN}")
+    page.insert_text((72, 100), "contact hong@example.com")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _files(pdf):
+    return {"file": ("a.pdf", pdf, "application/pdf")}
+
+
+@pytest.mark.parametrize("headers", [{"X-Redaction-Trace": "wrong"}, {"X-Redaction-Trace": TOKEN + "x"}])
+def test_wrong_token_is_403(client, token, rrn_pdf, headers):
+    assert client.post("/redactions/detect", files=_files(rrn_pdf), headers=headers).status_code == 403
+    assert client.get("/redactions/traces/abc", headers=headers).status_code == 403
+
+
+def test_token_unset_is_403(client, monkeypatch, rrn_pdf):
+    monkeypatch.setattr(config, "TRACE_TOKEN", "")
+    res = client.post("/redactions/detect", files=_files(rrn_pdf), headers={"X-Redaction-Trace": "anything"})
+    assert res.status_code == 403
+
+
+def test_untraced_request_has_no_trace(client, token, rrn_pdf):
+    res = client.post("/redactions/detect", files=_files(rrn_pdf))
+    assert res.status_code == 200
+    assert "X-Redaction-Trace-Id" not in res.headers
+
+
+@pytest.mark.parametrize("path,data", [
+    ("/redactions/detect", {}),
+    ("/redactions/apply", {"mode": "auto_all"}),
+])
+def test_trace_omits_document_text(client, token, rrn_pdf, path, data):
+    res = client.post(path, files=_files(rrn_pdf), data=data, headers={"X-Redaction-Trace": TOKEN})
+    assert res.status_code == 200
+    if path == "/redactions/detect":
+        assert RRN in {b["matched_text"] for b in res.json()["boxes"]}
+    trace_id = res.headers["X-Redaction-Trace-Id"]
+
+    assert client.get(f"/redactions/traces/{trace_id}").status_code == 403
+    assert client.get(f"/redactions/traces/{trace_id}", headers={"X-Redaction-Trace": "wrong"}).status_code == 403
+    trace = client.get(f"/redactions/traces/{trace_id}", params={"trace": TOKEN})
+    assert trace.status_code == 200
+    body = trace.text
+    assert trace.json()["span_count"] > 1
+    for secret in (RRN, RRN.replace("-", ""), "hong@example.com", "resident no"):
+        assert secret not in body
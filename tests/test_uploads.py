@@ -0,0 +1,36 @@
+"""업로드 크기 한도: 메모리로 읽는 경로(/documents)도 한도를 넘는 순간 읽기를 멈추고 413."""
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+
+from server import config
+from server.main import app
+from server.uploads import UploadTooLarge, read_limited
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, n=-1):
+        self.reads += 1
+        return super().read(n)
+
+
+def test_read_limited_stops_early():
+    src = CountingReader(b"x" * (10 * 1024 * 1024))
+    with pytest.raises(UploadTooLarge):
+        read_limited(src, max_bytes=1024 * 1024 + 1)
+    assert src.reads == 2
+    assert read_limited(io.BytesIO(b"abc"), max_bytes=3) == b"abc"
+
+
+def test_document_upload_limit(monkeypatch, synth_pdf):
+    f = {"file": ("a.pdf", synth_pdf, "application/pdf")}
+    with TestClient(app) as client:
+        monkeypatch.setattr(config, "UPLOAD_MAX_BYTES", len(synth_pdf) - 1)
+        assert client.post("/documents", files=f).status_code == 413
+        monkeypatch.setattr(config, "UPLOAD_MAX_BYTES", len(synth_pdf))
+        assert client.post("/documents", files=f).status_code == 200